@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Randomized check of the summary-table triggers
+
+Builds a small seeded catalog, applies a random mix of inserts, updates
+and deletes on artworks, sales and artist payments (NULL statuses, prices
+and quantities included), then compares the trigger-maintained summary
+tables with a rebuild from scratch (core.summaries.check). Exits 1 when
+any counter differs.
+
+Usage:
+    python -m benchmarks.check_triggers
+    python -m benchmarks.check_triggers --operations 10000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from benchmarks.generator import CatalogSpec, generate_catalog
+from core import summaries
+from core.database import Database
+
+STATUSES = ["available", "reserved", "exhibition", "sold", None]
+
+
+def _delete_artwork(db: Database, artwork_id: int):
+    for sale_id, in db.execute("SELECT id FROM sale WHERE artwork_id = ?", (artwork_id,)).fetchall():
+        db.execute("DELETE FROM artist_payment WHERE sale_id = ?", (sale_id,))
+        db.execute("DELETE FROM sale WHERE id = ?", (sale_id,))
+    db.execute("DELETE FROM exhibition_artwork WHERE artwork_id = ?", (artwork_id,))
+    db.execute("DELETE FROM artwork WHERE id = ?", (artwork_id,))
+
+
+def random_writes(db: Database, operations: int, rng: random.Random):
+    """Apply operations random writes in one transaction; returns counts per kind"""
+    artworks = [row[0] for row in db.execute("SELECT id FROM artwork")]
+    artists = [row[0] for row in db.execute("SELECT id FROM artist")]
+    done = {}
+    with db.transaction():
+        for _ in range(operations):
+            kind = rng.choice([
+                "artwork.status", "artwork.price", "artwork.insert", "artwork.delete",
+                "sale.insert", "sale.update", "sale.delete", "payment.update",
+            ])
+            artwork_id = rng.choice(artworks)
+            if kind == "artwork.status":
+                db.execute(
+                    "UPDATE artwork SET status = ?, quantity = ? WHERE id = ?",
+                    (rng.choice(STATUSES), rng.choice([0, 1, 3, None]), artwork_id),
+                )
+            elif kind == "artwork.price":
+                db.execute(
+                    "UPDATE artwork SET price = ?, artist_id = ? WHERE id = ?",
+                    (rng.choice([None, 10.5, 99.99, 1250.0]),
+                     rng.choice(artists + [None]), artwork_id),
+                )
+            elif kind == "artwork.insert":
+                cursor = db.execute(
+                    "INSERT INTO artwork (title, artist_id, price, quantity, status) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ("Test", rng.choice(artists + [None]), rng.choice([None, 12.3, 480.0]),
+                     rng.choice([None, 1, 2]), rng.choice(STATUSES)),
+                )
+                artworks.append(cursor.lastrowid)
+            elif kind == "artwork.delete" and len(artworks) > 1:
+                _delete_artwork(db, artwork_id)
+                artworks.remove(artwork_id)
+            elif kind == "sale.insert":
+                cursor = db.execute(
+                    "INSERT INTO sale (artwork_id, sale_date, sale_price, quantity) "
+                    "VALUES (?, ?, ?, ?)",
+                    (artwork_id, f"2025-{rng.randint(1, 12):02d}-15", 50.25, rng.randint(1, 3)),
+                )
+                db.execute(
+                    "INSERT INTO artist_payment (sale_id, artist_id, percentage, amount, paid) "
+                    "VALUES (?, ?, 10, 5.025, ?)",
+                    (cursor.lastrowid, rng.choice(artists), rng.choice([0, 1, None])),
+                )
+            elif kind == "sale.update":
+                db.execute(
+                    "UPDATE sale SET sale_date = ?, quantity = quantity + 1, "
+                    "sale_price = sale_price + 1.1 WHERE artwork_id = ?",
+                    (f"2024-{rng.randint(1, 12):02d}-01", artwork_id),
+                )
+            elif kind == "sale.delete":
+                db.execute(
+                    "DELETE FROM artist_payment WHERE sale_id IN "
+                    "(SELECT id FROM sale WHERE artwork_id = ?)", (artwork_id,)
+                )
+                db.execute("DELETE FROM sale WHERE artwork_id = ?", (artwork_id,))
+            elif kind == "payment.update":
+                db.execute(
+                    "UPDATE artist_payment SET paid = 1 - COALESCE(paid, 0), amount = amount + 0.01, "
+                    "artist_id = ? WHERE id = (SELECT MAX(id) FROM artist_payment) - ?",
+                    (rng.choice(artists), rng.randrange(100)),
+                )
+            done[kind] = done.get(kind, 0) + 1
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the summary triggers against a rebuild")
+    parser.add_argument("--operations", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "catalog.db"
+        generate_catalog(db_path, Path(workdir) / "images",
+                         CatalogSpec(artists=50, artworks=2000, sales=800, images=0, seed=args.seed))
+        db = Database(db_path)
+        try:
+            start = time.perf_counter()
+            done = random_writes(db, args.operations, random.Random(args.seed))
+            elapsed = time.perf_counter() - start
+            mismatches = summaries.check(db)
+        finally:
+            db.close()
+
+    print(f"{args.operations} random writes in {elapsed:.2f}s: "
+          + ", ".join(f"{kind} {count}" for kind, count in sorted(done.items())))
+    for m in mismatches[:20]:
+        print(f"  {m.table}[{m.key!r}] {m.column}: stored {m.stored!r}, expected {m.expected!r}")
+    if mismatches:
+        print(f"❌ {len(mismatches)} counters differ from a rebuild")
+        sys.exit(1)
+    print("✅ Summary tables match a rebuild")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Synthetic catalog generator
+
+Builds a catalog database (and the photos it refers to) of a given size
+from a seed, so benchmark runs on different machines or versions work on
+the same data. Rows go in with executemany inside one transaction per
+table; the schema comes from core.migrations like a real database.
+"""
+
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from pathlib import Path
+
+from core.database import Database
+from core.migrations import migrate
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+STATUSES = ["available", "available", "available", "reserved", "exhibition"]
+TYPES = ["painting", "sculpture", "photo", "print", "merch", "book"]
+PAYMENT_METHODS = ["Contanti", "Carta", "Bonifico", "PayPal", "Altro"]
+
+# Camera-like sizes: phone photos in both orientations, DSLR, scans
+PHOTO_SIZES = [(4032, 3024), (3024, 4032), (6000, 4000), (2480, 3508)]
+
+WORDS = (
+    "luce ombra mare notte vento terra fuoco sogno città silenzio rosso blu "
+    "oro giardino volto memoria tempo cielo pietra fiume nebbia estate "
+    "inverno ritratto paesaggio studio frammento orizzonte"
+).split()
+NAMES = (
+    "Giulia Marco Sofia Luca Chiara Paolo Elena Matteo Sara Andrea Anna "
+    "Davide Marta Simone Irene Franco"
+).split()
+SURNAMES = (
+    "Rossi Bianchi Romano Colombo Ricci Marino Greco Bruno Gallo Conti "
+    "Costa Giordano Mancini Rizzo Lombardi Moretti"
+).split()
+
+
+@dataclass
+class CatalogSpec:
+    """Size of a synthetic catalog. Same spec and seed, same catalog."""
+    artists: int = 200
+    artworks: int = 20000
+    sales: int = 8000
+    exhibitions: int = 30
+    images: int = 24             # Distinct photos, shared round-robin by artworks
+    image_scale: float = 1.0     # Shrinks PHOTO_SIZES for quick runs
+    end_date: str = "2025-12-31" # Sales cover the year up to this day
+    seed: int = 42
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def synth_photo(rng: random.Random, size, dest: Path, orientation: int = 1):
+    """
+    Write a JPEG with photo-like content: random colour noise at low
+    resolution upscaled smoothly, so it compresses like a real photo.
+    A non-1 orientation writes an EXIF rotation tag, as phones do.
+    """
+    width, height = size
+    low = (max(2, width // 48), max(2, height // 48))
+    img = Image.frombytes("RGB", low, rng.randbytes(low[0] * low[1] * 3))
+    img = img.resize(size, Image.BICUBIC)
+    exif = Image.Exif()
+    if orientation != 1:
+        exif[0x0112] = orientation
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    img.save(dest, format="JPEG", quality=90, exif=exif)
+
+
+def generate_images(img_dir: Path, spec: CatalogSpec):
+    """Create spec.images photos in img_dir; returns their file names"""
+    if Image is None or spec.images <= 0:
+        return []
+    rng = random.Random(f"{spec.seed}-images")
+    names = []
+    for i in range(spec.images):
+        width, height = PHOTO_SIZES[i % len(PHOTO_SIZES)]
+        size = (max(16, int(width * spec.image_scale)), max(16, int(height * spec.image_scale)))
+        name = f"synthetic_{i:04d}.jpg"
+        # Every fourth photo is stored sideways with an EXIF rotation
+        synth_photo(rng, size, Path(img_dir) / name, orientation=6 if i % 4 == 3 else 1)
+        names.append(name)
+    return names
+
+
+def generate_catalog(db_path: Path, img_dir: Path, spec: CatalogSpec = None):
+    """
+    Create a fresh catalog at db_path with photos in img_dir.
+    Returns a dict with the number of rows written per table.
+    """
+    spec = spec or CatalogSpec()
+    rng = random.Random(spec.seed)
+    db_path = Path(db_path)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    images = generate_images(img_dir, spec)
+
+    db = Database(db_path)
+    try:
+        migrate(db)
+
+        artists = [
+            (f"{rng.choice(NAMES)} {rng.choice(SURNAMES)} {i}", _phrase(rng, 30),
+             f"artist{i}@example.com", f"+39 3{rng.randrange(10**8, 10**9)}", "")
+            for i in range(spec.artists)
+        ]
+        db.executemany(
+            "INSERT INTO artist (name, bio, email, phone, notes) VALUES (?, ?, ?, ?, ?)",
+            artists,
+        )
+        artist_ids = [row[0] for row in db.execute("SELECT id FROM artist ORDER BY id")]
+
+        # Sold artworks come first so each sale can point at one of them
+        sold = min(spec.sales, spec.artworks)
+        artworks = []
+        for i in range(spec.artworks):
+            multi = rng.random() < 0.15
+            artworks.append((
+                rng.choice(artist_ids) if artist_ids else None,
+                f"ART-{rng.getrandbits(32):08X}{i:06d}",
+                _phrase(rng, rng.randint(1, 4)),
+                _phrase(rng, rng.randint(10, 60)),
+                rng.choice(TYPES),
+                rng.randint(2, 50) if multi else 1,
+                rng.randint(1970, 2025),
+                round(rng.uniform(20, 5000), 2),
+                rng.choice([10, 20, 30, 40, 50]),
+                images[i % len(images)] if images and rng.random() < 0.9 else "",
+                "sold" if i < sold else rng.choice(STATUSES),
+                "",
+            ))
+        db.executemany(
+            """
+            INSERT INTO artwork (artist_id, code, title, description, type, quantity,
+                                 year, price, artist_cut_percent, image, status, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            artworks,
+        )
+        sold_rows = db.execute(
+            """
+            SELECT id, artist_id, price, artist_cut_percent FROM artwork
+            WHERE status = 'sold' ORDER BY id
+            """
+        ).fetchall()
+
+        # A year of sales ending on spec.end_date
+        today = date.fromisoformat(spec.end_date)
+        sales, payments = [], []
+        for sale_id, (artwork_id, artist_id, price, cut) in enumerate(sold_rows, start=1):
+            quantity = 1 if rng.random() < 0.9 else rng.randint(2, 5)
+            sale_day = today - timedelta(days=rng.randrange(365))
+            total = round(price * quantity, 2)
+            sales.append((
+                artwork_id, f"{sale_day.isoformat()}T{rng.randrange(9, 20):02d}:{rng.randrange(60):02d}:00",
+                total, quantity, price, f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}",
+                rng.choice(PAYMENT_METHODS), "",
+            ))
+            if artist_id is not None:
+                payments.append((sale_id, artist_id, cut, round(total * cut / 100, 2),
+                                 1 if rng.random() < 0.6 else 0))
+        db.executemany(
+            """
+            INSERT INTO sale (artwork_id, sale_date, sale_price, quantity, unit_price,
+                              buyer_name, payment_method, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            sales,
+        )
+        db.executemany(
+            """
+            INSERT INTO artist_payment (sale_id, artist_id, percentage, amount, paid)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            payments,
+        )
+
+        exhibitions = []
+        for i in range(spec.exhibitions):
+            start = today - timedelta(days=rng.randrange(730))
+            exhibitions.append((f"Mostra {_phrase(rng, 2)} {i}", rng.choice(SURNAMES),
+                                start.isoformat(), (start + timedelta(days=30)).isoformat(),
+                                _phrase(rng, 40)))
+        db.executemany(
+            """
+            INSERT INTO exhibition (name, location, start_date, end_date, description)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            exhibitions,
+        )
+        if spec.exhibitions and spec.artworks:
+            links = {(rng.randint(1, spec.exhibitions), rng.randint(1, spec.artworks))
+                     for _ in range(spec.artworks // 10)}
+            db.executemany(
+                "INSERT INTO exhibition_artwork (exhibition_id, artwork_id) VALUES (?, ?)",
+                sorted(links),
+            )
+        db.execute("ANALYZE")
+    finally:
+        db.close()
+
+    return {
+        "artist": len(artists),
+        "artwork": len(artworks),
+        "sale": len(sales),
+        "artist_payment": len(payments),
+        "exhibition": len(exhibitions),
+        "images": len(images),
+    }
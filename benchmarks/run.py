@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite
+
+Generates (or reuses) a seeded synthetic catalog and times the code paths
+that scale with catalog size: repository queries, sales listings,
+per-statement overhead of the Database fetch helpers, filling
+the artwork grid (offscreen Qt) and loading the image preview. Results are
+written as JSON; pass an earlier result file with --compare to flag
+regressions.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --artworks 100000 --sales 30000 --output big.json
+    python -m benchmarks.run --output new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Widgets are created without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from benchmarks.generator import CatalogSpec, WORDS, generate_catalog
+from benchmarks.timing import measure, compare
+from core.database import Database, ConnectionProfile
+from core.migrations import migrate
+from core.repositories.artwork_repo import ArtworkRepository, GET_BY_ID
+from core.repositories.report_repo import ReportRepository
+from core.repositories.sale_repo import SaleRepository
+from core.repositories.summary_repo import SummaryRepository
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """What the numbers were measured on"""
+    info = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    try:
+        from PyQt5.QtCore import QT_VERSION_STR
+        info["qt"] = QT_VERSION_STR
+    except ImportError:
+        pass
+    try:
+        import PIL
+        info["pillow"] = PIL.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def prepare_catalog(workdir: Path, spec: CatalogSpec):
+    """Generate the catalog unless workdir already holds one for the same spec"""
+    db_path = workdir / "catalog.db"
+    img_dir = workdir / "images"
+    spec_path = workdir / "spec.json"
+    if db_path.exists() and spec_path.exists():
+        saved = json.loads(spec_path.read_text())
+        if saved.get("spec") == spec.to_dict():
+            return db_path, img_dir, saved["rows"], 0.0
+    workdir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    rows = generate_catalog(db_path, img_dir, spec)
+    elapsed = time.perf_counter() - start
+    spec_path.write_text(json.dumps({"spec": spec.to_dict(), "rows": rows}, indent=2))
+    return db_path, img_dir, rows, elapsed
+
+
+# ---------- Suites ----------
+def repository_benchmarks(db: Database, repeat: int):
+    artworks = ArtworkRepository(db)
+    sales = SaleRepository(db)
+    reports = ReportRepository(db)
+    summary = SummaryRepository(db)
+    artwork_id, code, artist_id = db.execute(
+        "SELECT id, code, artist_id FROM artwork WHERE artist_id IS NOT NULL "
+        "ORDER BY id LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM artwork)"
+    ).fetchone()
+    word = WORDS[0]
+    last_month = db.fetch_scalar("SELECT MAX(month) FROM sale_month_summary", default="")
+
+    def deep_page():
+        # Walk five pages in: the keyset cursor must not get slower with depth
+        cursor = None
+        for _ in range(5):
+            cursor = artworks.get_page(cursor, exclude_status="sold").next_cursor
+
+    results = {
+        "artwork.get_by_id": measure(lambda: artworks.get_by_id(artwork_id), repeat * 50),
+        "artwork.get_by_code": measure(lambda: artworks.get_by_code(code), repeat * 50),
+        "artwork.get_all": measure(artworks.get_all, max(3, repeat // 4)),
+        "artwork.get_by_artist": measure(lambda: artworks.get_by_artist(artist_id), repeat),
+        "artwork.get_page.first": measure(lambda: artworks.get_page(exclude_status="sold"), repeat),
+        "artwork.get_page.fifth": measure(deep_page, repeat),
+        "artwork.get_page.artist": measure(lambda: artworks.get_page(artist_id=artist_id), repeat),
+        "artwork.count": measure(lambda: artworks.count(exclude_status="sold"), repeat),
+        "artwork.search_cards": measure(lambda: artworks.search_cards(word), repeat),
+        "sale.get_all": measure(sales.get_all, max(3, repeat // 4)),
+        "sale.search": measure(lambda: sales.search(word), repeat),
+        "sale.get_artist_payments": measure(lambda: sales.get_artist_payments(artist_id), repeat),
+        "sale.get_unpaid_payments": measure(sales.get_unpaid_payments, max(3, repeat // 4)),
+        "sale.get_unpaid_payments.artist": measure(
+            lambda: sales.get_unpaid_payments(artist_id), repeat),
+        # The generator writes a year of sales: these cover all of it
+        "report.totals": measure(reports.totals, repeat),
+        "report.revenue_by_month": measure(reports.revenue_by_month, repeat),
+        "report.revenue_by_artist": measure(reports.revenue_by_artist, repeat),
+        "report.revenue_by_payment_method": measure(reports.revenue_by_payment_method, repeat),
+        "report.revenue_by_exhibition": measure(reports.revenue_by_exhibition, repeat),
+        "report.outstanding_payouts": measure(reports.outstanding_payouts, repeat),
+        # Trigger-maintained counters: should not grow with the catalog
+        "summary.artwork_count": measure(summary.artwork_count, repeat * 50),
+        "summary.artwork_count.artist": measure(
+            lambda: summary.artwork_count(artist_id), repeat * 50),
+        "summary.dashboard": measure(lambda: summary.dashboard(last_month), repeat * 50),
+    }
+    return results
+
+
+def statement_benchmarks(db_path: Path, repeat: int):
+    """
+    Measures one change: the statement cache raised from sqlite3's 128 to
+    256 (ConnectionProfile.cached_statements). A thousand get_by_id lookups
+    run in a tight loop, once on their own and once interleaved with other
+    statements, so that 200 distinct statements are in use: that fits a
+    256-entry cache but not a 128-entry one, which then recompiles on every
+    call. Only cached_statements differs between each cache128/cache256 pair.
+    """
+    loops = 1000
+    db = Database(db_path)
+    try:
+        ids = [row[0] for row in db.execute("SELECT id FROM artwork ORDER BY id LIMIT ?", (loops,))]
+    finally:
+        db.close()
+
+    # GET_BY_ID plus 199 other statements, taken in turn
+    statements = [GET_BY_ID] + [
+        f"SELECT id, title FROM artwork WHERE id = ? AND {n} = {n}" for n in range(1, 200)
+    ]
+    results = {}
+    for cached in (128, 256):
+        db = Database(db_path, ConnectionProfile(cached_statements=cached))
+        try:
+            results[f"stmt.cache{cached}.get_by_id"] = measure(
+                lambda: [db.fetch_one(GET_BY_ID, (i,)) for i in ids], repeat)
+            results[f"stmt.cache{cached}.get_by_id.mixed"] = measure(
+                lambda: [db.fetch_one(sql, (i,)) for sql, i in zip(statements * 5, ids)], repeat)
+        finally:
+            db.close()
+    return results
+
+
+def widget_benchmarks(db: Database, repeat: int):
+    from PyQt5.QtWidgets import QApplication
+    from ui.widgets.artwork_table import ArtworkTableWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    artworks = ArtworkRepository(db)
+    cards = artworks.get_page(page_size=max(1, artworks.count())).rows
+
+    widget = ArtworkTableWidget()
+    widget.resize(1100, 800)
+    widget.show()
+
+    def load_all():
+        widget.load_artworks(cards)
+        widget.grab()  # Lay out and paint the visible cards
+        app.processEvents()
+
+    def fetch(status_filter):
+        def fetch_page(cursor):
+            page = artworks.get_page(cursor, **status_filter)
+            return page.rows, page.next_cursor
+        return fetch_page
+
+    def load_paged():
+        widget.load_pages(fetch({"exclude_status": "sold"}), fetch({"status": "sold"}))
+        widget.grab()
+        app.processEvents()
+
+    results = {
+        "grid.load_artworks": measure(load_all, max(3, repeat // 4)),
+        "grid.load_pages": measure(load_paged, repeat),
+    }
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return results
+
+
+def preview_benchmarks(img_dir: Path, repeat: int):
+    from PyQt5.QtWidgets import QApplication
+    from ui.widgets.image_preview import ImagePreviewWidget
+    from ui.workers.image_loader import decode_image
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    paths = sorted(Path(img_dir).glob("*.jpg"))
+    if not paths:
+        return {}
+
+    preview = ImagePreviewWidget()
+    preview.resize(420, 420)
+    preview.show()
+    size = preview.decode_size()
+    decoded = decode_image(paths[0], size)
+    state = {"i": 0}
+
+    def next_path():
+        state["i"] = (state["i"] + 1) % len(paths)
+        return paths[state["i"]]
+
+    def resize_burst():
+        for side in range(300, 420, 6):
+            preview.resize(side, side)
+            app.processEvents()
+
+    results = {
+        "preview.decode_full": measure(lambda: decode_image(next_path()), max(3, repeat // 4)),
+        "preview.decode_display": measure(lambda: decode_image(next_path(), size), repeat),
+        "preview.show_image": measure(lambda: preview.show_image(decoded), repeat),
+        "preview.resize_burst": measure(resize_burst, max(3, repeat // 4)),
+    }
+    preview.close()
+    preview.deleteLater()
+    app.processEvents()
+    return results
+
+
+def run(spec: CatalogSpec, workdir: Path, repeat: int = 20,
+        suites=("repo", "stmt", "grid", "preview")):
+    db_path, img_dir, rows, generation_s = prepare_catalog(workdir, spec)
+    results = {}
+    db = Database(db_path)
+    try:
+        # A catalog kept from an older version gets the current schema
+        migrate(db)
+        if "repo" in suites:
+            results.update(repository_benchmarks(db, repeat))
+        if "grid" in suites:
+            results.update(widget_benchmarks(db, repeat))
+    finally:
+        db.close()
+    if "stmt" in suites:
+        results.update(statement_benchmarks(db_path, repeat))
+    if "preview" in suites:
+        results.update(preview_benchmarks(img_dir, repeat))
+    return {
+        "environment": environment(),
+        "spec": spec.to_dict(),
+        "rows": rows,
+        "generation_s": round(generation_s, 3),
+        "results": results,
+    }
+
+
+def parse_args():
+    defaults = CatalogSpec()
+    parser = argparse.ArgumentParser(description="Run the catalog benchmark suite")
+    parser.add_argument("--workdir", type=Path,
+                        default=Path(tempfile.gettempdir()) / "art-catalog-bench",
+                        help="where the synthetic catalog is kept between runs")
+    parser.add_argument("--artists", type=int, default=defaults.artists)
+    parser.add_argument("--artworks", type=int, default=defaults.artworks)
+    parser.add_argument("--sales", type=int, default=defaults.sales)
+    parser.add_argument("--exhibitions", type=int, default=defaults.exhibitions)
+    parser.add_argument("--images", type=int, default=defaults.images)
+    parser.add_argument("--image-scale", type=float, default=defaults.image_scale)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--suite", action="append", choices=["repo", "stmt", "grid", "preview"],
+                        help="run only these suites (repeatable)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio reported as a regression")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    spec = CatalogSpec(
+        artists=args.artists, artworks=args.artworks, sales=args.sales,
+        exhibitions=args.exhibitions, images=args.images,
+        image_scale=args.image_scale, seed=args.seed,
+    )
+    report = run(spec, args.workdir, args.repeat, tuple(args.suite or ("repo", "stmt", "grid", "preview")))
+
+    if report["generation_s"]:
+        print(f"Generated {report['rows']} in {report['generation_s']:.1f}s")
+    width = max(len(name) for name in report["results"]) if report["results"] else 0
+    for name, stats in report["results"].items():
+        print(f"{name:<{width}}  median {stats['median_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("spec") != report["spec"]:
+            print("\n⚠️  Baseline was measured on a different catalog spec")
+        print(f"\nCompared with {args.compare}:")
+        regressions = 0
+        for name, before, after, ratio, regressed in compare(baseline, report, args.threshold):
+            mark = "❌" if regressed else "  "
+            print(f"{mark} {name:<{width}}  {before:>10.3f} → {after:>10.3f} ms  ({ratio:.2f}x)")
+            regressions += regressed
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
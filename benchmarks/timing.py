@@ -0,0 +1,51 @@
+"""
+Timing helpers for the benchmark suite
+"""
+
+import gc
+import statistics
+import time
+
+
+def measure(fn, repeat: int = 20, warmup: int = 1):
+    """
+    Call fn repeatedly and return its timing statistics in milliseconds.
+    The collector is paused while timing so its pauses do not land in
+    random samples.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.2):
+    """
+    Compare two result files by median time. Returns a list of
+    (name, baseline_ms, current_ms, ratio, regressed) for benchmarks in both.
+    """
+    rows = []
+    old, new = baseline.get("results", {}), current.get("results", {})
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name]["median_ms"], new[name]["median_ms"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > threshold))
+    return rows
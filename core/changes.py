@@ -0,0 +1,56 @@
+"""
+Change tracking for repositories
+
+Repositories record the IDs they insert, update or delete so the UI can
+patch only the affected rows instead of reloading everything.
+"""
+
+
+class ChangeSet:
+    """
+    IDs touched since the change set was last taken
+    """
+
+    def __init__(self):
+        self.inserted = set()
+        self.updated = set()
+        self.deleted = set()
+
+    def record_insert(self, row_id):
+        self.deleted.discard(row_id)
+        self.inserted.add(row_id)
+
+    def record_update(self, row_id):
+        if row_id not in self.inserted:
+            self.updated.add(row_id)
+
+    def record_delete(self, row_id):
+        if row_id in self.inserted:
+            # Inserted and deleted before anyone looked: nothing happened
+            self.inserted.discard(row_id)
+            return
+        self.updated.discard(row_id)
+        self.deleted.add(row_id)
+
+    def copy(self):
+        changes = ChangeSet()
+        changes.restore(self)
+        return changes
+
+    def restore(self, saved):
+        """Go back to the IDs of an earlier copy(), e.g. after a rollback"""
+        self.inserted = set(saved.inserted)
+        self.updated = set(saved.updated)
+        self.deleted = set(saved.deleted)
+
+    @property
+    def upserted(self):
+        """IDs whose current row must be (re)fetched"""
+        return self.inserted | self.updated
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def __repr__(self):
+        return (f"ChangeSet(inserted={sorted(self.inserted)}, "
+                f"updated={sorted(self.updated)}, deleted={sorted(self.deleted)})")
@@ -1,26 +1,230 @@
 import sqlite3
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
+from core import instrumentation
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """
+    PRAGMA applicati all'apertura della connessione
+
+    In WAL il viewer Datasette legge mentre l'app scrive, senza bloccarsi
+    a vicenda; synchronous=NORMAL in WAL perde dati solo in caso di power loss.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kib: int = 64 * 1024          # Page cache per connection
+    mmap_size: int = 256 * 1024 * 1024       # Memory-mapped I/O for reads
+    temp_store: str = "MEMORY"
+    busy_timeout_ms: int = 5000              # Wait for other writers instead of failing
+    wal_autocheckpoint: int = 1000           # Pages
+    optimize_on_close: bool = True
+    query_only: bool = False                 # Refuse writes (background readers)
+    cached_statements: int = 256             # Compiled statements kept (sqlite3 default: 128)
+
+
+DEFAULT_PROFILE = ConnectionProfile()
+
+# Connessioni di sola lettura usate dai worker in background
+READ_ONLY_PROFILE = ConnectionProfile(
+    cache_size_kib=16 * 1024,
+    optimize_on_close=False,
+    query_only=True,
+)
+
 
 class Database:
     """
     Wrapper minimale e sicuro per SQLite
+
+    La connessione lavora in autocommit: ogni statement fuori da una
+    transaction() viene confermato da solo, quelli dentro una transaction()
+    vengono confermati insieme con un unico COMMIT.
     """
 
-    def __init__(self, path: Path):
-        self.conn = sqlite3.connect(path)
+    def __init__(self, path: Path, profile: ConnectionProfile = DEFAULT_PROFILE):
+        self.profile = profile
+        self.conn = sqlite3.connect(
+            path,
+            isolation_level=None,
+            timeout=profile.busy_timeout_ms / 1000,
+            cached_statements=profile.cached_statements,
+        )
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
+        self._apply_profile(profile)
+        self._depth = 0
+        # Objects told about rollbacks (see add_rollback_listener)
+        self._rollback_listeners = weakref.WeakSet()
+        # Set only when diagnostics are enabled (see core.instrumentation)
+        self.recorder = instrumentation.active_recorder()
+
+    def _apply_profile(self, profile: ConnectionProfile):
+        self.conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+        self.conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+        # Negative cache_size is in KiB rather than pages
+        self.conn.execute(f"PRAGMA cache_size = -{int(profile.cache_size_kib)}")
+        self.conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+        self.conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+        self.conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+        self.conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile.wal_autocheckpoint)}")
+        if profile.query_only:
+            self.conn.execute("PRAGMA query_only = ON")
+
+    def add_rollback_listener(self, listener):
+        """
+        Keep listener's in-memory state in step with transaction(): each
+        block calls listener.mark() on entry and, if the block rolls back,
+        listener.rollback(mark) with the value it returned. Listeners are
+        held weakly.
+        """
+        self._rollback_listeners.add(listener)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._depth > 0
 
     def execute(self, query: str, params: tuple = ()):
+        if self.recorder is not None:
+            return self.recorder.execute(self.conn, query, params)
         cur = self.conn.cursor()
         cur.execute(query, params)
-        self.conn.commit()
         return cur
 
+    # ---------- Read helpers ----------
+    # For read-only statements whose rows are consumed right away. Each call
+    # gets its own cursor, so a fetch inside a loop over another result is
+    # safe; the compiled statement comes from the connection's cache.
+    def _read(self, query: str, params, row_factory):
+        cur = self.execute(query, params)
+        cur.row_factory = row_factory
+        return cur
+
+    def fetch_one(self, query: str, params: tuple = (), row_factory=sqlite3.Row):
+        """
+        First row of a lookup, or None. Meant for statements matching at most
+        one row: it is stepped once more so it finishes and releases its
+        read snapshot right away.
+        """
+        cur = self._read(query, params, row_factory)
+        row = cur.fetchone()
+        if row is not None:
+            cur.fetchone()
+        return row
+
+    def fetch_all(self, query: str, params: tuple = (), row_factory=sqlite3.Row):
+        """All rows of a read-only statement"""
+        return self._read(query, params, row_factory).fetchall()
+
+    def fetch_scalar(self, query: str, params: tuple = (), default=None):
+        """First column of the first row (COUNT, MAX, ...), or default"""
+        row = self.fetch_one(query, params, row_factory=None)
+        return row[0] if row is not None else default
+
+    def executemany(self, query: str, seq_of_params):
+        """Run one statement for every parameter tuple, committing once."""
+        with self.transaction():
+            if self.recorder is not None:
+                return self.recorder.executemany(self.conn, query, seq_of_params)
+            cur = self.conn.cursor()
+            cur.executemany(query, seq_of_params)
+            return cur
+
     def executescript(self, script: str):
+        if self.in_transaction:
+            # sqlite3 commits any pending transaction before running a script
+            raise RuntimeError("executescript() cannot run inside a transaction")
         self.conn.executescript(script)
-        self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group statements into one atomic unit.
+
+        The outermost block opens a write transaction and commits on exit;
+        nested blocks become savepoints, so an inner failure only rolls back
+        its own work. Any exception rolls back and is re-raised.
+        """
+        savepoint = f"sp_{self._depth}" if self._depth else None
+        if savepoint:
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+        else:
+            self.conn.execute("BEGIN IMMEDIATE")
+        marks = [(listener, listener.mark()) for listener in self._rollback_listeners]
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if savepoint:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+            else:
+                self.conn.execute("ROLLBACK")
+            self._rolled_back(marks)
+            raise
+        self._depth -= 1
+        if savepoint:
+            self.conn.execute(f"RELEASE {savepoint}")
+            return
+        try:
+            if self.recorder is not None:
+                self.recorder.commit(self.conn)
+            else:
+                self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            self._rolled_back(marks)
+            raise
+
+    def _rolled_back(self, marks):
+        for listener, mark in marks:
+            listener.rollback(mark)
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Read several statements from one consistent view of the database.
+
+        Unlike transaction() this is a deferred BEGIN: it takes no write
+        lock, so other connections keep writing meanwhile (WAL). Inside an
+        open transaction it simply joins it.
+        """
+        if self.in_transaction:
+            yield self
+            return
+        self.conn.execute("BEGIN")
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            self.conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        self.conn.execute("COMMIT")
+
+    def checkpoint(self, mode: str = "PASSIVE"):
+        """
+        Copy WAL content back into the database file.
+        PASSIVE never blocks readers or writers; returns (busy, log, checkpointed).
+        """
+        if self.in_transaction:
+            return None
+        return tuple(self.conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
 
     def close(self):
+        if not self.in_transaction:
+            try:
+                if self.profile.optimize_on_close:
+                    self.conn.execute("PRAGMA optimize")
+                self.checkpoint("TRUNCATE")
+            except sqlite3.Error:
+                # Another connection holds a lock: the next close will catch up
+                pass
         self.conn.close()
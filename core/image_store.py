@@ -0,0 +1,271 @@
+"""
+Content-addressed image store
+
+Every imported image is hashed (SHA-256) while it is being copied, so the
+file is read only once. Each distinct content is kept once as a blob under
+BLOB_DIR; the friendly names in IMG_DIR that artwork.image refers to are
+copy-on-write clones of that blob where the filesystem supports them, and
+hardlinks otherwise (see _link_or_copy). image_ref maps each name to its blob.
+
+Identical photos imported under different names share one blob. A file
+whose name is already used by different content gets a new name instead of
+overwriting the existing image.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from core.database import Database
+from core.paths import IMG_DIR, BLOB_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+CHUNK_SIZE = 1024 * 1024
+
+# ioctl that makes dst share src's extents (btrfs, XFS, ...): no data copied
+FICLONE = 0x40049409
+
+
+def hash_file(path: Path):
+    """Return (sha256 hexdigest, size) of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone src into dst copy-on-write; False if the filesystem cannot"""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy_hashing(src: Path, dst: Path):
+    """Copy src to dst, hashing the bytes on the way through"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while chunk := fsrc.read(CHUNK_SIZE):
+            digest.update(chunk)
+            fdst.write(chunk)
+            size += len(chunk)
+    shutil.copystat(src, dst)
+    return digest.hexdigest(), size
+
+
+def _link_or_copy(src: Path, dst: Path):
+    """Make dst point at the same data as src: reflink, hardlink, or copy"""
+    if _reflink(src, dst):
+        return
+    # A failed clone leaves an empty dst behind
+    dst.unlink(missing_ok=True)
+    # Without copy-on-write, names share the blob's inode: editing one of
+    # them in place (an image editor saving over it, a re-encode) changes
+    # the blob and every other name, i.e. every artwork with that content.
+    # Tools must write a new file and replace the name instead.
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    shutil.copy2(src, dst)
+
+
+class ImageStore:
+    """
+    Deduplicating store for artwork images
+    """
+
+    def __init__(self, db: Database, img_dir: Path = IMG_DIR, blob_dir: Path = BLOB_DIR):
+        self.db = db
+        self.img_dir = Path(img_dir)
+        self.blob_dir = Path(blob_dir)
+
+    # ---------- Lookups ----------
+    def blob_path(self, sha256: str, ext: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}{ext}"
+
+    def digest_of(self, name: str):
+        """Return the blob hash an image name refers to, or None"""
+        row = self.db.execute(
+            "SELECT sha256 FROM image_ref WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def digests_of(self, names):
+        """Return {name: sha256} for the registered names among the given ones"""
+        cursor = self.db.execute(
+            "SELECT name, sha256 FROM image_ref WHERE name IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(names)),)
+        )
+        return {name: sha256 for name, sha256 in cursor}
+
+    # ---------- Import ----------
+    def import_file(self, source) -> str:
+        """
+        Store an image and return the name to save in artwork.image.
+        Returns "" if the source cannot be read.
+        """
+        if not source:
+            return ""
+        src = Path(source)
+        if not src.is_file():
+            return ""
+        try:
+            if src.resolve().parent == self.img_dir.resolve():
+                return self._adopt(src)
+            sha256, size, staged = self._stage(src)
+            try:
+                blob = self._store_blob(staged, sha256, src.suffix.lower())
+            finally:
+                staged.unlink(missing_ok=True)
+            return self._publish(blob, sha256, size, src.name)
+        except OSError as e:
+            print(f"Error importing image {src}: {e}")
+            return ""
+
+    def _stage(self, src: Path):
+        """Bring src into the store in a single pass; returns (sha256, size, temp path)"""
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.blob_dir)
+        os.close(fd)
+        tmp = Path(tmp)
+        try:
+            if _reflink(src, tmp):
+                # The clone shared the data, so hashing is the only read
+                sha256, size = hash_file(tmp)
+            else:
+                sha256, size = _copy_hashing(src, tmp)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        return sha256, size, tmp
+
+    def _store_blob(self, staged: Path, sha256: str, ext: str) -> Path:
+        """Move a staged file into place unless the content is already stored"""
+        existing = self._existing_blob(sha256)
+        if existing is not None:
+            return existing
+        blob = self.blob_path(sha256, ext)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged, blob)
+        return blob
+
+    def _existing_blob(self, sha256: str):
+        row = self.db.execute(
+            "SELECT ext FROM image_blob WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row is None:
+            return None
+        blob = self.blob_path(sha256, row[0])
+        return blob if blob.exists() else None
+
+    def _adopt(self, path: Path) -> str:
+        """Register a file that already lives in IMG_DIR"""
+        name = path.name
+        if self.digest_of(name) is not None:
+            return name
+        sha256, size = hash_file(path)
+        blob = self._existing_blob(sha256)
+        if blob is None:
+            blob = self.blob_path(sha256, path.suffix.lower())
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(path, blob)
+        elif not os.path.samefile(blob, path):
+            # Same content stored elsewhere: share it
+            self._replace_with_link(blob, path)
+        self._register(sha256, size, blob.suffix, name)
+        return name
+
+    def _publish(self, blob: Path, sha256: str, size: int, wanted: str) -> str:
+        """Expose a blob under a free (or identical) name in IMG_DIR"""
+        self.img_dir.mkdir(parents=True, exist_ok=True)
+        stem, ext = Path(wanted).stem, Path(wanted).suffix
+        counter = 0
+        while True:
+            name = f"{stem}_{counter}{ext}" if counter else wanted
+            dest = self.img_dir / name
+            if not dest.exists():
+                _link_or_copy(blob, dest)
+                break
+            if self._same_content(dest, blob, sha256):
+                break
+            counter += 1
+        self._register(sha256, size, blob.suffix, name)
+        return name
+
+    def _same_content(self, dest: Path, blob: Path, sha256: str) -> bool:
+        if os.path.samefile(dest, blob):
+            return True
+        known = self.digest_of(dest.name)
+        if known is not None:
+            return known == sha256
+        # Unregistered legacy file: compare by size first, hash only if needed
+        if dest.stat().st_size != blob.stat().st_size or hash_file(dest)[0] != sha256:
+            return False
+        self._replace_with_link(blob, dest)
+        return True
+
+    def _replace_with_link(self, blob: Path, dest: Path):
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=dest.parent)
+        os.close(fd)
+        os.unlink(tmp)
+        try:
+            _link_or_copy(blob, Path(tmp))
+            os.replace(tmp, dest)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _register(self, sha256: str, size: int, ext: str, name: str):
+        with self.db.transaction():
+            self.db.execute(
+                "INSERT OR IGNORE INTO image_blob (sha256, size, ext) VALUES (?, ?, ?)",
+                (sha256, size, ext),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO image_ref (name, sha256) VALUES (?, ?)",
+                (name, sha256),
+            )
+
+    # ---------- Maintenance ----------
+    def dedupe(self):
+        """
+        Register every file in IMG_DIR, linking identical ones to a single
+        blob. Returns (files, blobs, bytes_saved).
+        """
+        files = 0
+        saved = 0
+        before = set()
+        for path in sorted(self.img_dir.iterdir()):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            st = path.stat()
+            inode = (st.st_dev, st.st_ino)
+            self._adopt(path)
+            files += 1
+            if inode in before:
+                continue
+            before.add(inode)
+            if path.stat().st_ino != st.st_ino:
+                # The file now shares a blob that was already stored
+                saved += st.st_size
+        blobs = self.db.execute("SELECT COUNT(*) FROM image_blob").fetchone()[0]
+        return files, blobs, saved
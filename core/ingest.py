@@ -0,0 +1,150 @@
+"""
+Image ingest pipeline
+
+When an image enters the store it is decoded once, EXIF orientation is
+applied, and fixed renditions are written:
+ - thumbnail: card size, read by the grid instead of the original
+ - medium:    preview size, progressive JPEG
+ - web:       small copy for browsers/Datasette (WebP, or progressive JPEG)
+
+Renditions are keyed by the blob hash from the image store, so identical
+photos are rendered once. Work runs on a process pool to use every core
+without holding the GUI thread.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core.paths import RENDITION_DIR
+from core.thumbnails import THUMB_SIZE, save_atomic
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+    ImageOps = None
+    features = None
+
+
+MEDIUM_SIZE = (1600, 1600)
+WEB_SIZE = (1024, 1024)
+
+
+def webp_supported() -> bool:
+    return features is not None and features.check("webp")
+
+
+def rendition_path(sha256: str, kind: str, rendition_dir: Path = RENDITION_DIR,
+                   webp: bool = None) -> Path:
+    """Where the rendition of a blob is stored (kind: "thumbnail", "medium" or "web")"""
+    if kind == "web":
+        if webp is None:
+            webp = webp_supported()
+        ext = ".webp" if webp else ".jpg"
+    else:
+        ext = ".jpg"
+    return Path(rendition_dir) / kind / sha256[:2] / f"{sha256}{ext}"
+
+
+def render_image(source, sha256: str, rendition_dir=RENDITION_DIR,
+                 web: bool = True, webp: bool = True):
+    """
+    Decode source once and write its renditions. Runs in worker processes,
+    so it only takes and returns picklable values.
+    Returns {kind: path} of the renditions written.
+    """
+    source = Path(source)
+    medium_path = rendition_path(sha256, "medium", rendition_dir)
+    web_path = rendition_path(sha256, "web", rendition_dir, webp=webp)
+    thumb_path = rendition_path(sha256, "thumbnail", rendition_dir)
+
+    with Image.open(source) as img:
+        # JPEG can decode straight at a reduced scale close to the largest rendition
+        img.draft("RGB", MEDIUM_SIZE)
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail(MEDIUM_SIZE, Image.LANCZOS)
+
+    written = {}
+    if not medium_path.exists():
+        save_atomic(img, medium_path, format="JPEG", quality=85,
+                    optimize=True, progressive=True)
+    written["medium"] = str(medium_path)
+
+    if web:
+        if not web_path.exists():
+            small = img.copy()
+            small.thumbnail(WEB_SIZE, Image.LANCZOS)
+            if webp:
+                save_atomic(small, web_path, format="WEBP", quality=80, method=4)
+            else:
+                save_atomic(small, web_path, format="JPEG", quality=80,
+                            optimize=True, progressive=True)
+        written["web"] = str(web_path)
+
+    if not thumb_path.exists():
+        thumb = img.copy()
+        thumb.thumbnail(THUMB_SIZE, Image.LANCZOS)
+        save_atomic(thumb, thumb_path, format="JPEG", quality=85)
+    written["thumbnail"] = str(thumb_path)
+    return written
+
+
+class IngestPipeline:
+    """
+    Process pool that renders imported images in the background
+    """
+
+    def __init__(self, rendition_dir: Path = RENDITION_DIR, max_workers: int = None,
+                 web: bool = True):
+        self.rendition_dir = Path(rendition_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.web = web
+        self._webp = webp_supported()
+        self._executor = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def submit(self, source, sha256: str):
+        """Queue the renditions of one image; returns a Future (None if nothing to do)"""
+        if not self.available or not sha256:
+            return None
+        return self._pool().submit(
+            render_image, str(source), sha256,
+            str(self.rendition_dir), self.web, self._webp,
+        )
+
+    def preview_path(self, source, sha256: str) -> Path:
+        """Best file to show in a preview: the medium rendition when it exists"""
+        if sha256:
+            medium = rendition_path(sha256, "medium", self.rendition_dir)
+            if medium.exists():
+                return medium
+        return Path(source)
+
+    def thumbnail_path(self, sha256: str):
+        """The card-sized rendition of a blob, or None until it is rendered"""
+        if sha256:
+            thumb = rendition_path(sha256, "thumbnail", self.rendition_dir)
+            if thumb.exists():
+                return thumb
+        return None
+
+    def shutdown(self, wait: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: never fork a process that is running a Qt event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
@@ -0,0 +1,385 @@
+"""
+Opt-in query instrumentation
+
+When enabled (ART_CATALOG_DIAGNOSTICS=1 or main.py --diagnostics), every
+Database opened afterwards routes its statements through a QueryRecorder,
+which keeps:
+ - per-statement counts, total time, p50/p95/p99 latency and rows returned
+   (time spent fetching rows counts towards the statement that produced them)
+ - commit count and latency
+ - N+1 findings: the same SELECT run again and again in a burst, or a
+   single-row lookup of an id that a listing query has just returned
+ - a slow-query log (JSON lines) with the EXPLAIN QUERY PLAN of offenders
+
+Disabled, Database.execute keeps its plain path and nothing is recorded.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+from core.paths import DIAGNOSTICS_DIR
+from core.queries import QUERIES
+
+
+ENV_VAR = "ART_CATALOG_DIAGNOSTICS"
+SLOW_LOG_PATH = DIAGNOSTICS_DIR / "slow_queries.jsonl"
+
+SAMPLE_SIZE = 2000          # Latest latencies kept per statement for percentiles
+SLOW_MS = 50.0
+BURST_WINDOW_MS = 250.0     # Statements closer than this belong to one burst
+N_PLUS_ONE_THRESHOLD = 10   # Same SELECT this many times in a burst
+LISTED_IDS_LIMIT = 20000    # IDs remembered per listing query
+LISTING_QUERIES = 8         # Listing queries remembered for refetch detection
+
+_READ_PREFIXES = ("SELECT", "WITH")
+_PLAN_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def normalize(sql: str) -> str:
+    """One-line form of a statement, used as its key"""
+    return " ".join(sql.split())
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _row_id(row):
+    """The "id" column of a sqlite3.Row or namedtuple row, if it has one"""
+    try:
+        if hasattr(row, "keys"):
+            return row["id"] if "id" in row.keys() else None
+        return getattr(row, "id", None)
+    except (IndexError, TypeError):
+        return None
+
+
+class _Call:
+    """One execution of a statement, completed as its rows are fetched"""
+
+    __slots__ = ("key", "sql", "params", "conn", "elapsed_ms", "rows", "ids", "done")
+
+    def __init__(self, key, sql, params, conn):
+        self.key = key
+        self.sql = sql
+        self.params = params
+        self.conn = conn
+        self.elapsed_ms = 0.0
+        self.rows = 0
+        self.ids = None
+        self.done = False
+
+
+class StatementStats:
+    """Aggregates of one normalized statement"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, elapsed_ms: float, rows: int):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.rows += rows
+        self.samples.append(elapsed_ms)
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": round(percentile(ordered, 0.50), 4),
+            "p95_ms": round(percentile(ordered, 0.95), 4),
+            "p99_ms": round(percentile(ordered, 0.99), 4),
+            "rows": self.rows,
+        }
+
+
+class InstrumentedCursor:
+    """
+    sqlite3 cursor proxy that times fetches and counts rows. Attribute
+    writes (row_factory) go to the wrapped cursor.
+    """
+
+    def __init__(self, cursor, call: _Call, recorder):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_call", call)
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _timed(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        self._call.elapsed_ms += (time.perf_counter() - start) * 1000
+        return result
+
+    def _seen(self, rows):
+        call = self._call
+        call.rows += len(rows)
+        if call.ids is not None:
+            for row in rows:
+                row_id = _row_id(row)
+                if row_id is not None and len(call.ids) < LISTED_IDS_LIMIT:
+                    call.ids.add(row_id)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is None:
+            self._recorder.finish(self._call)
+        else:
+            self._seen((row,))
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(self._cursor.fetchmany, size or self._cursor.arraysize)
+        self._seen(rows)
+        if not rows:
+            self._recorder.finish(self._call)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._seen(rows)
+        self._recorder.finish(self._call)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def __del__(self):
+        try:
+            self._recorder.finish(self._call)
+        except Exception:
+            pass
+
+
+class QueryRecorder:
+    """
+    Collects statement statistics from every instrumented connection.
+    Thread-safe: background readers record into the same recorder.
+    """
+
+    def __init__(self, slow_ms: float = SLOW_MS, slow_log: Path = SLOW_LOG_PATH,
+                 n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+                 burst_window_ms: float = BURST_WINDOW_MS):
+        self.slow_ms = slow_ms
+        self.slow_log = Path(slow_log) if slow_log else None
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.burst_window_ms = burst_window_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._statements = {}
+            self._commits = StatementStats()
+            self._bursts = {}               # {key: [last_ts, count]}
+            self._listed = OrderedDict()    # {listing key: set of ids}
+            self._findings = {}             # {(kind, key, other): finding dict}
+            self._slow = deque(maxlen=100)
+            self._plans = {}
+
+    # ---------- Recording ----------
+    def execute(self, conn, sql: str, params=()):
+        """Run a statement on conn and return an instrumented cursor"""
+        key = normalize(sql)
+        call = _Call(key, sql, params, conn)
+        if key.upper().startswith(_READ_PREFIXES):
+            call.ids = set()
+            self._observe_read(call)
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        call.elapsed_ms = (time.perf_counter() - start) * 1000
+        if cursor.description is None:
+            # No result set: the statement is complete
+            call.rows = max(cursor.rowcount, 0)
+            self.finish(call)
+            return cursor
+        return InstrumentedCursor(cursor, call, self)
+
+    def executemany(self, conn, sql: str, seq_of_params):
+        call = _Call(normalize(sql), sql, None, conn)
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        cursor.executemany(sql, seq_of_params)
+        call.elapsed_ms = (time.perf_counter() - start) * 1000
+        call.rows = max(cursor.rowcount, 0)
+        self.finish(call)
+        return cursor
+
+    def commit(self, conn):
+        start = time.perf_counter()
+        conn.execute("COMMIT")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._commits.add(elapsed_ms, 0)
+
+    def finish(self, call: _Call):
+        """Account a completed call (idempotent)"""
+        if call.done:
+            return
+        call.done = True
+        with self._lock:
+            stats = self._statements.get(call.key)
+            if stats is None:
+                stats = self._statements[call.key] = StatementStats()
+            stats.add(call.elapsed_ms, call.rows)
+            if call.ids and call.rows > 1:
+                self._listed.pop(call.key, None)
+                self._listed[call.key] = call.ids
+                while len(self._listed) > LISTING_QUERIES:
+                    self._listed.popitem(last=False)
+        if self.slow_ms is not None and call.elapsed_ms >= self.slow_ms:
+            self._log_slow(call)
+
+    def _observe_read(self, call: _Call):
+        now = time.perf_counter() * 1000
+        with self._lock:
+            burst = self._bursts.get(call.key)
+            if burst is None or now - burst[0] > self.burst_window_ms:
+                burst = self._bursts[call.key] = [now, 0]
+            burst[0] = now
+            burst[1] += 1
+            if burst[1] >= self.n_plus_one_threshold:
+                finding = self._finding("n+1", call.key, None)
+                finding["max_burst"] = max(finding.get("max_burst", 0), burst[1])
+                finding["example_params"] = repr(call.params)[:200]
+                if burst[1] == self.n_plus_one_threshold:
+                    finding["count"] += 1
+
+            # Lookup of one id that a listing query has just returned
+            params = call.params
+            if isinstance(params, (tuple, list)) and len(params) == 1 and isinstance(params[0], int):
+                for listing, ids in reversed(self._listed.items()):
+                    if listing != call.key and params[0] in ids:
+                        finding = self._finding("refetch", call.key, listing)
+                        finding["count"] += 1
+                        finding["example_params"] = repr(params)
+                        break
+
+    def _finding(self, kind, key, other):
+        finding = self._findings.get((kind, key, other))
+        if finding is None:
+            finding = {"kind": kind, "sql": key, "count": 0}
+            if other is not None:
+                finding["listed_by"] = other
+            self._findings[(kind, key, other)] = finding
+        return finding
+
+    # ---------- Slow queries ----------
+    def _plan(self, call: _Call):
+        if call.key in self._plans:
+            return self._plans[call.key]
+        plan = []
+        if call.key.upper().startswith(_PLAN_PREFIXES) and call.params is not None:
+            try:
+                rows = call.conn.execute(f"EXPLAIN QUERY PLAN {call.sql}", call.params).fetchall()
+                depth = {0: -1}
+                for node_id, parent, _, detail in rows:
+                    depth[node_id] = depth.get(parent, -1) + 1
+                    plan.append("  " * depth[node_id] + detail)
+            except Exception as e:
+                plan = [f"(no plan: {e})"]
+        self._plans[call.key] = plan
+        return plan
+
+    def _log_slow(self, call: _Call):
+        entry = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ms": round(call.elapsed_ms, 3),
+            "rows": call.rows,
+            "sql": call.key,
+            "params": repr(call.params)[:200],
+            "plan": self._plan(call),
+        }
+        with self._lock:
+            self._slow.append(entry)
+            if self.slow_log is None:
+                return
+            try:
+                self.slow_log.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.slow_log, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Error writing slow query log: {e}")
+
+    # ---------- Reporting ----------
+    def snapshot(self):
+        """Everything recorded so far, as plain JSON-ready data"""
+        with self._lock:
+            statements = [
+                {"sql": key, "name": QUERIES.name_of(key), **stats.to_dict()}
+                for key, stats in self._statements.items()
+            ]
+            commits = self._commits.to_dict()
+            findings = [dict(f) for f in self._findings.values() if f["count"]]
+            slow = list(self._slow)
+        statements.sort(key=lambda s: s["total_ms"], reverse=True)
+        findings.sort(key=lambda f: f["count"], reverse=True)
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "elapsed_s": round(time.time() - self.started, 1),
+            "totals": {
+                "queries": sum(s["count"] for s in statements),
+                "time_ms": round(sum(s["total_ms"] for s in statements), 3),
+                "rows": sum(s["rows"] for s in statements),
+            },
+            "commits": commits,
+            "statements": statements,
+            "findings": findings,
+            "slow": slow,
+        }
+
+    def dump(self, path: Path):
+        """Write snapshot() as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+
+_recorder = None
+
+
+def enable(**options) -> QueryRecorder:
+    """Instrument every Database opened from now on; returns the recorder"""
+    global _recorder
+    if _recorder is None:
+        _recorder = QueryRecorder(**options)
+    return _recorder
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def active_recorder():
+    """The recorder new connections should use, or None"""
+    return _recorder
+
+
+def enabled_by_environment() -> bool:
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
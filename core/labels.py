@@ -0,0 +1,425 @@
+"""
+Batch label generation for artwork codes
+
+Labels (a QR code or a Code128 barcode plus code, title, artist and price)
+are laid out on print-ready sheets and written as a multi-page PDF or as
+one PNG per page.
+
+ - Pages are composed on a process pool; at most a few pages are in flight
+   at once and each finished page is written out immediately, so memory
+   stays flat however many labels are printed.
+ - The symbol of each code is rendered once and kept under LABEL_CACHE_DIR,
+   so reprinting a catalog only composes pages.
+ - The PDF is written incrementally: every page is a 1-bit image stored
+   Flate-compressed, and the page tree is written after the last page.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+
+from core.paths import LABEL_CACHE_DIR
+from core.thumbnails import save_atomic
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+    ImageDraw = None
+    ImageFont = None
+
+try:
+    import qrcode
+except ImportError:
+    qrcode = None
+
+try:
+    import barcode
+    from barcode.writer import ImageWriter
+except ImportError:  # Code128 labels are optional
+    barcode = None
+    ImageWriter = None
+
+
+QR = "qr"
+CODE128 = "code128"
+
+# What is printed on one label
+Label = namedtuple("Label", ["code", "title", "artist", "price"])
+
+
+class LabelError(Exception):
+    """Raised when labels cannot be generated (missing library, bad option)"""
+
+
+def available_kinds():
+    """Symbologies that can be rendered with the installed libraries"""
+    kinds = []
+    if Image is not None and qrcode is not None:
+        kinds.append(QR)
+    if Image is not None and barcode is not None:
+        kinds.append(CODE128)
+    return kinds
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """
+    Grid of labels on a page. Sizes are in millimetres; the default is an
+    A4 sheet of 3 x 8 labels (70 x 37 mm).
+    """
+    page_width: float = 210.0
+    page_height: float = 297.0
+    columns: int = 3
+    rows: int = 8
+    margin_x: float = 0.0
+    margin_y: float = 0.5
+    gap_x: float = 0.0
+    gap_y: float = 0.0
+    padding: float = 2.5
+    dpi: int = 300
+
+    @property
+    def per_page(self) -> int:
+        return self.columns * self.rows
+
+    def px(self, mm: float) -> int:
+        return round(mm * self.dpi / 25.4)
+
+    @property
+    def page_size(self):
+        return self.px(self.page_width), self.px(self.page_height)
+
+    @property
+    def label_size(self):
+        """Size of one label in pixels"""
+        width = (self.page_width - 2 * self.margin_x - (self.columns - 1) * self.gap_x) / self.columns
+        height = (self.page_height - 2 * self.margin_y - (self.rows - 1) * self.gap_y) / self.rows
+        return self.px(width), self.px(height)
+
+    def origin(self, index: int):
+        """Top-left pixel of the index-th label on the page (row by row)"""
+        row, col = divmod(index, self.columns)
+        width, height = self.label_size
+        x = self.px(self.margin_x) + col * (width + self.px(self.gap_x))
+        y = self.px(self.margin_y) + row * (height + self.px(self.gap_y))
+        return x, y
+
+
+# ---------- Symbols ----------
+def symbol_path(code: str, kind: str, size, cache_dir: Path = LABEL_CACHE_DIR) -> Path:
+    """Cache file of the rendered symbol of a code at a given pixel size"""
+    digest = hashlib.sha1(code.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / kind / f"{size[0]}x{size[1]}" / digest[:2] / f"{digest}.png"
+
+
+def _render_qr(code: str, size):
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=1,
+        border=0,
+    )
+    qr.add_data(code)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white").get_image().convert("1")
+    # Whole pixels per module keep every module the same size
+    scale = max(1, min(size) // img.width)
+    return img.resize((img.width * scale, img.height * scale), Image.NEAREST)
+
+
+def _render_code128(code: str, size, dpi: int):
+    # One pixel per bar module, then widened by a whole factor
+    writer_options = {
+        "module_width": 25.4 / dpi,
+        "module_height": size[1] * 25.4 / dpi,
+        "quiet_zone": 0,
+        "write_text": False,
+        "dpi": dpi,
+    }
+    img = barcode.get_barcode_class("code128")(code, writer=ImageWriter()).render(writer_options)
+    img = img.convert("1")
+    scale = max(1, size[0] // img.width)
+    return img.resize((img.width * scale, size[1]), Image.NEAREST)
+
+
+def render_symbol(code: str, kind: str, size, dpi: int = 300,
+                  cache_dir: Path = LABEL_CACHE_DIR):
+    """Return the 1-bit symbol image of a code, rendering it only once"""
+    path = symbol_path(code, kind, size, cache_dir)
+    try:
+        with Image.open(path) as cached:
+            return cached.convert("1")
+    except (OSError, ValueError):
+        pass
+    if kind == QR:
+        img = _render_qr(code, size)
+    elif kind == CODE128:
+        img = _render_code128(code, size, dpi)
+    else:
+        raise LabelError(f"Unknown label kind: {kind}")
+    save_atomic(img, path, format="PNG")
+    return img
+
+
+# ---------- Pages ----------
+@lru_cache(maxsize=8)
+def _font(size: int):
+    for name in ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf"):
+        try:
+            # Labels are plain left-to-right text: the basic layout is much faster
+            return ImageFont.truetype(name, size, layout_engine=ImageFont.Layout.BASIC)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def _fit_text(text: str, font_size: int, width: int) -> str:
+    """Shorten text with an ellipsis until it fits width pixels"""
+    font = _font(font_size)
+    if font.getlength(text) <= width:
+        return text
+    # Longest prefix that still fits, found by bisection
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if font.getlength(text[:mid] + "…") <= width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "…"
+
+
+@lru_cache(maxsize=2048)
+def _text_image(text: str, font_size: int, width: int):
+    """
+    One line of label text as a 1-bit image. Artist names and prices repeat
+    across many labels, so their glyphs are rasterized only once.
+    """
+    text = _fit_text(text, font_size, width)
+    font = _font(font_size)
+    left, top, right, bottom = font.getbbox(text)
+    img = Image.new("1", (max(1, right), max(1, bottom)), 1)
+    ImageDraw.Draw(img).text((0, 0), text, fill=0, font=font)
+    return img
+
+
+def _draw_label(page, label: Label, origin, layout: SheetLayout, kind: str, cache_dir):
+    width, height = layout.label_size
+    pad = layout.px(layout.padding)
+    x0, y0 = origin[0] + pad, origin[1] + pad
+    inner_w, inner_h = width - 2 * pad, height - 2 * pad
+
+    # Four lines of text, at most 4 mm each
+    line_h = max(12, min(inner_h // 4, layout.px(4)))
+    font = round(line_h * 0.7)
+    bold = round(line_h * 0.8)
+    price = f"€ {label.price:.2f}" if label.price is not None else ""
+
+    if kind == QR:
+        # Symbol on the left, text on the right
+        side = min(inner_h, inner_w * 2 // 5)
+        symbol = render_symbol(label.code, kind, (side, side), layout.dpi, cache_dir)
+        page.paste(symbol, (x0, y0 + (inner_h - symbol.height) // 2))
+        tx = x0 + side + pad
+        text_w = inner_w - side - pad
+        ty = y0 + (inner_h - 4 * line_h) // 2
+        lines = [(label.code, bold), (label.title or "", font),
+                 (label.artist or "", font), (price, bold)]
+    else:
+        # Barcode across the top, text below
+        bar_h = inner_h - 2 * line_h
+        symbol = render_symbol(label.code, kind, (inner_w, bar_h), layout.dpi, cache_dir)
+        page.paste(symbol, (x0 + (inner_w - symbol.width) // 2, y0))
+        tx, text_w = x0, inner_w
+        lines = [(f"{label.code}   {price}".strip(), bold),
+                 (" — ".join(t for t in (label.title, label.artist) if t), font)]
+        ty = y0 + bar_h
+    for text, font_size in lines:
+        if text:
+            page.paste(_text_image(text, font_size, text_w), (tx, ty))
+        ty += line_h
+
+
+def render_page(labels, layout: SheetLayout, kind: str, cache_dir=LABEL_CACHE_DIR):
+    """Compose one sheet; returns a 1-bit PIL image"""
+    # Pure black and white: crisp symbols and tiny pages
+    page = Image.new("1", layout.page_size, 1)
+    for index, label in enumerate(labels):
+        _draw_label(page, Label._make(label), layout.origin(index), layout, kind, cache_dir)
+    return page
+
+
+def _page_job(labels, layout: SheetLayout, kind: str, cache_dir, png_path):
+    """
+    Worker entry point: compose a page and either save it as PNG (returns
+    the path) or return it packed for the PDF as (width, height, deflated bits).
+    """
+    page = render_page(labels, layout, kind, cache_dir)
+    if png_path is not None:
+        page.save(png_path, format="PNG", dpi=(layout.dpi, layout.dpi))
+        return png_path
+    return page.width, page.height, zlib.compress(page.tobytes(), 6)
+
+
+# ---------- Output ----------
+class PdfWriter:
+    """
+    Minimal PDF writer that emits each page as soon as it is added; only the
+    object offsets are kept until close().
+    """
+
+    def __init__(self, path: Path, dpi: int):
+        self.path = Path(path)
+        self.dpi = dpi
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._fh = open(self._tmp, "wb")
+        self._offsets = {}
+        self._pages = []
+        self._next_id = 3  # 1: catalog, 2: page tree
+        self._fh.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write_object(self, obj_id: int, body: bytes, stream: bytes = None):
+        self._offsets[obj_id] = self._fh.tell()
+        self._fh.write(f"{obj_id} 0 obj\n".encode("ascii"))
+        self._fh.write(body)
+        if stream is not None:
+            self._fh.write(b"\nstream\n")
+            self._fh.write(stream)
+            self._fh.write(b"\nendstream")
+        self._fh.write(b"\nendobj\n")
+
+    def _reserve(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def add_page(self, width: int, height: int, bits: bytes):
+        """Add a page from deflated 1-bit rows (PIL mode "1" bytes)"""
+        image_id, content_id, page_id = self._reserve(), self._reserve(), self._reserve()
+        # Page size in points (1/72 inch)
+        pw, ph = width * 72 / self.dpi, height * 72 / self.dpi
+        self._write_object(
+            image_id,
+            (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+             f"/ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode "
+             f"/Length {len(bits)} >>").encode("ascii"),
+            bits,
+        )
+        content = f"q {pw:.2f} 0 0 {ph:.2f} 0 0 cm /Im0 Do Q".encode("ascii")
+        self._write_object(content_id, f"<< /Length {len(content)} >>".encode("ascii"), content)
+        self._write_object(
+            page_id,
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.2f} {ph:.2f}] "
+             f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+             f"/Contents {content_id} 0 R >>").encode("ascii"),
+        )
+        self._pages.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{p} 0 R" for p in self._pages)
+        self._write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode("ascii"))
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self._fh.tell()
+        size = self._next_id
+        self._fh.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("ascii"))
+        for obj_id in range(1, size):
+            self._fh.write(f"{self._offsets[obj_id]:010d} 00000 n \n".encode("ascii"))
+        self._fh.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class LabelPrinter:
+    """
+    Renders labels for many artworks onto sheets using a process pool
+    """
+
+    def __init__(self, layout: SheetLayout = None, kind: str = QR,
+                 cache_dir: Path = LABEL_CACHE_DIR, max_workers: int = None):
+        if kind not in (QR, CODE128):
+            raise LabelError(f"Unknown label kind: {kind}")
+        if kind not in available_kinds():
+            package = "qrcode" if kind == QR else "python-barcode"
+            raise LabelError(f"{kind} labels need the '{package}' package")
+        self.layout = layout or SheetLayout()
+        self.kind = kind
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _pages(self, labels):
+        """Split an iterable of labels into page-sized tuples without reading ahead"""
+        labels = iter(labels)
+        while page := tuple(tuple(label) for label in islice(labels, self.layout.per_page)):
+            yield page
+
+    def _render(self, labels, png_paths=None):
+        """
+        Yield page results in order. Only a couple of pages per worker are
+        queued at any time, so labels are consumed as fast as pages are written.
+        """
+        window = self.max_workers * 2
+        pending = deque()
+        # spawn: never fork a process that is running a Qt event loop
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            for number, page in enumerate(self._pages(labels)):
+                png_path = str(png_paths(number)) if png_paths else None
+                pending.append(pool.submit(_page_job, page, self.layout, self.kind,
+                                           str(self.cache_dir), png_path))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _require_labels(labels):
+        """labels as an iterator; raises LabelError (before any file is written) if empty"""
+        labels = iter(labels)
+        first = next(labels, None)
+        if first is None:
+            raise LabelError("No labels to print")
+        return chain([first], labels)
+
+    def write_pdf(self, labels, dest: Path, progress=None) -> int:
+        """Write all labels to one PDF; returns the number of pages"""
+        labels = self._require_labels(labels)
+        writer = PdfWriter(dest, self.layout.dpi)
+        count = 0
+        try:
+            for page in self._render(labels):
+                writer.add_page(*page)
+                count += 1
+                if progress:
+                    progress(count)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return count
+
+    def write_png(self, labels, dest_dir: Path, prefix: str = "labels", progress=None) -> list:
+        """Write one PNG per sheet into dest_dir; returns the file paths"""
+        labels = self._require_labels(labels)
+        dest_dir = Path(dest_dir)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for path in self._render(labels, lambda n: dest_dir / f"{prefix}_{n + 1:04d}.png"):
+            paths.append(Path(path))
+            if progress:
+                progress(len(paths))
+        return paths
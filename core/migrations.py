@@ -0,0 +1,135 @@
+"""
+Schema migrations for Art Catalog Manager
+
+The schema version lives in PRAGMA user_version. Each migration step runs
+in its own transaction together with the version bump, so a failed step
+leaves the database at the previous version. Once the database is current,
+migrate() costs a single PRAGMA read.
+"""
+
+import sqlite3
+
+from core.database import Database
+from core.schema import (
+    TABLES_SQL,
+    BASE_INDEXES_SQL,
+    DUPLICATE_CODES_FIX_SQL,
+    LEGACY_ARTWORK_COLUMNS,
+    ARTWORK_PAGE_INDEXES_SQL,
+    SEARCH_SCHEMA_SQL,
+    SEARCH_REBUILD_SQL,
+    IMAGE_STORE_SCHEMA_SQL,
+    ARTWORK_IMAGE_SCHEMA_SQL,
+    ARTWORK_IMAGE_SEED_SQL,
+    SALE_QUANTITY_COLUMNS,
+    SALE_UNIT_PRICE_SEED_SQL,
+    REPORT_INDEXES_SQL,
+    SUMMARY_SCHEMA_SQL,
+    SUMMARY_REBUILD_SQL,
+)
+
+
+class MigrationError(Exception):
+    """Raised when the database cannot be brought to the current schema"""
+
+
+def split_statements(script: str):
+    """
+    Split an SQL script into single statements.
+
+    Trigger bodies contain ';' too, so statements are cut where SQLite
+    itself considers them complete.
+    """
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    return statements
+
+
+def _run_script(db: Database, script: str):
+    # executescript() would commit, so run statement by statement
+    for statement in split_statements(script):
+        db.execute(statement)
+
+
+def _add_columns(db: Database, table: str, columns):
+    existing = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns:
+        if name not in existing:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _add_legacy_artwork_columns(db: Database):
+    _add_columns(db, "artwork", LEGACY_ARTWORK_COLUMNS)
+
+
+def _create_base_indexes(db: Database):
+    # Legacy catalogs could hold the same code twice (or empty codes), which
+    # would make idx_artwork_code fail: the oldest artwork keeps the code,
+    # the others get a new one and a note saying which code they had
+    _run_script(db, DUPLICATE_CODES_FIX_SQL)
+    _run_script(db, BASE_INDEXES_SQL)
+
+
+def _add_sale_quantity(db: Database):
+    _add_columns(db, "sale", SALE_QUANTITY_COLUMNS)
+    _run_script(db, SALE_UNIT_PRICE_SEED_SQL)
+
+
+# (version, description, SQL script or callable taking the Database)
+# Append only: never edit or reorder a step that has shipped.
+MIGRATIONS = (
+    (1, "base tables", TABLES_SQL),
+    (2, "legacy artwork columns", _add_legacy_artwork_columns),
+    (3, "base indexes", _create_base_indexes),
+    (4, "keyset pagination indexes", ARTWORK_PAGE_INDEXES_SQL),
+    (5, "full-text search", SEARCH_SCHEMA_SQL + SEARCH_REBUILD_SQL),
+    (6, "content-addressed image store", IMAGE_STORE_SCHEMA_SQL),
+    (7, "multiple images per artwork", ARTWORK_IMAGE_SCHEMA_SQL + ARTWORK_IMAGE_SEED_SQL),
+    (8, "sale quantity and unit price", _add_sale_quantity),
+    (9, "report indexes", REPORT_INDEXES_SQL),
+    (10, "summary tables", SUMMARY_SCHEMA_SQL + SUMMARY_REBUILD_SQL),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(db: Database) -> int:
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db: Database) -> int:
+    """
+    Apply every pending migration in order.
+    Returns the number of steps applied (0 when already up to date).
+    """
+    current = schema_version(db)
+    if current == LATEST_VERSION:
+        return 0
+    if current > LATEST_VERSION:
+        raise MigrationError(
+            f"Database schema version {current} is newer than this application "
+            f"(supports up to {LATEST_VERSION})"
+        )
+
+    applied = 0
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            with db.transaction():
+                if callable(step):
+                    step(db)
+                else:
+                    _run_script(db, step)
+                db.execute(f"PRAGMA user_version = {int(version)}")
+        except sqlite3.Error as e:
+            raise MigrationError(
+                f"Migration {version} ({description}) failed: {e}"
+            ) from e
+        applied += 1
+    return applied
@@ -12,7 +12,13 @@ from pathlib import Path
 APP_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = APP_DIR / "data"
 IMG_DIR = APP_DIR / "images" / "artworks"
+BLOB_DIR = IMG_DIR / ".blobs"               # Content-addressed image store
+RENDITION_DIR = APP_DIR / "images" / "renditions"  # Resized, EXIF-corrected copies
 BACKUP_DIR = APP_DIR / "backups"
+CACHE_DIR = APP_DIR / "cache"
+THUMB_DIR = CACHE_DIR / "thumbnails"
+LABEL_CACHE_DIR = CACHE_DIR / "labels"      # Rendered QR/barcode images per code
+DIAGNOSTICS_DIR = CACHE_DIR / "diagnostics" # Slow-query log and query stats dumps
 
 # Database path
 DB_PATH = DATA_DIR / "catalog.db"
@@ -22,5 +28,5 @@ def ensure_paths():
     """
     Ensure all application directories exist
     """
-    for d in (DATA_DIR, IMG_DIR, BACKUP_DIR):
+    for d in (DATA_DIR, IMG_DIR, BLOB_DIR, RENDITION_DIR, BACKUP_DIR, THUMB_DIR):
         d.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,55 @@
+"""
+Registry of named SQL statements
+
+Repositories declare their fixed statements once, at import time, with
+query(name, sql). The text is built a single time, so every call passes
+the very same string to sqlite3 and hits the connection's statement cache
+(see ConnectionProfile.cached_statements) instead of being recompiled.
+The names also label statements in the query diagnostics.
+"""
+
+import textwrap
+
+
+class QueryRegistry:
+    """
+    Name -> SQL text of every registered statement
+    """
+
+    def __init__(self):
+        self._sql = {}
+        self._names = {}  # {one-line SQL: name}
+
+    def register(self, name: str, sql: str) -> str:
+        """Store a statement under name and return its SQL text"""
+        text = textwrap.dedent(sql).strip()
+        existing = self._sql.get(name)
+        if existing is not None and existing != text:
+            raise ValueError(f"Query {name!r} is already registered with different SQL")
+        self._sql[name] = text
+        self._names[" ".join(text.split())] = name
+        return text
+
+    def name_of(self, sql: str):
+        """Name a statement was registered under, or None"""
+        return self._names.get(" ".join(sql.split()))
+
+    def names(self):
+        return sorted(self._sql)
+
+    def __getitem__(self, name: str) -> str:
+        return self._sql[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sql
+
+    def __len__(self):
+        return len(self._sql)
+
+
+QUERIES = QueryRegistry()
+
+
+def query(name: str, sql: str) -> str:
+    """Register a statement in the global registry; returns its SQL text"""
+    return QUERIES.register(name, sql)
@@ -4,6 +4,22 @@ Artist repository - data access layer for artists
 
 from pathlib import Path
 from core.database import Database
+from core.queries import query
+from core.search import build_match_query
+
+
+GET_ALL = query("artist.get_all", "SELECT * FROM artist ORDER BY name")
+
+GET_BY_ID = query("artist.get_by_id", "SELECT * FROM artist WHERE id = ?")
+
+SEARCH = query("artist.search", """
+    SELECT ar.*
+    FROM artist_fts
+    INNER JOIN artist ar ON ar.id = artist_fts.rowid
+    WHERE artist_fts MATCH ?
+    ORDER BY bm25(artist_fts, 10.0, 1.0), ar.name
+    LIMIT ?
+""")
 
 
 class ArtistRepository:
@@ -16,15 +32,11 @@ class ArtistRepository:
 
     def get_all(self):
         """Get all artists"""
-        cursor = self.db.execute("SELECT * FROM artist ORDER BY name")
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ALL)
 
     def get_by_id(self, artist_id: int):
         """Get artist by ID"""
-        cursor = self.db.execute(
-            "SELECT * FROM artist WHERE id = ?", (artist_id,)
-        )
-        return cursor.fetchone()
+        return self.db.fetch_one(GET_BY_ID, (artist_id,))
 
     def create(self, name: str, bio: str = "", email: str = "", 
                phone: str = "", notes: str = ""):
@@ -38,6 +50,11 @@ class ArtistRepository:
         )
         return cursor.lastrowid
 
+    def create_many(self, artists):
+        """Create several artists (dicts of create() arguments) in one commit"""
+        with self.db.transaction():
+            return [self.create(**artist) for artist in artists]
+
     def update(self, artist_id: int, name: str, bio: str = "", 
                email: str = "", phone: str = "", notes: str = ""):
         """Update artist"""
@@ -54,10 +71,9 @@ class ArtistRepository:
         """Delete artist"""
         self.db.execute("DELETE FROM artist WHERE id = ?", (artist_id,))
 
-    def search(self, query: str):
-        """Search artists by name"""
-        cursor = self.db.execute(
-            "SELECT * FROM artist WHERE name LIKE ? ORDER BY name",
-            (f"%{query}%",)
-        )
-        return cursor.fetchall()
+    def search(self, query: str, limit: int = 200):
+        """Full-text search on name and bio, best match first"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        return self.db.fetch_all(SEARCH, (match, limit))
@@ -2,8 +2,141 @@
 Artwork repository - data access layer for artworks
 """
 
+import base64
+import json
+from collections import namedtuple
 from pathlib import Path
+from core.changes import ChangeSet
 from core.database import Database
+from core.queries import query
+from core.search import build_match_query
+
+
+PAGE_SIZE = 200
+
+# One page of a keyset-paginated listing; next_cursor is None on the last page
+ArtworkPage = namedtuple("ArtworkPage", ["rows", "next_cursor"])
+
+# Card view of an artwork: only the columns the grid shows. Large text
+# columns (description, notes) are left to get_by_id() on selection.
+ArtworkCard = namedtuple(
+    "ArtworkCard",
+    ["id", "artist_id", "title", "artist_name", "status", "price", "quantity", "image"],
+)
+
+CARD_SELECT = """
+    SELECT a.id, a.artist_id, a.title, ar.name, a.status, a.price, a.quantity, a.image
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+"""
+
+
+GET_ALL = query("artwork.get_all", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    ORDER BY a.title
+""")
+
+GET_BY_ID = query("artwork.get_by_id", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE a.id = ?
+""")
+
+# Uses idx_artwork_code
+GET_BY_CODE = query("artwork.get_by_code", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE a.code = ?
+""")
+
+GET_BY_ARTIST = query("artwork.get_by_artist", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE a.artist_id = ?
+    ORDER BY a.title
+""")
+
+GET_BY_STATUS = query("artwork.get_by_status", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE a.status = ?
+    ORDER BY a.title
+""")
+
+GET_CARDS_BY_IDS = query("artwork.get_cards_by_ids", f"""
+    {CARD_SELECT}
+    WHERE a.id IN (SELECT value FROM json_each(?))
+    ORDER BY a.title, a.id
+""")
+
+GET_IMAGES_FOR = query("artwork.get_images_for", """
+    SELECT artwork_id, image
+    FROM artwork_image
+    WHERE artwork_id IN (SELECT value FROM json_each(?))
+    ORDER BY artwork_id, position, id
+""")
+
+SEARCH = query("artwork.search", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork_fts
+    INNER JOIN artwork a ON a.id = artwork_fts.rowid
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE artwork_fts MATCH ?
+    ORDER BY bm25(artwork_fts, 10.0, 1.0, 5.0, 2.0, 1.0)
+    LIMIT ?
+""")
+
+# Artworks matching on their own text, their artist or one of their sales
+SEARCH_HITS = """
+    hits(id, score) AS (
+        SELECT rowid, bm25(artwork_fts, 10.0, 1.0, 5.0, 2.0, 1.0)
+        FROM artwork_fts WHERE artwork_fts MATCH :match
+        UNION ALL
+        SELECT a.id, bm25(artist_fts, 10.0, 1.0)
+        FROM artist_fts INNER JOIN artwork a ON a.artist_id = artist_fts.rowid
+        WHERE artist_fts MATCH :match
+        UNION ALL
+        SELECT s.artwork_id, bm25(sale_fts)
+        FROM sale_fts INNER JOIN sale s ON s.id = sale_fts.rowid
+        WHERE sale_fts MATCH :match
+    )
+"""
+
+SEARCH_CARDS = query("artwork.search_cards", f"""
+    WITH {SEARCH_HITS},
+    best AS (SELECT id, MIN(score) AS score FROM hits GROUP BY id)
+    {CARD_SELECT}
+    INNER JOIN best ON best.id = a.id
+    ORDER BY best.score, a.title, a.id
+    LIMIT :limit
+""")
+
+SEARCH_MATCHING = query("artwork.search_matching", f"""
+    WITH {SEARCH_HITS}
+    SELECT DISTINCT id FROM hits
+    WHERE id IN (SELECT value FROM json_each(:ids))
+""")
+
+
+def _card_factory(cursor, row):
+    return ArtworkCard._make(row)
+
+
+def encode_cursor(title: str, artwork_id: int) -> str:
+    """Opaque token for the (title, id) position after which the next page starts"""
+    raw = json.dumps([title, artwork_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(token: str):
+    title, artwork_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    return title, artwork_id
 
 
 class ArtworkRepository:
@@ -13,93 +146,54 @@ class ArtworkRepository:
 
     def __init__(self, db: Database):
         self.db = db
-        self._ensure_artist_cut_column()
-        self._ensure_quantity_column()
-        self._ensure_code_column()
-
-    def _ensure_artist_cut_column(self):
-        """Ensure artist_cut_percent column exists for legacy databases."""
-        cursor = self.db.execute("PRAGMA table_info(artwork)")
-        columns = {row[1] for row in cursor.fetchall()}
-        if "artist_cut_percent" not in columns:
-            try:
-                self.db.execute(
-                    "ALTER TABLE artwork ADD COLUMN artist_cut_percent REAL DEFAULT 10"
-                )
-            except Exception:
-                # If migration fails we leave DB untouched to avoid data loss
-                pass
-
-    def _ensure_quantity_column(self):
-        """Ensure quantity column exists for legacy databases."""
-        cursor = self.db.execute("PRAGMA table_info(artwork)")
-        columns = {row[1] for row in cursor.fetchall()}
-        if "quantity" not in columns:
-            try:
-                self.db.execute(
-                    "ALTER TABLE artwork ADD COLUMN quantity INTEGER DEFAULT 1"
-                )
-            except Exception:
-                # Leave DB unchanged if migration fails
-                pass
-
-    def _ensure_code_column(self):
-        """Ensure code column and unique index exist for legacy databases."""
-        cursor = self.db.execute("PRAGMA table_info(artwork)")
-        columns = {row[1] for row in cursor.fetchall()}
-        if "code" not in columns:
-            try:
-                self.db.execute(
-                    "ALTER TABLE artwork ADD COLUMN code TEXT"
-                )
-            except Exception:
-                pass
-        # Create unique index if not present (NULL values allowed)
-        try:
-            self.db.execute(
-                "CREATE UNIQUE INDEX IF NOT EXISTS idx_artwork_code ON artwork(code)"
-            )
-        except Exception:
-            pass
+        self.changes = ChangeSet()
+        # IDs written in a transaction that rolls back are forgotten again
+        db.add_rollback_listener(self)
 
     def get_all(self):
         """Get all artworks"""
-        cursor = self.db.execute(
-            """
-            SELECT a.*, ar.name as artist_name
-            FROM artwork a
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            ORDER BY a.title
-            """
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ALL)
 
     def get_by_id(self, artwork_id: int):
         """Get artwork by ID"""
-        cursor = self.db.execute(
-            """
-            SELECT a.*, ar.name as artist_name
-            FROM artwork a
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE a.id = ?
-            """,
-            (artwork_id,)
+        return self.db.fetch_one(GET_BY_ID, (artwork_id,))
+
+    def get_by_code(self, code: str):
+        """Get artwork by its unique code (uses idx_artwork_code)"""
+        return self.db.fetch_one(GET_BY_CODE, (code,))
+
+    def get_cards_by_ids(self, artwork_ids):
+        """Get the card view of several artworks in a single query"""
+        return self.db.fetch_all(
+            GET_CARDS_BY_IDS, (json.dumps(sorted(artwork_ids)),), row_factory=_card_factory
         )
-        return cursor.fetchone()
+
+    def _fetch_cards(self, where: str = "", params: tuple = (), limit: int = None):
+        """Run CARD_SELECT and return ArtworkCard tuples ordered by (title, id)"""
+        sql = f"{CARD_SELECT} {where} ORDER BY a.title, a.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        return self.db.fetch_all(sql, params, row_factory=_card_factory)
+
+    def take_changes(self) -> ChangeSet:
+        """Return the IDs written since the last call and start a new change set"""
+        changes, self.changes = self.changes, ChangeSet()
+        return changes
+
+    # ---------- Rollback listener (see Database.add_rollback_listener) ----------
+    def mark(self):
+        return self.changes, self.changes.copy()
+
+    def rollback(self, mark):
+        changes, saved = mark
+        # A change set taken inside the transaction is no longer ours to fix
+        if changes is self.changes:
+            self.changes.restore(saved)
 
     def get_by_artist(self, artist_id: int):
         """Get all artworks by artist"""
-        cursor = self.db.execute(
-            """
-            SELECT a.*, ar.name as artist_name
-            FROM artwork a
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE a.artist_id = ?
-            ORDER BY a.title
-            """,
-            (artist_id,)
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_BY_ARTIST, (artist_id,))
 
     def create(self, artist_id: int, code: str, title: str, description: str = "",
                type: str = "", quantity: int = 1, year: int = None, price: float = None,
@@ -114,8 +208,14 @@ class ArtworkRepository:
             """,
             (artist_id, code, title, description, type, quantity, year, price, artist_cut_percent, image, status, notes)
         )
+        self.changes.record_insert(cursor.lastrowid)
         return cursor.lastrowid
 
+    def create_many(self, artworks):
+        """Create several artworks (dicts of create() arguments) in one commit"""
+        with self.db.transaction():
+            return [self.create(**artwork) for artwork in artworks]
+
     def update(self, artwork_id: int, artist_id: int, title: str,
                code: str = None, description: str = "", type: str = "", quantity: int = 1, year: int = None,
                price: float = None, artist_cut_percent: float = 10.0,
@@ -132,35 +232,182 @@ class ArtworkRepository:
             (artist_id, code, title, description, type, quantity, year, price, artist_cut_percent, image,
              status, notes, artwork_id)
         )
+        self.changes.record_update(artwork_id)
 
     def delete(self, artwork_id: int):
         """Delete artwork"""
         self.db.execute("DELETE FROM artwork WHERE id = ?", (artwork_id,))
+        self.changes.record_delete(artwork_id)
 
-    def search(self, query: str):
-        """Search artworks by title"""
+    def decrement_stock(self, artwork_id: int, quantity: int = 1) -> bool:
+        """
+        Take quantity copies out of stock; the last copy marks the artwork sold.
+        Returns False (and changes nothing) if not enough copies are available.
+        """
         cursor = self.db.execute(
             """
-            SELECT a.*, ar.name as artist_name
-            FROM artwork a
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE a.title LIKE ?
-            ORDER BY a.title
+            UPDATE artwork
+            SET quantity = quantity - ?,
+                status = CASE WHEN quantity - ? <= 0 THEN 'sold' ELSE status END
+            WHERE id = ? AND quantity >= ? AND COALESCE(status, '') != 'sold'
             """,
-            (f"%{query}%",)
+            (quantity, quantity, artwork_id, quantity)
         )
-        return cursor.fetchall()
+        if cursor.rowcount == 0:
+            return False
+        self.changes.record_update(artwork_id)
+        return True
+
+    def copy_as_sold(self, artwork_id: int, code: str):
+        """Insert a sold single copy of an artwork (images included); returns its ID"""
+        cursor = self.db.execute(
+            """
+            INSERT INTO artwork
+            (artist_id, code, title, description, type, quantity, year, price, artist_cut_percent, image, status, notes)
+            SELECT artist_id, ?, title, description, type, 1, year, price, artist_cut_percent, image, 'sold', notes
+            FROM artwork WHERE id = ?
+            """,
+            (code, artwork_id)
+        )
+        copy_id = cursor.lastrowid
+        self.db.execute(
+            """
+            INSERT OR IGNORE INTO artwork_image (artwork_id, image, position)
+            SELECT ?, image, position FROM artwork_image WHERE artwork_id = ?
+            """,
+            (copy_id, artwork_id)
+        )
+        self.changes.record_insert(copy_id)
+        return copy_id
+
+    def get_images(self, artwork_id: int):
+        """Get the image names of an artwork, cover first"""
+        return self.get_images_for([artwork_id]).get(artwork_id, [])
+
+    def get_images_for(self, artwork_ids):
+        """Get the image names of several artworks in a single query: {artwork_id: [names]}"""
+        rows = self.db.fetch_all(
+            GET_IMAGES_FOR, (json.dumps(sorted(artwork_ids)),), row_factory=None
+        )
+        images = {}
+        for artwork_id, image in rows:
+            images.setdefault(artwork_id, []).append(image)
+        return images
+
+    def set_images(self, artwork_id: int, images):
+        """Replace the images of an artwork; the first one becomes the cover"""
+        images = list(dict.fromkeys(name for name in images if name))
+        with self.db.transaction():
+            self.db.execute(
+                "UPDATE artwork SET image = ? WHERE id = ?",
+                (images[0] if images else "", artwork_id)
+            )
+            self.db.execute("DELETE FROM artwork_image WHERE artwork_id = ?", (artwork_id,))
+            self.db.executemany(
+                "INSERT INTO artwork_image (artwork_id, image, position) VALUES (?, ?, ?)",
+                [(artwork_id, name, position) for position, name in enumerate(images)]
+            )
+        self.changes.record_update(artwork_id)
+
+    def add_images(self, artwork_id: int, images):
+        """Append images to an artwork, skipping the ones it already has"""
+        self.set_images(artwork_id, self.get_images(artwork_id) + list(images))
+
+    def search(self, query: str, limit: int = 200):
+        """Full-text search on title, description, code, type and notes, best match first"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        return self.db.fetch_all(SEARCH, (match, limit))
+
+    def search_cards(self, query: str, limit: int = 200):
+        """
+        Ranked card view of artworks matching the query on their own text,
+        their artist's name/bio or the buyer name of one of their sales.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        return self.db.fetch_all(
+            SEARCH_CARDS, {"match": match, "limit": limit}, row_factory=_card_factory
+        )
+
+    def search_matching(self, query: str, artwork_ids):
+        """The IDs among artwork_ids that search_cards(query) matches"""
+        match = build_match_query(query)
+        if not match or not artwork_ids:
+            return set()
+        rows = self.db.fetch_all(
+            SEARCH_MATCHING, {"match": match, "ids": json.dumps(sorted(artwork_ids))},
+            row_factory=None,
+        )
+        return {row[0] for row in rows}
 
     def get_by_status(self, status: str):
         """Get artworks by status"""
+        return self.db.fetch_all(GET_BY_STATUS, (status,))
+
+    def _filters(self, artist_id=None, status=None, exclude_status=None, query=None):
+        clauses, params = [], []
+        if artist_id:
+            clauses.append("a.artist_id = ?")
+            params.append(artist_id)
+        if status:
+            clauses.append("a.status = ?")
+            params.append(status)
+        if exclude_status:
+            clauses.append("a.status IS NOT ?")
+            params.append(exclude_status)
+        match = build_match_query(query) if query else None
+        if match:
+            clauses.append("a.id IN (SELECT rowid FROM artwork_fts WHERE artwork_fts MATCH ?)")
+            params.append(match)
+        return clauses, params
+
+    def iter_labels(self, artist_id: int = None, status: str = None,
+                    exclude_status: str = None, query: str = None):
+        """
+        Yield (code, title, artist_name, price) for every artwork matching the
+        same filters as get_page(), ordered by (title, id). Rows are streamed
+        from the cursor, so thousands of labels never sit in memory at once.
+        """
+        clauses, params = self._filters(artist_id, status, exclude_status, query)
+        clauses.append("a.code IS NOT NULL AND a.code != ''")
         cursor = self.db.execute(
-            """
-            SELECT a.*, ar.name as artist_name
+            f"""
+            SELECT a.code, a.title, ar.name, a.price
             FROM artwork a
             LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE a.status = ?
-            ORDER BY a.title
+            WHERE {' AND '.join(clauses)}
+            ORDER BY a.title, a.id
             """,
-            (status,)
+            tuple(params)
         )
-        return cursor.fetchall()
+        for row in cursor:
+            yield tuple(row)
+
+    def get_page(self, cursor: str = None, page_size: int = PAGE_SIZE,
+                 artist_id: int = None, status: str = None,
+                 exclude_status: str = None, query: str = None) -> ArtworkPage:
+        """
+        Get one page of ArtworkCard rows ordered by (title, id).
+        Pass the previous page's next_cursor to continue after it.
+        """
+        clauses, params = self._filters(artist_id, status, exclude_status, query)
+        if cursor:
+            clauses.append("(a.title, a.id) > (?, ?)")
+            params.extend(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._fetch_cards(where, tuple(params), limit=page_size + 1)
+        if len(rows) <= page_size:
+            return ArtworkPage(rows, None)
+        rows = rows[:page_size]
+        last = rows[-1]
+        return ArtworkPage(rows, encode_cursor(last.title, last.id))
+
+    def count(self, artist_id: int = None, status: str = None,
+              exclude_status: str = None, query: str = None) -> int:
+        """Count artworks matching the same filters as get_page()"""
+        clauses, params = self._filters(artist_id, status, exclude_status, query)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.db.fetch_scalar(f"SELECT COUNT(*) FROM artwork a {where}", tuple(params))
@@ -4,6 +4,21 @@ Exhibition repository - data access layer for exhibitions
 
 from pathlib import Path
 from core.database import Database
+from core.queries import query
+
+
+GET_ALL = query("exhibition.get_all", "SELECT * FROM exhibition ORDER BY start_date DESC")
+
+GET_BY_ID = query("exhibition.get_by_id", "SELECT * FROM exhibition WHERE id = ?")
+
+GET_ARTWORKS = query("exhibition.get_artworks", """
+    SELECT a.*, ar.name as artist_name
+    FROM artwork a
+    INNER JOIN exhibition_artwork ea ON a.id = ea.artwork_id
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE ea.exhibition_id = ?
+    ORDER BY a.title
+""")
 
 
 class ExhibitionRepository:
@@ -16,17 +31,11 @@ class ExhibitionRepository:
 
     def get_all(self):
         """Get all exhibitions"""
-        cursor = self.db.execute(
-            "SELECT * FROM exhibition ORDER BY start_date DESC"
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ALL)
 
     def get_by_id(self, exhibition_id: int):
         """Get exhibition by ID"""
-        cursor = self.db.execute(
-            "SELECT * FROM exhibition WHERE id = ?", (exhibition_id,)
-        )
-        return cursor.fetchone()
+        return self.db.fetch_one(GET_BY_ID, (exhibition_id,))
 
     def create(self, name: str, location: str = "", start_date: str = "",
                end_date: str = "", description: str = ""):
@@ -78,15 +87,4 @@ class ExhibitionRepository:
 
     def get_artworks(self, exhibition_id: int):
         """Get all artworks in exhibition"""
-        cursor = self.db.execute(
-            """
-            SELECT a.*, ar.name as artist_name
-            FROM artwork a
-            INNER JOIN exhibition_artwork ea ON a.id = ea.artwork_id
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE ea.exhibition_id = ?
-            ORDER BY a.title
-            """,
-            (exhibition_id,)
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ARTWORKS, (exhibition_id,))
@@ -0,0 +1,179 @@
+"""
+Report repository - sales and artist payout totals, aggregated in SQL
+
+Every report is one GROUP BY statement (with window functions for running
+totals, ranks and shares) and returns a handful of rows, whatever the
+number of sales. Periods are ISO dates, both ends included; None leaves
+that end open. Sales in a period are found through idx_sale_date.
+"""
+
+from collections import namedtuple
+from datetime import date, timedelta
+
+from core.database import Database
+from core.queries import query
+
+
+MonthRevenue = namedtuple(
+    "MonthRevenue",
+    ["month", "sales", "copies", "revenue", "running_revenue", "change"],
+)
+ArtistRevenue = namedtuple(
+    "ArtistRevenue",
+    ["artist_id", "artist_name", "sales", "copies", "revenue", "payout", "unpaid",
+     "rank", "share"],
+)
+MethodRevenue = namedtuple(
+    "MethodRevenue",
+    ["payment_method", "sales", "copies", "revenue", "average", "share"],
+)
+ExhibitionRevenue = namedtuple(
+    "ExhibitionRevenue",
+    ["exhibition_id", "name", "start_date", "end_date", "artworks", "sales", "copies",
+     "revenue"],
+)
+ArtistPayout = namedtuple(
+    "ArtistPayout",
+    ["artist_id", "artist_name", "payments", "amount", "oldest_sale", "share"],
+)
+ReportTotals = namedtuple(
+    "ReportTotals",
+    ["sales", "copies", "revenue", "average", "payout", "unpaid"],
+)
+
+# Beyond any ISO date or datetime: the upper bound of an open period
+OPEN_END = "9999-99-99"
+
+# Bounds of every period query: sale_date >= ? AND sale_date < ?
+PERIOD = "s.sale_date >= ? AND s.sale_date < ?"
+
+TOTALS = query("report.totals", f"""
+    SELECT COUNT(*), COALESCE(SUM(s.quantity), 0), COALESCE(SUM(s.sale_price), 0),
+           COALESCE(AVG(s.sale_price), 0), COALESCE(SUM(ap.amount), 0),
+           COALESCE(SUM(CASE WHEN ap.paid = 0 THEN ap.amount END), 0)
+    FROM sale s
+    LEFT JOIN artist_payment ap ON ap.sale_id = s.id
+    WHERE {PERIOD}
+""")
+
+REVENUE_BY_MONTH = query("report.revenue_by_month", f"""
+    SELECT month, sales, copies, revenue,
+           SUM(revenue) OVER (ORDER BY month),
+           revenue - LAG(revenue) OVER (ORDER BY month)
+    FROM (
+        SELECT substr(s.sale_date, 1, 7) AS month, COUNT(*) AS sales,
+               SUM(s.quantity) AS copies, SUM(s.sale_price) AS revenue
+        FROM sale s
+        WHERE {PERIOD}
+        GROUP BY month
+    )
+    ORDER BY month
+""")
+
+# Names are joined after grouping: one artist lookup per row of the result
+REVENUE_BY_ARTIST = query("report.revenue_by_artist", f"""
+    WITH per_artist AS (
+        SELECT a.artist_id, COUNT(*) AS sales, SUM(s.quantity) AS copies,
+               SUM(s.sale_price) AS revenue, SUM(ap.amount) AS payout,
+               SUM(CASE WHEN ap.paid = 0 THEN ap.amount END) AS unpaid
+        FROM sale s
+        INNER JOIN artwork a ON s.artwork_id = a.id
+        LEFT JOIN artist_payment ap ON ap.sale_id = s.id
+        WHERE {PERIOD}
+        GROUP BY a.artist_id
+    )
+    SELECT p.artist_id, ar.name, p.sales, p.copies, p.revenue,
+           COALESCE(p.payout, 0), COALESCE(p.unpaid, 0),
+           RANK() OVER (ORDER BY p.revenue DESC),
+           p.revenue / SUM(p.revenue) OVER ()
+    FROM per_artist p
+    LEFT JOIN artist ar ON p.artist_id = ar.id
+    ORDER BY p.revenue DESC
+""")
+
+REVENUE_BY_METHOD = query("report.revenue_by_payment_method", f"""
+    SELECT COALESCE(s.payment_method, '') AS method, COUNT(*),
+           SUM(s.quantity), SUM(s.sale_price), AVG(s.sale_price),
+           SUM(s.sale_price) / SUM(SUM(s.sale_price)) OVER ()
+    FROM sale s
+    WHERE {PERIOD}
+    GROUP BY method
+    ORDER BY 4 DESC
+""")
+
+# A sale counts for an exhibition when the artwork was on show that day.
+# Exhibitions without an end date are still running.
+REVENUE_BY_EXHIBITION = query("report.revenue_by_exhibition", f"""
+    SELECT e.id, e.name, e.start_date, e.end_date, COUNT(DISTINCT s.artwork_id),
+           COUNT(*), SUM(s.quantity), SUM(s.sale_price)
+    FROM exhibition e
+    INNER JOIN exhibition_artwork ea ON ea.exhibition_id = e.id
+    INNER JOIN sale s ON s.artwork_id = ea.artwork_id
+    WHERE {PERIOD}
+      AND s.sale_date >= e.start_date
+      AND s.sale_date < COALESCE(date(e.end_date, '+1 day'), '{OPEN_END}')
+    GROUP BY e.id
+    ORDER BY 8 DESC
+""")
+
+OUTSTANDING_PAYOUTS = query("report.outstanding_payouts", """
+    SELECT ap.artist_id, ar.name, COUNT(*), SUM(ap.amount), MIN(s.sale_date),
+           SUM(ap.amount) / SUM(SUM(ap.amount)) OVER ()
+    FROM artist_payment ap
+    INNER JOIN artist ar ON ap.artist_id = ar.id
+    INNER JOIN sale s ON ap.sale_id = s.id
+    WHERE ap.paid = 0
+    GROUP BY ap.artist_id
+    ORDER BY 4 DESC
+""")
+
+
+def period_bounds(start: str = None, end: str = None):
+    """(lower, upper) sale_date bounds for a period with both ends included"""
+    upper = OPEN_END
+    if end:
+        upper = (date.fromisoformat(end[:10]) + timedelta(days=1)).isoformat()
+    return (start or "", upper)
+
+
+def _factory(row_type):
+    def factory(cursor, row):
+        return row_type._make(row)
+    return factory
+
+
+class ReportRepository:
+    """
+    Aggregated sales reports
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def _report(self, sql, row_type, params=()):
+        return self.db.fetch_all(sql, params, row_factory=_factory(row_type))
+
+    def totals(self, start: str = None, end: str = None) -> ReportTotals:
+        """Sales, copies, revenue, average ticket and artist payouts of a period"""
+        return self.db.fetch_one(TOTALS, period_bounds(start, end),
+                                 row_factory=_factory(ReportTotals))
+
+    def revenue_by_month(self, start: str = None, end: str = None):
+        """Revenue per month (YYYY-MM) with running total and change on the month before"""
+        return self._report(REVENUE_BY_MONTH, MonthRevenue, period_bounds(start, end))
+
+    def revenue_by_artist(self, start: str = None, end: str = None):
+        """Revenue and payouts per artist, best seller first (artist_id None: no artist)"""
+        return self._report(REVENUE_BY_ARTIST, ArtistRevenue, period_bounds(start, end))
+
+    def revenue_by_payment_method(self, start: str = None, end: str = None):
+        """Revenue per payment method ("" when not recorded)"""
+        return self._report(REVENUE_BY_METHOD, MethodRevenue, period_bounds(start, end))
+
+    def revenue_by_exhibition(self, start: str = None, end: str = None):
+        """Sales of exhibited artworks made while the exhibition was running"""
+        return self._report(REVENUE_BY_EXHIBITION, ExhibitionRevenue, period_bounds(start, end))
+
+    def outstanding_payouts(self):
+        """Unpaid artist payments per artist, whatever the sale date"""
+        return self._report(OUTSTANDING_PAYOUTS, ArtistPayout)
@@ -4,6 +4,65 @@ Sale repository - data access layer for sales and artist payments
 
 from pathlib import Path
 from core.database import Database
+from core.queries import query
+from core.search import build_match_query
+
+
+GET_ALL = query("sale.get_all", """
+    SELECT s.*, a.title as artwork_title, ar.name as artist_name
+    FROM sale s
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    ORDER BY s.sale_date DESC
+""")
+
+GET_BY_ID = query("sale.get_by_id", """
+    SELECT s.*, a.title as artwork_title, ar.name as artist_name
+    FROM sale s
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE s.id = ?
+""")
+
+SEARCH = query("sale.search", """
+    SELECT s.*, a.title as artwork_title, ar.name as artist_name
+    FROM sale_fts
+    INNER JOIN sale s ON s.id = sale_fts.rowid
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    LEFT JOIN artist ar ON a.artist_id = ar.id
+    WHERE sale_fts MATCH ?
+    ORDER BY bm25(sale_fts), s.sale_date DESC
+    LIMIT ?
+""")
+
+GET_ARTIST_PAYMENTS = query("sale.get_artist_payments", """
+    SELECT ap.*, s.sale_date, a.title as artwork_title
+    FROM artist_payment ap
+    INNER JOIN sale s ON ap.sale_id = s.id
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    WHERE ap.artist_id = ?
+    ORDER BY s.sale_date DESC
+""")
+
+GET_UNPAID_PAYMENTS = query("sale.get_unpaid_payments", """
+    SELECT ap.*, s.sale_date, a.title as artwork_title, ar.name as artist_name
+    FROM artist_payment ap
+    INNER JOIN sale s ON ap.sale_id = s.id
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    INNER JOIN artist ar ON ap.artist_id = ar.id
+    WHERE ap.paid = 0
+    ORDER BY s.sale_date
+""")
+
+GET_UNPAID_PAYMENTS_BY_ARTIST = query("sale.get_unpaid_payments_by_artist", """
+    SELECT ap.*, s.sale_date, a.title as artwork_title, ar.name as artist_name
+    FROM artist_payment ap
+    INNER JOIN sale s ON ap.sale_id = s.id
+    INNER JOIN artwork a ON s.artwork_id = a.id
+    INNER JOIN artist ar ON ap.artist_id = ar.id
+    WHERE ap.paid = 0 AND ap.artist_id = ?
+    ORDER BY s.sale_date
+""")
 
 
 class SaleRepository:
@@ -16,41 +75,32 @@ class SaleRepository:
 
     def get_all(self):
         """Get all sales"""
-        cursor = self.db.execute(
-            """
-            SELECT s.*, a.title as artwork_title, ar.name as artist_name
-            FROM sale s
-            INNER JOIN artwork a ON s.artwork_id = a.id
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            ORDER BY s.sale_date DESC
-            """
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ALL)
 
     def get_by_id(self, sale_id: int):
         """Get sale by ID"""
-        cursor = self.db.execute(
-            """
-            SELECT s.*, a.title as artwork_title, ar.name as artist_name
-            FROM sale s
-            INNER JOIN artwork a ON s.artwork_id = a.id
-            LEFT JOIN artist ar ON a.artist_id = ar.id
-            WHERE s.id = ?
-            """,
-            (sale_id,)
-        )
-        return cursor.fetchone()
+        return self.db.fetch_one(GET_BY_ID, (sale_id,))
+
+    def search(self, query: str, limit: int = 200):
+        """Full-text search on buyer name, best match first"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        return self.db.fetch_all(SEARCH, (match, limit))
 
     def create(self, artwork_id: int, sale_date: str, sale_price: float,
-               buyer_name: str = "", payment_method: str = "", notes: str = ""):
-        """Create new sale"""
+               buyer_name: str = "", payment_method: str = "", notes: str = "",
+               quantity: int = 1, unit_price: float = None):
+        """Create new sale; sale_price is the total for all quantity copies"""
+        if unit_price is None:
+            unit_price = sale_price / quantity
         cursor = self.db.execute(
             """
             INSERT INTO sale 
-            (artwork_id, sale_date, sale_price, buyer_name, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (artwork_id, sale_date, sale_price, buyer_name, payment_method, notes, quantity, unit_price)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (artwork_id, sale_date, sale_price, buyer_name, payment_method, notes)
+            (artwork_id, sale_date, sale_price, buyer_name, payment_method, notes, quantity, unit_price)
         )
         return cursor.lastrowid
 
@@ -61,11 +111,11 @@ class SaleRepository:
         self.db.execute(
             """
             UPDATE sale
-            SET artwork_id = ?, sale_date = ?, sale_price = ?,
+            SET artwork_id = ?, sale_date = ?, sale_price = ?, unit_price = ? / quantity,
                 buyer_name = ?, payment_method = ?, notes = ?
             WHERE id = ?
             """,
-            (artwork_id, sale_date, sale_price, buyer_name, payment_method, 
+            (artwork_id, sale_date, sale_price, sale_price, buyer_name, payment_method, 
              notes, sale_id)
         )
 
@@ -94,44 +144,10 @@ class SaleRepository:
 
     def get_artist_payments(self, artist_id: int):
         """Get all payments for an artist"""
-        cursor = self.db.execute(
-            """
-            SELECT ap.*, s.sale_date, a.title as artwork_title
-            FROM artist_payment ap
-            INNER JOIN sale s ON ap.sale_id = s.id
-            INNER JOIN artwork a ON s.artwork_id = a.id
-            WHERE ap.artist_id = ?
-            ORDER BY s.sale_date DESC
-            """,
-            (artist_id,)
-        )
-        return cursor.fetchall()
+        return self.db.fetch_all(GET_ARTIST_PAYMENTS, (artist_id,))
 
     def get_unpaid_payments(self, artist_id: int = None):
         """Get unpaid artist payments"""
         if artist_id:
-            cursor = self.db.execute(
-                """
-                SELECT ap.*, s.sale_date, a.title as artwork_title, ar.name as artist_name
-                FROM artist_payment ap
-                INNER JOIN sale s ON ap.sale_id = s.id
-                INNER JOIN artwork a ON s.artwork_id = a.id
-                INNER JOIN artist ar ON ap.artist_id = ar.id
-                WHERE ap.paid = 0 AND ap.artist_id = ?
-                ORDER BY s.sale_date
-                """,
-                (artist_id,)
-            )
-        else:
-            cursor = self.db.execute(
-                """
-                SELECT ap.*, s.sale_date, a.title as artwork_title, ar.name as artist_name
-                FROM artist_payment ap
-                INNER JOIN sale s ON ap.sale_id = s.id
-                INNER JOIN artwork a ON s.artwork_id = a.id
-                INNER JOIN artist ar ON ap.artist_id = ar.id
-                WHERE ap.paid = 0
-                ORDER BY s.sale_date
-                """
-            )
-        return cursor.fetchall()
+            return self.db.fetch_all(GET_UNPAID_PAYMENTS_BY_ARTIST, (artist_id,))
+        return self.db.fetch_all(GET_UNPAID_PAYMENTS)
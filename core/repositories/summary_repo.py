@@ -0,0 +1,101 @@
+"""
+Summary repository - dashboard counters read from the summary tables
+
+The summary tables are kept up to date by triggers (see core.schema), so
+every method here reads a few rows by primary key instead of scanning
+artworks, sales or payments.
+"""
+
+from collections import namedtuple
+
+from core.database import Database
+from core.queries import query
+
+
+# Catalog-wide figures shown by the dashboard
+Dashboard = namedtuple(
+    "Dashboard",
+    ["artworks", "available", "available_copies", "reserved", "exhibition", "sold",
+     "stock_value", "month_sales", "month_revenue", "unpaid_payments", "unpaid_amount"],
+)
+
+STATUS_COUNTS = query("summary.status_counts", """
+    SELECT status, artworks, copies, value FROM artwork_status_summary
+""")
+
+TOTAL_ARTWORKS = query("summary.total_artworks", """
+    SELECT COALESCE(SUM(artworks), 0) FROM artwork_status_summary
+""")
+
+ARTIST_ARTWORKS = query("summary.artist_artworks", """
+    SELECT artworks FROM artist_stock_summary WHERE artist_id = ?
+""")
+
+STOCK_VALUE = query("summary.stock_value", """
+    SELECT COALESCE(SUM(stock_value), 0) FROM artist_stock_summary
+""")
+
+ARTIST_STOCK = query("summary.artist_stock", """
+    SELECT stock_artworks, stock_copies, stock_value
+    FROM artist_stock_summary WHERE artist_id = ?
+""")
+
+MONTH = query("summary.month", """
+    SELECT sales, revenue FROM sale_month_summary WHERE month = ?
+""")
+
+UNPAID = query("summary.unpaid", """
+    SELECT COALESCE(SUM(unpaid_payments), 0), COALESCE(SUM(unpaid_amount), 0)
+    FROM artist_payout_summary
+""")
+
+ARTIST_UNPAID = query("summary.artist_unpaid", """
+    SELECT unpaid_payments, unpaid_amount FROM artist_payout_summary WHERE artist_id = ?
+""")
+
+
+class SummaryRepository:
+    """
+    Read-only access to the trigger-maintained counters
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def artwork_count(self, artist_id: int = None) -> int:
+        """Number of artworks, of one artist or of the whole catalog"""
+        if artist_id:
+            return self.db.fetch_scalar(ARTIST_ARTWORKS, (artist_id,), default=0)
+        return self.db.fetch_scalar(TOTAL_ARTWORKS, default=0)
+
+    def status_counts(self):
+        """{status: (artworks, copies, value)}"""
+        return {row[0]: tuple(row[1:]) for row in self.db.fetch_all(STATUS_COUNTS, row_factory=None)}
+
+    def artist_stock(self, artist_id: int):
+        """(artworks, copies, value) of an artist's unsold artworks"""
+        return self.db.fetch_one(ARTIST_STOCK, (artist_id,), row_factory=None) or (0, 0, 0.0)
+
+    def artist_unpaid(self, artist_id: int):
+        """(payments, amount) still due to an artist"""
+        return self.db.fetch_one(ARTIST_UNPAID, (artist_id,), row_factory=None) or (0, 0.0)
+
+    def dashboard(self, month: str) -> Dashboard:
+        """Catalog-wide counters, with sales of month (YYYY-MM)"""
+        statuses = self.status_counts()
+        available = statuses.get("available", (0, 0, 0.0))
+        month_sales, month_revenue = self.db.fetch_one(MONTH, (month,), row_factory=None) or (0, 0.0)
+        unpaid_payments, unpaid_amount = self.db.fetch_one(UNPAID, row_factory=None)
+        return Dashboard(
+            artworks=sum(s[0] for s in statuses.values()),
+            available=available[0],
+            available_copies=available[1],
+            reserved=statuses.get("reserved", (0,))[0],
+            exhibition=statuses.get("exhibition", (0,))[0],
+            sold=statuses.get("sold", (0,))[0],
+            stock_value=self.db.fetch_scalar(STOCK_VALUE, default=0.0),
+            month_sales=month_sales,
+            month_revenue=month_revenue,
+            unpaid_payments=unpaid_payments,
+            unpaid_amount=unpaid_amount,
+        )
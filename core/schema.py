@@ -2,7 +2,10 @@
 Database schema for Art Catalog Manager
 """
 
-SCHEMA_SQL = """
+# Tabelle senza indici: gli indici della versione base vengono creati dopo
+# le colonne aggiunte ai DB legacy (idx_artwork_code richiede "code").
+# Lo schema completo e' il risultato di core/migrations.py.
+TABLES_SQL = """
 -- =========================================================
 -- ART CATALOG MANAGEMENT DATABASE
 -- =========================================================
@@ -164,7 +167,9 @@ CREATE TABLE IF NOT EXISTS user (
     username TEXT UNIQUE,
     pin TEXT
 );
+"""
 
+BASE_INDEXES_SQL = """
 -- =========================================================
 -- INDEXES
 -- =========================================================
@@ -182,3 +187,393 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_artwork_code
 CREATE INDEX IF NOT EXISTS idx_sale_date
     ON sale(sale_date);
 """
+
+
+# Prima di idx_artwork_code: codici vuoti -> NULL, e i codici ripetuti
+# restano solo sull'opera piu vecchia (le altre ricevono un codice nuovo
+# e una nota con quello vecchio)
+DUPLICATE_CODES_FIX_SQL = """
+UPDATE artwork SET code = NULL WHERE trim(code) = '';
+
+UPDATE artwork
+SET notes = CASE WHEN COALESCE(notes, '') = '' THEN '' ELSE notes || char(10) END
+            || 'Codice duplicato ' || code || ' sostituito',
+    code = 'ART-' || upper(hex(randomblob(4)))
+WHERE code IS NOT NULL
+  AND id NOT IN (SELECT MIN(id) FROM artwork WHERE code IS NOT NULL GROUP BY code);
+"""
+
+
+# =========================================================
+# LEGACY COLUMNS
+# =========================================================
+# Colonne aggiunte ad "artwork" dopo la prima versione: i DB creati
+# prima le ricevono con ALTER TABLE durante la migrazione
+# =========================================================
+LEGACY_ARTWORK_COLUMNS = (
+    ("artist_cut_percent", "REAL DEFAULT 10"),
+    ("quantity", "INTEGER DEFAULT 1"),
+    ("code", "TEXT"),
+)
+
+
+# =========================================================
+# PAGINATION INDEXES
+# =========================================================
+# Paginazione keyset su (title, id): la griglia e Datasette scorrono
+# il catalogo in ordine di titolo senza scansioni OFFSET.
+# idx_artwork_title_id contiene anche le colonne delle card, quindi
+# una pagina si legge solo dall'indice.
+# =========================================================
+ARTWORK_PAGE_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_artwork_title_id
+    ON artwork(title, id, artist_id, status, price, quantity, image);
+
+CREATE INDEX IF NOT EXISTS idx_artwork_artist_title
+    ON artwork(artist_id, title, id);
+
+CREATE INDEX IF NOT EXISTS idx_artwork_status_title
+    ON artwork(status, title, id);
+"""
+
+
+# =========================================================
+# FULL-TEXT SEARCH (FTS5)
+# =========================================================
+# Indici full-text "external content": il testo resta nelle tabelle
+# originali, i trigger tengono allineato l'indice.
+#  - remove_diacritics: "perche" trova "perché"
+#  - prefix '2 3': ricerche per prefisso veloci ("fel" -> "felpa")
+# I trigger di UPDATE scattano solo sulle colonne indicizzate, quindi
+# cambi di quantita/stato non toccano l'indice.
+# =========================================================
+SEARCH_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS artwork_fts USING fts5(
+    title, description, code, type, notes,
+    content='artwork', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS artwork_fts_ai AFTER INSERT ON artwork BEGIN
+    INSERT INTO artwork_fts(rowid, title, description, code, type, notes)
+    VALUES (new.id, new.title, new.description, new.code, new.type, new.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artwork_fts_ad AFTER DELETE ON artwork BEGIN
+    INSERT INTO artwork_fts(artwork_fts, rowid, title, description, code, type, notes)
+    VALUES ('delete', old.id, old.title, old.description, old.code, old.type, old.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artwork_fts_au
+AFTER UPDATE OF title, description, code, type, notes ON artwork BEGIN
+    INSERT INTO artwork_fts(artwork_fts, rowid, title, description, code, type, notes)
+    VALUES ('delete', old.id, old.title, old.description, old.code, old.type, old.notes);
+    INSERT INTO artwork_fts(rowid, title, description, code, type, notes)
+    VALUES (new.id, new.title, new.description, new.code, new.type, new.notes);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS artist_fts USING fts5(
+    name, bio,
+    content='artist', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS artist_fts_ai AFTER INSERT ON artist BEGIN
+    INSERT INTO artist_fts(rowid, name, bio) VALUES (new.id, new.name, new.bio);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artist_fts_ad AFTER DELETE ON artist BEGIN
+    INSERT INTO artist_fts(artist_fts, rowid, name, bio)
+    VALUES ('delete', old.id, old.name, old.bio);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artist_fts_au AFTER UPDATE OF name, bio ON artist BEGIN
+    INSERT INTO artist_fts(artist_fts, rowid, name, bio)
+    VALUES ('delete', old.id, old.name, old.bio);
+    INSERT INTO artist_fts(rowid, name, bio) VALUES (new.id, new.name, new.bio);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS sale_fts USING fts5(
+    buyer_name,
+    content='sale', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS sale_fts_ai AFTER INSERT ON sale BEGIN
+    INSERT INTO sale_fts(rowid, buyer_name) VALUES (new.id, new.buyer_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sale_fts_ad AFTER DELETE ON sale BEGIN
+    INSERT INTO sale_fts(sale_fts, rowid, buyer_name)
+    VALUES ('delete', old.id, old.buyer_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sale_fts_au AFTER UPDATE OF buyer_name ON sale BEGIN
+    INSERT INTO sale_fts(sale_fts, rowid, buyer_name)
+    VALUES ('delete', old.id, old.buyer_name);
+    INSERT INTO sale_fts(rowid, buyer_name) VALUES (new.id, new.buyer_name);
+END;
+"""
+
+# Ricostruisce gli indici dal contenuto attuale (DB esistenti)
+SEARCH_REBUILD_SQL = """
+INSERT INTO artwork_fts(artwork_fts) VALUES ('rebuild');
+INSERT INTO artist_fts(artist_fts) VALUES ('rebuild');
+INSERT INTO sale_fts(sale_fts) VALUES ('rebuild');
+"""
+
+
+# =========================================================
+# IMAGE STORE
+# =========================================================
+# Archivio immagini per contenuto (SHA-256):
+#  - image_blob: un file per contenuto distinto (images/artworks/.blobs)
+#  - image_ref : nome usato in artwork.image -> blob
+# Foto identiche importate con nomi diversi occupano spazio una volta sola.
+# =========================================================
+IMAGE_STORE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS image_blob (
+    sha256 TEXT PRIMARY KEY,     -- Hash del contenuto
+    size INTEGER NOT NULL,       -- Byte
+    ext TEXT NOT NULL,           -- Estensione del file blob (.jpg, .png, ...)
+    created_at TEXT DEFAULT (datetime('now'))
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS image_ref (
+    name TEXT PRIMARY KEY,       -- Nome file in artwork.image
+    sha256 TEXT NOT NULL,
+
+    FOREIGN KEY (sha256)
+        REFERENCES image_blob(sha256)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_image_ref_sha256
+    ON image_ref(sha256);
+"""
+
+
+# =========================================================
+# TABLE: artwork_image
+# =========================================================
+# Piu immagini per opera (es. foto da piu angolazioni), in ordine.
+# artwork.image resta la copertina usata dalla griglia: i trigger
+# la tengono allineata con la posizione 0.
+# =========================================================
+ARTWORK_IMAGE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS artwork_image (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    artwork_id INTEGER NOT NULL,
+    image TEXT NOT NULL,         -- Nome file immagine (NO path)
+    position INTEGER NOT NULL DEFAULT 0,
+
+    UNIQUE (artwork_id, image),
+
+    FOREIGN KEY (artwork_id)
+        REFERENCES artwork(id)
+        ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_artwork_image_order
+    ON artwork_image(artwork_id, position, image);
+
+CREATE TRIGGER IF NOT EXISTS artwork_image_cover_ai
+AFTER INSERT ON artwork WHEN COALESCE(new.image, '') != '' BEGIN
+    INSERT OR IGNORE INTO artwork_image (artwork_id, image, position)
+    VALUES (new.id, new.image, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artwork_image_cover_au
+AFTER UPDATE OF image ON artwork
+WHEN COALESCE(new.image, '') != COALESCE(old.image, '') BEGIN
+    DELETE FROM artwork_image
+    WHERE artwork_id = new.id AND (position = 0 OR image = new.image);
+    INSERT INTO artwork_image (artwork_id, image, position)
+    SELECT new.id, new.image, 0 WHERE COALESCE(new.image, '') != '';
+END;
+"""
+
+# Copertine gia presenti nei DB esistenti
+ARTWORK_IMAGE_SEED_SQL = """
+INSERT OR IGNORE INTO artwork_image (artwork_id, image, position)
+SELECT id, image, 0 FROM artwork WHERE COALESCE(image, '') != '';
+"""
+
+
+# =========================================================
+# SALE QUANTITY
+# =========================================================
+# Una vendita puo riguardare piu copie della stessa opera:
+#  - quantity  : copie vendute
+#  - unit_price: prezzo per copia
+#  - sale_price: resta il TOTALE incassato (unit_price * quantity),
+#                quindi SUM(sale_price) nei report resta corretto
+# =========================================================
+SALE_QUANTITY_COLUMNS = (
+    ("quantity", "INTEGER NOT NULL DEFAULT 1"),
+    ("unit_price", "REAL"),
+)
+
+# Le vendite esistenti sono tutte di una copia
+SALE_UNIT_PRICE_SEED_SQL = """
+UPDATE sale SET unit_price = sale_price / quantity WHERE unit_price IS NULL;
+"""
+
+
+# =========================================================
+# REPORT INDEXES
+# =========================================================
+# Totali calcolati in SQL (core/repositories/report_repo.py):
+#  - idx_sale_artwork        : vendite di un'opera (report per mostra)
+#  - idx_artist_payment_paid : importi da pagare raggruppati per artista
+#  - idx_artist_payment_sale : pagamento di una vendita (report per artista)
+# Le vendite di un periodo usano gia idx_sale_date.
+# =========================================================
+REPORT_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_sale_artwork
+    ON sale(artwork_id);
+
+CREATE INDEX IF NOT EXISTS idx_artist_payment_paid
+    ON artist_payment(artist_id, paid);
+
+CREATE INDEX IF NOT EXISTS idx_artist_payment_sale
+    ON artist_payment(sale_id);
+"""
+
+
+# =========================================================
+# SUMMARY TABLES
+# =========================================================
+# Contatori per la dashboard e per "Artworks: N", tenuti aggiornati dai
+# trigger a ogni INSERT/UPDATE/DELETE (anche da Datasette), quindi
+# leggerli costa una riga, non una scansione:
+#  - artwork_status_summary : opere, copie e valore per stato
+#  - artist_stock_summary   : opere per artista e valore del magazzino
+#                             (opere non vendute; artist_id 0 = nessuno)
+#  - sale_month_summary     : vendite, copie e incasso per mese
+#  - artist_payout_summary  : pagamenti pagati/da pagare per artista
+# Una riga che torna a zero viene cancellata, quindi le tabelle sono
+# identiche a quelle ricostruite da zero (core/summaries.py le confronta).
+# =========================================================
+def _stock_value(row):
+    return f"COALESCE({row}.price, 0) * COALESCE({row}.quantity, 0)"
+
+
+def _unsold(row):
+    return f"COALESCE({row}.status, '') != 'sold'"
+
+
+def _unpaid(row):
+    return f"COALESCE({row}.paid, 0) = 0"
+
+
+# (tabella, colonne, query di ricostruzione, delta per riga di origine)
+# Il delta e' (chiave, valori...) della riga "new"/"old" di un trigger.
+SUMMARY_TABLES = (
+    (
+        "artwork_status_summary",
+        ("status TEXT", "artworks INTEGER", "copies INTEGER", "value REAL"),
+        """
+        SELECT COALESCE(status, ''), COUNT(*), SUM(COALESCE(quantity, 0)),
+               SUM(COALESCE(price, 0) * COALESCE(quantity, 0))
+        FROM artwork GROUP BY 1
+        """,
+        lambda r: (f"COALESCE({r}.status, '')", "1", f"COALESCE({r}.quantity, 0)",
+                   _stock_value(r)),
+    ),
+    (
+        "artist_stock_summary",
+        ("artist_id INTEGER", "artworks INTEGER", "stock_artworks INTEGER",
+         "stock_copies INTEGER", "stock_value REAL"),
+        """
+        SELECT COALESCE(artist_id, 0), COUNT(*),
+               SUM(CASE WHEN COALESCE(status, '') != 'sold' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN COALESCE(status, '') != 'sold' THEN COALESCE(quantity, 0) ELSE 0 END),
+               SUM(CASE WHEN COALESCE(status, '') != 'sold'
+                        THEN COALESCE(price, 0) * COALESCE(quantity, 0) ELSE 0 END)
+        FROM artwork GROUP BY 1
+        """,
+        lambda r: (f"COALESCE({r}.artist_id, 0)", "1",
+                   f"CASE WHEN {_unsold(r)} THEN 1 ELSE 0 END",
+                   f"CASE WHEN {_unsold(r)} THEN COALESCE({r}.quantity, 0) ELSE 0 END",
+                   f"CASE WHEN {_unsold(r)} THEN {_stock_value(r)} ELSE 0 END"),
+    ),
+    (
+        "sale_month_summary",
+        ("month TEXT", "sales INTEGER", "copies INTEGER", "revenue REAL"),
+        """
+        SELECT substr(sale_date, 1, 7), COUNT(*), SUM(quantity), SUM(sale_price)
+        FROM sale GROUP BY 1
+        """,
+        lambda r: (f"substr({r}.sale_date, 1, 7)", "1", f"{r}.quantity", f"{r}.sale_price"),
+    ),
+    (
+        "artist_payout_summary",
+        ("artist_id INTEGER", "payments INTEGER", "unpaid_payments INTEGER",
+         "unpaid_amount REAL", "paid_amount REAL"),
+        """
+        SELECT artist_id, COUNT(*),
+               SUM(CASE WHEN COALESCE(paid, 0) = 0 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN COALESCE(paid, 0) = 0 THEN amount ELSE 0 END),
+               SUM(CASE WHEN COALESCE(paid, 0) = 0 THEN 0 ELSE amount END)
+        FROM artist_payment GROUP BY 1
+        """,
+        lambda r: (f"{r}.artist_id", "1",
+                   f"CASE WHEN {_unpaid(r)} THEN 1 ELSE 0 END",
+                   f"CASE WHEN {_unpaid(r)} THEN {r}.amount ELSE 0 END",
+                   f"CASE WHEN {_unpaid(r)} THEN 0 ELSE {r}.amount END"),
+    ),
+)
+
+# Tabella di origine e colonne che cambiano i contatori
+SUMMARY_SOURCES = {
+    "artwork_status_summary": ("artwork", "status, quantity, price"),
+    "artist_stock_summary": ("artwork", "artist_id, status, quantity, price"),
+    "sale_month_summary": ("sale", "sale_date, quantity, sale_price"),
+    "artist_payout_summary": ("artist_payment", "artist_id, paid, amount"),
+}
+
+
+def _summary_apply(table, columns, delta, row, sign):
+    """Add (sign '') or subtract (sign '-') one source row"""
+    names = [c.split()[0] for c in columns]
+    key, values = delta(row)[0], delta(row)[1:]
+    updates = ", ".join(f"{n} = {n} + excluded.{n}" for n in names[1:])
+    statement = (
+        f"    INSERT INTO {table} ({', '.join(names)})\n"
+        f"    VALUES ({key}, {', '.join(f'{sign}({v})' for v in values)})\n"
+        f"    ON CONFLICT({names[0]}) DO UPDATE SET {updates};\n"
+    )
+    if sign:
+        statement += f"    DELETE FROM {table} WHERE {names[0]} = {key} AND {names[1]} = 0;\n"
+    return statement
+
+
+def _summary_schema():
+    sql = ""
+    for table, columns, _, delta in SUMMARY_TABLES:
+        source, watched = SUMMARY_SOURCES[table]
+        body = ",\n    ".join(columns[:1] + tuple(f"{c} NOT NULL DEFAULT 0" for c in columns[1:]))
+        sql += (
+            f"\nCREATE TABLE IF NOT EXISTS {table} (\n"
+            f"    {body},\n"
+            f"    PRIMARY KEY ({columns[0].split()[0]})\n"
+            f") WITHOUT ROWID;\n"
+            f"\nCREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source} BEGIN\n"
+            f"{_summary_apply(table, columns, delta, 'new', '')}END;\n"
+            f"\nCREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source} BEGIN\n"
+            f"{_summary_apply(table, columns, delta, 'old', '-')}END;\n"
+            f"\nCREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {watched} ON {source} BEGIN\n"
+            f"{_summary_apply(table, columns, delta, 'old', '-')}"
+            f"{_summary_apply(table, columns, delta, 'new', '')}END;\n"
+        )
+    return sql
+
+
+SUMMARY_SCHEMA_SQL = _summary_schema()
+
+# Ricalcola tutti i contatori dalle tabelle di origine
+SUMMARY_REBUILD_SQL = "".join(
+    f"\nDELETE FROM {table};\nINSERT INTO {table} {query.strip()};\n"
+    for table, _, query, _ in SUMMARY_TABLES
+)
+
@@ -0,0 +1,26 @@
+"""
+Full-text search helpers (FTS5)
+"""
+
+import re
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str):
+    """
+    Turn free text typed by the user into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all of them must match,
+    e.g. "L'icona fel" -> '"icona"* "fel"*'. Single letters left over from
+    Italian elisions (L', dell') are dropped when longer words are present.
+    Returns None when the text has nothing searchable.
+    """
+    words = _WORD_RE.findall(text or "")
+    longer = [w for w in words if len(w) > 1]
+    if longer:
+        words = longer
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
@@ -0,0 +1,86 @@
+"""
+Shopping cart for point-of-sale checkout
+
+The cart only holds what the cashier scanned; nothing is written until
+SalesService.checkout() commits every line at once.
+"""
+
+from dataclasses import dataclass
+
+from core.services.errors import ServiceError
+
+
+@dataclass
+class CartLine:
+    artwork_id: int
+    code: str
+    title: str
+    unit_price: float
+    quantity: int
+    available: int    # Copies in stock when the item was scanned
+
+    @property
+    def subtotal(self) -> float:
+        return self.unit_price * self.quantity
+
+
+class Cart:
+    """
+    Scanned items, one line per artwork, in scan order
+    """
+
+    def __init__(self):
+        self._lines = {}
+
+    def add(self, artwork, quantity: int = 1) -> CartLine:
+        """Add copies of an artwork row; scanning it again bumps its quantity"""
+        if artwork["status"] == "sold" or (artwork["quantity"] or 0) < 1:
+            raise ServiceError(f"{artwork['title']}: nessuna copia disponibile.")
+        line = self._lines.get(artwork["id"])
+        if line is None:
+            line = CartLine(
+                artwork_id=artwork["id"],
+                code=artwork["code"] or "",
+                title=artwork["title"],
+                unit_price=artwork["price"] or 0,
+                quantity=0,
+                available=artwork["quantity"],
+            )
+        if line.quantity + quantity > line.available:
+            raise ServiceError(f"{line.title}: disponibili solo {line.available} copie.")
+        line.quantity += quantity
+        self._lines[line.artwork_id] = line
+        return line
+
+    def set_quantity(self, artwork_id: int, quantity: int):
+        line = self._lines[artwork_id]
+        if quantity < 1:
+            self.remove(artwork_id)
+            return
+        if quantity > line.available:
+            raise ServiceError(f"{line.title}: disponibili solo {line.available} copie.")
+        line.quantity = quantity
+
+    def remove(self, artwork_id: int):
+        self._lines.pop(artwork_id, None)
+
+    def clear(self):
+        self._lines.clear()
+
+    @property
+    def lines(self):
+        return list(self._lines.values())
+
+    @property
+    def total(self) -> float:
+        return sum(line.subtotal for line in self._lines.values())
+
+    @property
+    def item_count(self) -> int:
+        return sum(line.quantity for line in self._lines.values())
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __bool__(self):
+        return bool(self._lines)
@@ -0,0 +1,10 @@
+"""
+Errors raised by the service layer
+"""
+
+
+class ServiceError(Exception):
+    """
+    A business rule refused the operation (nothing was written).
+    The message is meant to be shown to the user as is.
+    """
@@ -0,0 +1,39 @@
+"""
+Inventory service - stock operations that span several rows
+"""
+
+import uuid
+
+from core.repositories.artwork_repo import ArtworkRepository
+from core.services.errors import ServiceError
+
+
+def generate_code() -> str:
+    """Generate a short unique code for artworks."""
+    return f"ART-{uuid.uuid4().hex[:8].upper()}"
+
+
+class InventoryService:
+    """
+    Splits multi-copy artworks into separately tracked items
+    """
+
+    def __init__(self, artwork_repo: ArtworkRepository):
+        self.artwork_repo = artwork_repo
+        self.db = artwork_repo.db
+
+    def split_sold_copy(self, artwork_id: int, code: str = None) -> int:
+        """
+        Move one copy of a multi-copy artwork into its own sold artwork.
+        Returns the ID of the sold copy.
+        """
+        with self.db.transaction():
+            artwork = self.artwork_repo.get_by_id(artwork_id)
+            if artwork is None:
+                raise ServiceError("Opera non trovata.")
+            if (artwork["quantity"] or 0) < 2:
+                raise ServiceError("Serve più di una copia per separarne una.")
+            copy_id = self.artwork_repo.copy_as_sold(artwork_id, code or generate_code())
+            if not self.artwork_repo.decrement_stock(artwork_id, 1):
+                raise ServiceError("Nessuna copia disponibile.")
+        return copy_id
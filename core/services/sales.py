@@ -0,0 +1,123 @@
+"""
+Sales service - the sale workflow, independent of the GUI
+
+One call records the sale, the artist's payment and the stock decrement
+in a single transaction: either all of it is written or none of it.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+from core.repositories.artwork_repo import ArtworkRepository
+from core.repositories.sale_repo import SaleRepository
+from core.services.errors import ServiceError
+
+
+# Outcome of a sale: the sale row, the artist payment row (None without
+# an artist) and the copies left in stock
+SaleResult = namedtuple("SaleResult", ["sale_id", "payment_id", "remaining"])
+
+
+def artist_share(amount: float, artist_cut_percent) -> float:
+    """Amount due to the artist for a sale"""
+    return amount * ((artist_cut_percent or 0) / 100)
+
+
+class SalesService:
+    """
+    Sells artworks: sale record, artist payment and stock in one transaction
+    """
+
+    def __init__(self, artwork_repo: ArtworkRepository, sale_repo: SaleRepository):
+        self.artwork_repo = artwork_repo
+        self.sale_repo = sale_repo
+        self.db = artwork_repo.db
+
+    def check_sellable(self, artwork, quantity: int = 1):
+        """Raise ServiceError if quantity copies of the artwork cannot be sold"""
+        if artwork is None:
+            raise ServiceError("Opera non trovata.")
+        if quantity < 1:
+            raise ServiceError("La quantità deve essere almeno 1.")
+        if artwork["status"] == "sold":
+            raise ServiceError("Questa opera è già stata venduta.")
+        available = artwork["quantity"] or 0
+        if available < 1:
+            raise ServiceError("Nessuna copia disponibile.")
+        if available < quantity:
+            raise ServiceError(f"Disponibili solo {available} copie.")
+
+    def sell(self, artwork_id: int, unit_price: float, quantity: int = 1,
+             sale_date: str = None, buyer_name: str = "", payment_method: str = "",
+             notes: str = "") -> SaleResult:
+        """
+        Sell quantity copies of an artwork at unit_price each, as one sale row.
+        Raises ServiceError (nothing written) if the sale is not possible.
+        """
+        sale_date = sale_date or date.today().isoformat()
+        total = unit_price * quantity
+        with self.db.transaction():
+            artwork = self.artwork_repo.get_by_id(artwork_id)
+            self.check_sellable(artwork, quantity)
+
+            sale_id = self.sale_repo.create(
+                artwork_id=artwork_id,
+                sale_date=sale_date,
+                sale_price=total,
+                buyer_name=buyer_name,
+                payment_method=payment_method,
+                notes=notes,
+                quantity=quantity,
+                unit_price=unit_price,
+            )
+            payment_id = None
+            if artwork["artist_id"]:
+                payment_id = self.sale_repo.add_artist_payment(
+                    sale_id=sale_id,
+                    artist_id=artwork["artist_id"],
+                    percentage=artwork["artist_cut_percent"] or 0,
+                    amount=artist_share(total, artwork["artist_cut_percent"]),
+                )
+
+            if not self.artwork_repo.decrement_stock(artwork_id, quantity):
+                # Stock changed under us (another connection sold it first)
+                raise ServiceError("Nessuna copia disponibile.")
+
+        return SaleResult(sale_id, payment_id, artwork["quantity"] - quantity)
+
+    def lookup(self, code: str):
+        """Find an artwork by (scanned) code; returns None if unknown"""
+        code = (code or "").strip()
+        if not code:
+            return None
+        artwork = self.artwork_repo.get_by_code(code)
+        if artwork is None and code != code.upper():
+            # Hand-typed codes: generated ones are upper case
+            artwork = self.artwork_repo.get_by_code(code.upper())
+        return artwork
+
+    def checkout(self, cart, sale_date: str = None, buyer_name: str = "",
+                 payment_method: str = "", notes: str = ""):
+        """
+        Sell every line of a cart in one transaction (a single commit).
+        Returns one SaleResult per line; on ServiceError nothing is written.
+        """
+        if not cart:
+            raise ServiceError("Il carrello è vuoto.")
+        sale_date = sale_date or date.today().isoformat()
+        results = []
+        with self.db.transaction():
+            for line in cart.lines:
+                try:
+                    results.append(self.sell(
+                        line.artwork_id,
+                        unit_price=line.unit_price,
+                        quantity=line.quantity,
+                        sale_date=sale_date,
+                        buyer_name=buyer_name,
+                        payment_method=payment_method,
+                        notes=notes,
+                    ))
+                except ServiceError as e:
+                    raise ServiceError(f"{line.title}: {e}") from e
+        return results
@@ -0,0 +1,74 @@
+"""
+Consistency checks for the trigger-maintained summary tables
+
+The triggers in core.schema keep the summary tables in step with every
+write. check() recomputes them from the source tables and lists every
+counter that differs; repair() rebuilds them when it finds any, e.g. after
+a database was restored from an old backup or edited with the triggers
+dropped.
+"""
+
+from collections import namedtuple
+
+from core.database import Database
+from core.migrations import split_statements
+from core.schema import SUMMARY_TABLES, SUMMARY_SCHEMA_SQL, SUMMARY_REBUILD_SQL
+
+
+# One counter that does not match its source rows. stored is None when the
+# summary row is missing, expected is None when it should not exist.
+SummaryMismatch = namedtuple(
+    "SummaryMismatch", ["table", "key", "column", "stored", "expected"]
+)
+
+# Money totals are REAL and summed incrementally: allow rounding noise
+TOLERANCE = 0.005
+
+
+def _same(stored, expected) -> bool:
+    if isinstance(stored, float) or isinstance(expected, float):
+        return abs((stored or 0) - (expected or 0)) < TOLERANCE
+    return stored == expected
+
+
+def check(db: Database):
+    """
+    Compare every summary table with a fresh aggregation of its source.
+    Returns the list of SummaryMismatch (empty when all counters are right).
+    Reads from one snapshot (without blocking the app's writes), so
+    concurrent writes cannot show up as false mismatches.
+    """
+    mismatches = []
+    with db.snapshot():
+        for table, columns, query, _ in SUMMARY_TABLES:
+            names = [c.split()[0] for c in columns]
+            stored = {row[0]: tuple(row[1:]) for row in db.fetch_all(
+                f"SELECT {', '.join(names)} FROM {table}", row_factory=None)}
+            expected = {row[0]: tuple(row[1:]) for row in db.fetch_all(query, row_factory=None)}
+            for key in sorted(stored.keys() | expected.keys(), key=str):
+                have, want = stored.get(key), expected.get(key)
+                if have is None or want is None:
+                    mismatches.append(SummaryMismatch(table, key, None, have, want))
+                    continue
+                for name, a, b in zip(names[1:], have, want):
+                    if not _same(a, b):
+                        mismatches.append(SummaryMismatch(table, key, name, a, b))
+    return mismatches
+
+
+def rebuild(db: Database):
+    """
+    Recompute every summary table from scratch, atomically. Tables or
+    triggers that were dropped are created again first.
+    """
+    with db.transaction():
+        for statement in split_statements(SUMMARY_SCHEMA_SQL + SUMMARY_REBUILD_SQL):
+            db.execute(statement)
+
+
+def repair(db: Database):
+    """Rebuild the summary tables if check() finds anything; returns its findings"""
+    mismatches = check(db)
+    if mismatches:
+        rebuild(db)
+    return mismatches
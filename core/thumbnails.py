@@ -0,0 +1,153 @@
+"""
+Thumbnail cache for artwork images
+
+Card-sized, EXIF-corrected JPEG thumbnails are generated once and kept under
+THUMB_DIR. Each entry is keyed by the source path plus its mtime and size, so
+replacing a photo on disk invalidates the old thumbnail automatically.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+from core.paths import THUMB_DIR
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+
+# Size of the image area of an artwork card
+THUMB_SIZE = (260, 200)
+
+
+def save_atomic(img, dest: Path, **save_args):
+    """Save a PIL image via a temp file so readers never see a partial file"""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=dest.suffix, dir=dest.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            img.save(fh, **save_args)
+        os.replace(tmp, dest)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class LRUCache:
+    """
+    Small bounded mapping that evicts the least recently used entry
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ThumbnailCache:
+    """
+    Persistent on-disk cache of card-sized thumbnails
+    """
+
+    def __init__(self, cache_dir: Path = THUMB_DIR, size=THUMB_SIZE, quality: int = 85):
+        self.cache_dir = Path(cache_dir)
+        self.size = tuple(size)
+        self.quality = quality
+
+    @property
+    def available(self) -> bool:
+        """Thumbnails can only be generated when Pillow is installed."""
+        return Image is not None
+
+    def key(self, source) -> str:
+        """Return the cache key for a source file, or None if it does not exist."""
+        path = Path(source)
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return f"{self._path_hash(path)}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+    def get_path(self, source) -> Path:
+        """
+        Return the thumbnail path for a source image, generating it if needed.
+        Returns None if the source is missing, unreadable or Pillow is unavailable.
+        """
+        if not self.available:
+            return None
+        key = self.key(source)
+        if key is None:
+            return None
+        thumb = self.cache_dir / f"{key}.jpg"
+        if thumb.exists():
+            return thumb
+        try:
+            self._generate(Path(source), thumb)
+        except Exception as e:
+            print(f"Error generating thumbnail for {source}: {e}")
+            return None
+        self._remove_stale(Path(source), keep=thumb)
+        return thumb
+
+    def invalidate(self, source):
+        """Drop every cached thumbnail of a source image."""
+        self._remove_stale(Path(source), keep=None)
+
+    def prune(self, sources):
+        """Remove thumbnails that do not belong to any of the given sources."""
+        valid = {k for k in (self.key(s) for s in sources) if k}
+        removed = 0
+        for thumb in self.cache_dir.glob("*.jpg"):
+            if thumb.stem not in valid:
+                thumb.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _generate(self, source: Path, thumb: Path):
+        with Image.open(source) as img:
+            # Let the JPEG decoder skip detail we are going to throw away
+            img.draft("RGB", (self.size[0] * 2, self.size[1] * 2))
+            img = ImageOps.exif_transpose(img)
+            self._write(img, thumb)
+
+    def _write(self, img, thumb: Path):
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail(self.size, Image.LANCZOS)
+        save_atomic(img, thumb, format="JPEG", quality=self.quality)
+
+    def _remove_stale(self, source: Path, keep):
+        for thumb in self.cache_dir.glob(f"{self._path_hash(source)}-*.jpg"):
+            if thumb != keep:
+                thumb.unlink(missing_ok=True)
+
+    def _path_hash(self, path: Path) -> str:
+        return hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
@@ -7,8 +7,9 @@ import sys
 from pathlib import Path
 from PyQt5.QtWidgets import QMainWindow, QMessageBox, QApplication
 
+from core import instrumentation, summaries
 from core.database import Database
-from core.schema import SCHEMA_SQL
+from core.migrations import migrate, MigrationError
 from ui.main_window import MainWindow
 
 
@@ -31,21 +32,38 @@ DB_PATH = DATA_DIR / "catalog.db"
 # DB INIT
 # =========================================================
 def init_database():
-    if DB_PATH.exists():
-        return
-
+    # Creates the schema on first run and upgrades older databases
     db = Database(DB_PATH)
-    db.executescript(SCHEMA_SQL)
-    db.close()
+    try:
+        if migrate(db):
+            # Migrations rewrite tables: make sure the dashboard counters followed
+            mismatches = summaries.repair(db)
+            if mismatches:
+                print(f"Summary tables rebuilt ({len(mismatches)} counters were off)")
+    finally:
+        db.close()
 
 
 # =========================================================
 # MAIN
 # =========================================================
 def main():
-    init_database()
+    # Query statistics and slow-query log (Ctrl+Shift+D opens the panel)
+    if "--diagnostics" in sys.argv or instrumentation.enabled_by_environment():
+        instrumentation.enable()
 
     app = QApplication(sys.argv)
+
+    try:
+        init_database()
+    except MigrationError as e:
+        QMessageBox.critical(
+            None,
+            "Database",
+            f"Impossibile aggiornare il database:\n{DB_PATH}\n\n{e}"
+        )
+        sys.exit(1)
+
     window = MainWindow()
     window.show()
 
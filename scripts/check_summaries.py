@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Check the dashboard summary tables against the catalog.
+
+The counters are kept up to date by triggers; this recomputes them from
+scratch and lists any that differ (e.g. after restoring an old backup).
+With --fix the tables are rebuilt when something is off.
+
+Usage:
+    python scripts/check_summaries.py
+    python scripts/check_summaries.py --fix
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core import summaries
+from core.database import Database
+from core.migrations import migrate
+from core.paths import DB_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the summary tables")
+    parser.add_argument("--fix", action="store_true", help="rebuild the tables if they are off")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print(f"Database not found: {DB_PATH}")
+        return 1
+
+    db = Database(DB_PATH)
+    try:
+        migrate(db)
+        mismatches = summaries.repair(db) if args.fix else summaries.check(db)
+    finally:
+        db.close()
+
+    for m in mismatches:
+        column = f".{m.column}" if m.column else ""
+        print(f"{m.table}[{m.key!r}]{column}: stored {m.stored!r}, expected {m.expected!r}")
+    if not mismatches:
+        print("Summary tables are consistent")
+        return 0
+    if args.fix:
+        print(f"Rebuilt ({len(mismatches)} differences)")
+        return 0
+    print(f"{len(mismatches)} differences (run with --fix to rebuild)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Move existing artwork images into the content-addressed image store.
+
+Every file in images/artworks is hashed once; byte-identical files are
+replaced by clones (or hardlinks) of a single blob and registered in image_ref.
+Names stay the same, so artwork.image does not change.
+
+Usage:
+    python scripts/dedupe_images.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.database import Database
+from core.image_store import ImageStore
+from core.migrations import migrate
+from core.paths import DB_PATH, IMG_DIR
+
+
+def dedupe_images():
+    if not DB_PATH.exists():
+        print(f"Database not found: {DB_PATH}")
+        return
+
+    db = Database(DB_PATH)
+    try:
+        migrate(db)
+        files, blobs, saved = ImageStore(db).dedupe()
+    finally:
+        db.close()
+
+    print(f"Files:  {files}")
+    print(f"Blobs:  {blobs}")
+    print(f"Saved:  {saved / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    print("Deduplicating artwork images...")
+    print(f"Database: {DB_PATH}")
+    print(f"Images directory: {IMG_DIR}")
+    print("=" * 50)
+    dedupe_images()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Print QR or Code128 labels for artwork codes.
+
+Labels are laid out on A4 sheets (3 x 8 by default) and written as one
+multi-page PDF, or as one PNG per sheet when the output is a directory.
+Code128 needs the optional python-barcode package.
+
+Usage:
+    python scripts/print_labels.py labels.pdf
+    python scripts/print_labels.py labels.pdf --artist-id 3 --status available
+    python scripts/print_labels.py sheets/ --kind code128 --search "merch"
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.database import Database, READ_ONLY_PROFILE
+from core.labels import LabelPrinter, LabelError, SheetLayout, QR, CODE128
+from core.paths import DB_PATH
+from core.repositories.artwork_repo import ArtworkRepository
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate artwork code labels")
+    parser.add_argument("output", type=Path, help="PDF file, or a directory for PNG sheets")
+    parser.add_argument("--kind", choices=[QR, CODE128], default=QR)
+    parser.add_argument("--artist-id", type=int)
+    parser.add_argument("--status", help="only artworks with this status")
+    parser.add_argument("--search", help="full-text filter, as in the search box")
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=8)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--workers", type=int, help="rendering processes (default: all cores)")
+    return parser.parse_args()
+
+
+def print_labels(args):
+    if not DB_PATH.exists():
+        print(f"Database not found: {DB_PATH}")
+        return
+
+    layout = SheetLayout(columns=args.columns, rows=args.rows, dpi=args.dpi)
+    try:
+        printer = LabelPrinter(layout, kind=args.kind, max_workers=args.workers)
+    except LabelError as e:
+        print(f"❌ {e}")
+        return
+
+    db = Database(DB_PATH, READ_ONLY_PROFILE)
+    try:
+        labels = ArtworkRepository(db).iter_labels(
+            artist_id=args.artist_id, status=args.status, query=args.search
+        )
+        progress = lambda n: print(f"\r   {n} pages", end="", flush=True)
+        start = time.perf_counter()
+        if args.output.suffix.lower() == ".pdf":
+            pages = printer.write_pdf(labels, args.output, progress=progress)
+        else:
+            pages = len(printer.write_png(labels, args.output, progress=progress))
+        elapsed = time.perf_counter() - start
+    except LabelError as e:
+        # Nothing matched the filters: no output file is created
+        print(f"❌ {e}")
+        return
+    finally:
+        db.close()
+
+    print(f"\n✅ {pages} pages ({layout.per_page} labels each) in {elapsed:.1f}s → {args.output}")
+
+
+if __name__ == "__main__":
+    print_labels(parse_args())
@@ -89,6 +89,11 @@ def rename_images():
                 "UPDATE artwork SET image = ? WHERE id = ?",
                 (new_filename, artwork_id)
             )
+            # Keep the image store reference pointing at the same blob
+            cursor.execute(
+                "UPDATE OR REPLACE image_ref SET name = ? WHERE name = ?",
+                (new_filename, old_image)
+            )
             conn.commit()
             
             print(f"[OK] Renamed: {old_image} -> {new_filename}")
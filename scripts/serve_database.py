@@ -93,6 +93,8 @@ def main():
             "--port", str(port),
             "--setting", "sql_time_limit_ms", "5000",
             "--setting", "default_page_size", "50",
+            # Page artworks by title so Datasette walks idx_artwork_title_id
+            "--metadata", str(Path(__file__).parent / "datasette_metadata.json"),
         ])
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped.")
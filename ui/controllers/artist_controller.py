@@ -16,6 +16,15 @@ class ArtistController:
         artists = [dict(r) for r in rows]
         self.artist_list.load_artists(artists)
 
+    @staticmethod
+    def run_search(artist_repo, text: str):
+        """Search worker (runs off the GUI thread with its own repository)."""
+        rows = artist_repo.search(text) if text.strip() else artist_repo.get_all()
+        return [dict(r) for r in rows]
+
+    def on_search_results(self, text: str, artists):
+        self.artist_list.load_artists(artists)
+
     def on_artist_selected(self, artist_id: int):
         self.refresh_artworks(artist_id)
 
@@ -1,45 +1,168 @@
 from pathlib import Path
-import shutil
-import uuid
 from PyQt5.QtWidgets import QMessageBox
 
+from core.image_store import ImageStore
 from core.paths import IMG_DIR
+from core.repositories.sale_repo import SaleRepository
+from core.repositories.summary_repo import SummaryRepository
+from core.services.errors import ServiceError
+from core.services.inventory import InventoryService, generate_code
+from core.services.sales import SalesService
+from ui.workers.ingest import IngestQueue
 from ui.dialogs.add_artwork import AddArtworkDialog
 from ui.dialogs.sell_artwork import SellArtworkDialog
+from ui.dialogs.checkout import CheckoutDialog
 
 
 class ArtworkController:
     """Handles artwork CRUD and drag/drop."""
 
-    def __init__(self, artwork_repo, artist_repo, artwork_table, detail_widget=None, count_label=None, sale_repo=None):
+    def __init__(self, artwork_repo, artist_repo, artwork_table, detail_widget=None, count_label=None, sale_repo=None,
+                 carousel=None, dashboard=None):
         self.artwork_repo = artwork_repo
         self.artist_repo = artist_repo
-        self.sale_repo = sale_repo
+        self.sale_repo = sale_repo or SaleRepository(artwork_repo.db)
+        self.sales = SalesService(artwork_repo, self.sale_repo)
+        self.inventory = InventoryService(artwork_repo)
         self.table = artwork_table
         self.detail = detail_widget
         self.count_label = count_label
+        self.carousel = carousel
+        self.dashboard = dashboard
+        self.summary_repo = SummaryRepository(artwork_repo.db)
+        self.image_store = ImageStore(artwork_repo.db)
+        self.ingest = IngestQueue()
+        self.ingest.rendered.connect(self._on_rendered)
+        self.table.rendition_lookup = self._thumbnail_rendition
+        self._artist_id = None
+        self._search_text = ""
+        self._images_by_id = {}  # Image lists of the loaded pages
+        self._shown_images = []  # Image names in the carousel
+        if self.carousel:
+            self.carousel.images_dropped.connect(self.add_images_to_selected)
+        if self.dashboard:
+            self.dashboard.summary_repo = self.summary_repo
 
     def load_artworks(self, artist_id=None):
-        rows = self.artwork_repo.get_by_artist(artist_id) if artist_id else self.artwork_repo.get_all()
-        artworks = []
-        for r in rows:
-            data = dict(r)
-            data["artist_name"] = r["artist_name"] if "artist_name" in r.keys() else ""
-            artworks.append(data)
+        self._artist_id = artist_id
+        self._search_text = ""
+        self._images_by_id.clear()
+        # Anything written before a full reload is already part of it
+        self.artwork_repo.take_changes()
+        self.table.load_pages(
+            self._pager(artist_id, exclude_status="sold"),
+            self._pager(artist_id, status="sold"),
+        )
+        self._clear_detail()
+        self._update_count()
+
+    def _pager(self, artist_id, **filters):
+        """Page fetcher for one grid section (keyset pagination on title, id)."""
+        def fetch(cursor):
+            page = self.artwork_repo.get_page(cursor, artist_id=artist_id, **filters)
+            # One query for the image lists of the whole page
+            self._images_by_id.update(self.artwork_repo.get_images_for([a.id for a in page.rows]))
+            return page.rows, page.next_cursor
+        return fetch
+
+    @staticmethod
+    def run_search(artwork_repo, text: str):
+        """Search worker (runs off the GUI thread with its own repository)."""
+        return artwork_repo.search_cards(text) if text.strip() else []
+
+    def on_search_results(self, text: str, artworks):
+        if not text.strip():
+            # Search cleared: go back to the browsing view
+            if self._search_text:
+                self.load_artworks(self._artist_id)
+            return
+        self._search_text = text
+        self.artwork_repo.take_changes()
         self.table.load_artworks(artworks)
-        if self.detail:
-            self.detail.clear()
+        self._clear_detail()
+        self._update_count()
+
+    def apply_changes(self):
+        """Patch the grid with the artworks written since the last refresh."""
+        changes = self.artwork_repo.take_changes()
+        if not changes:
+            return
+        upserted = changes.upserted
+        for artwork_id in upserted | changes.deleted:
+            self._images_by_id.pop(artwork_id, None)
+        artworks = self.artwork_repo.get_cards_by_ids(upserted) if upserted else []
+        if self._artist_id:
+            artworks = [a for a in artworks if a.artist_id == self._artist_id]
+        if self._search_text and artworks:
+            # Search results only take cards that still match the query
+            matching = self.artwork_repo.search_matching(self._search_text, [a.id for a in artworks])
+            artworks = [a for a in artworks if a.id in matching]
+        # Rows that vanished (or left the current filters) are dropped
+        removed = changes.deleted | (upserted - {a.id for a in artworks})
+        self.table.apply_changes(artworks, removed)
+        self._update_count()
+
+    def _update_count(self):
         if self.count_label:
-            self.count_label.setText(f"Artworks: {len(artworks)}")
+            if self._search_text:
+                total = self.table.count()
+            else:
+                # Trigger-maintained counter: no COUNT(*) over the catalog
+                total = self.summary_repo.artwork_count(self._artist_id)
+            self.count_label.setText(f"Artworks: {total}")
+        if self.dashboard:
+            self.dashboard.refresh(self._artist_id)
 
     def on_artwork_selected(self, artwork_id: int):
         record = self.artwork_repo.get_by_id(artwork_id)
         if not record:
-            if self.detail:
-                self.detail.clear()
+            self._clear_detail()
             return
         if self.detail:
             self.detail.show_artwork(dict(record))
+        if self.carousel:
+            images = self._images_by_id.get(artwork_id)
+            if images is None:
+                images = self.artwork_repo.get_images(artwork_id)
+            self._shown_images = list(images)
+            self.carousel.set_images(self._preview_paths(images))
+
+    def _preview_paths(self, image_names):
+        """Paths to show for images: medium renditions where already rendered"""
+        digests = self.image_store.digests_of(image_names)
+        return [self.ingest.preview_path(IMG_DIR / name, digests.get(name)) for name in image_names]
+
+    def _thumbnail_rendition(self, image_name):
+        """Card-sized ingest rendition of an image for the grid, or None"""
+        return self.ingest.thumbnail_path(self.image_store.digest_of(image_name))
+
+    def _on_rendered(self, image_name, renditions):
+        """Switch the grid and the open preview to the renditions just written"""
+        if not renditions:
+            return
+        self.table.image_rendered(image_name)
+        if self.carousel and image_name in self._shown_images:
+            self.carousel.set_images(self._preview_paths(self._shown_images), keep_position=True)
+
+    def _clear_detail(self):
+        self._shown_images = []
+        if self.detail:
+            self.detail.clear()
+        if self.carousel:
+            self.carousel.clear()
+
+    def add_images_to_selected(self, image_paths):
+        """Import images dropped on the carousel and attach them to the selected artwork."""
+        artwork_id = self.table.get_selected_artwork_id()
+        if not artwork_id:
+            QMessageBox.information(self.table, "Add Images", "Select an artwork first.")
+            return
+        image_names = [name for name in map(self._persist_image, image_paths) if name]
+        if not image_names:
+            return
+        self.artwork_repo.add_images(artwork_id, image_names)
+        self.apply_changes()
+        self.on_artwork_selected(artwork_id)
 
     def add_artwork(self):
         artists = [dict(r) for r in self.artist_repo.get_all()]
@@ -62,7 +185,7 @@ class ArtworkController:
                 status=data.get("status", "available"),
                 notes=data.get("notes", "")
             )
-            self.load_artworks()
+            self.apply_changes()
 
     def edit_artwork(self):
         artwork_id = self.table.get_selected_artwork_id()
@@ -104,43 +227,30 @@ class ArtworkController:
             new_status = new_data.get("status", "available")
             old_quantity = data.get("quantity", 1)
             
-            # If marking as sold and quantity > 1, create a sold copy and decrement original
+            # If marking as sold and quantity > 1, split one sold copy off the original
             if new_status == "sold" and old_status != "sold" and old_quantity > 1:
-                # Use the original image name directly for the sold copy
-                original_image = data.get("image", "")
-                
-                # Create a sold copy with quantity 1
-                self.artwork_repo.create(
-                    artist_id=new_data.get("artist_id"),
-                    code=self._generate_code(),  # Generate new code for sold item
-                    title=new_data.get("title"),
-                    description=new_data.get("description", ""),
-                    type=new_data.get("type", ""),
-                    quantity=1,
-                    year=new_data.get("year"),
-                    price=new_data.get("price"),
-                    artist_cut_percent=new_data.get("artist_cut_percent", data.get("artist_cut_percent", 10.0)),
-                    image=original_image,
-                    status="sold",
-                    notes=new_data.get("notes", "")
-                )
-                
-                # Update original: keep status as available, decrement quantity
-                self.artwork_repo.update(
-                    artwork_id=artwork_id,
-                    artist_id=new_data.get("artist_id"),
-                    code=new_code,
-                    title=new_data.get("title"),
-                    description=new_data.get("description", ""),
-                    type=new_data.get("type", ""),
-                    quantity=old_quantity - 1,
-                    year=new_data.get("year"),
-                    price=new_data.get("price"),
-                    artist_cut_percent=new_data.get("artist_cut_percent", data.get("artist_cut_percent", 10.0)),
-                    image=original_image,
-                    status=old_status,  # Keep original status
-                    notes=new_data.get("notes", "")
-                )
+                try:
+                    with self.artwork_repo.db.transaction():
+                        # Save the edits but keep the original available
+                        self.artwork_repo.update(
+                            artwork_id=artwork_id,
+                            artist_id=new_data.get("artist_id"),
+                            code=new_code,
+                            title=new_data.get("title"),
+                            description=new_data.get("description", ""),
+                            type=new_data.get("type", ""),
+                            quantity=old_quantity,
+                            year=new_data.get("year"),
+                            price=new_data.get("price"),
+                            artist_cut_percent=new_data.get("artist_cut_percent", data.get("artist_cut_percent", 10.0)),
+                            image=image_name or "",
+                            status=old_status,  # Keep original status
+                            notes=new_data.get("notes", "")
+                        )
+                        self.inventory.split_sold_copy(artwork_id)
+                except ServiceError as e:
+                    # Rolled back: neither the edits nor the split were saved
+                    QMessageBox.warning(self.table, "Edit Artwork", str(e))
             else:
                 # Normal update
                 self.artwork_repo.update(
@@ -158,7 +268,7 @@ class ArtworkController:
                     status=new_data.get("status", "available"),
                     notes=new_data.get("notes", "")
                 )
-            self.load_artworks()
+            self.apply_changes()
 
     def delete_artwork(self):
         artwork_id = self.table.get_selected_artwork_id()
@@ -175,9 +285,8 @@ class ArtworkController:
         )
         if confirm == QMessageBox.Yes:
             self.artwork_repo.delete(artwork_id)
-            self.load_artworks()
-            if self.detail:
-                self.detail.clear()
+            self.apply_changes()
+            self._clear_detail()
 
     def sell_artwork(self):
         """Open sell dialog for selected artwork."""
@@ -191,89 +300,55 @@ class ArtworkController:
             QMessageBox.warning(self.table, "Vendi Opera", "Opera non trovata.")
             return
 
-        data = dict(record)
-        
-        # Check if already sold
-        if data.get("status") == "sold":
-            QMessageBox.warning(self.table, "Vendi Opera", "Questa opera è già stata venduta.")
-            return
-        
-        # Check availability
-        if data.get("quantity", 0) < 1:
-            QMessageBox.warning(self.table, "Vendi Opera", "Nessuna copia disponibile.")
+        try:
+            self.sales.check_sellable(record)
+        except ServiceError as e:
+            QMessageBox.warning(self.table, "Vendi Opera", str(e))
             return
 
-        dialog = SellArtworkDialog(data, parent=self.table)
+        dialog = SellArtworkDialog(dict(record), parent=self.table)
         if dialog.exec():
             sale_data = dialog.get_data()
-            
-            # Create sale record
-            if self.sale_repo:
-                sale_id = self.sale_repo.create(
-                    artwork_id=sale_data["artwork_id"],
+            try:
+                self.sales.sell(
+                    artwork_id,
+                    unit_price=sale_data["unit_price"],
+                    quantity=sale_data["quantity"],
                     sale_date=sale_data["sale_date"],
-                    sale_price=sale_data["sale_price"],
                     buyer_name=sale_data["buyer_name"],
                     payment_method=sale_data["payment_method"],
                     notes=sale_data["notes"],
                 )
-                
-                # Add artist payment record if there's an artist
-                if data.get("artist_id") and sale_id:
-                    artist_cut = data.get("artist_cut_percent", 0) or 0
-                    artist_amount = sale_data["sale_price"] * (artist_cut / 100)
-                    self.sale_repo.add_artist_payment(
-                        sale_id=sale_id,
-                        artist_id=data["artist_id"],
-                        percentage=artist_cut,
-                        amount=artist_amount,
-                    )
-            
-            # Update artwork: decrement quantity or mark as sold
-            quantity = data.get("quantity", 1)
-            if quantity > 1:
-                self.artwork_repo.update(
-                    artwork_id=artwork_id,
-                    artist_id=data.get("artist_id"),
-                    code=data.get("code"),
-                    title=data.get("title"),
-                    description=data.get("description", ""),
-                    type=data.get("type", ""),
-                    quantity=quantity - 1,
-                    year=data.get("year"),
-                    price=data.get("price"),
-                    artist_cut_percent=data.get("artist_cut_percent", 10.0),
-                    image=data.get("image", ""),
-                    status=data.get("status", "available"),
-                    notes=data.get("notes", ""),
-                )
-            else:
-                # Last copy - mark as sold
-                self.artwork_repo.update(
-                    artwork_id=artwork_id,
-                    artist_id=data.get("artist_id"),
-                    code=data.get("code"),
-                    title=data.get("title"),
-                    description=data.get("description", ""),
-                    type=data.get("type", ""),
-                    quantity=0,
-                    year=data.get("year"),
-                    price=data.get("price"),
-                    artist_cut_percent=data.get("artist_cut_percent", 10.0),
-                    image=data.get("image", ""),
-                    status="sold",
-                    notes=data.get("notes", ""),
-                )
-            
-            self.load_artworks()
+            except ServiceError as e:
+                QMessageBox.warning(self.table, "Vendi Opera", str(e))
+                return
+            finally:
+                self.apply_changes()
+
             QMessageBox.information(
                 self.table, 
                 "Vendita Completata", 
-                f"Opera venduta a {sale_data['buyer_name'] or 'acquirente'}\n"
-                f"Prezzo: € {sale_data['sale_price']:.2f}"
+                f"{sale_data['quantity']} × opera venduta a {sale_data['buyer_name'] or 'acquirente'}\n"
+                f"Totale: € {sale_data['sale_price']:.2f}"
+            )
+
+    def open_checkout(self):
+        """Point-of-sale mode: scan codes into a cart and sell them in one commit."""
+        dialog = CheckoutDialog(self.sales, parent=self.table)
+        if dialog.exec():
+            self.apply_changes()
+            cart = dialog.cart
+            QMessageBox.information(
+                self.table,
+                "Vendita Completata",
+                f"{cart.item_count} pezzi venduti\n"
+                f"Totale: € {cart.total:.2f}"
             )
 
     # ---------- Drag & drop helpers ----------
+    def accepts_drop(self, urls):
+        return any(u.isLocalFile() and self._is_image_file(u.toLocalFile()) for u in urls)
+
     def handle_drop(self, urls):
         image_paths = [u.toLocalFile() for u in urls if u.isLocalFile() and self._is_image_file(u.toLocalFile())]
         if not image_paths:
@@ -307,29 +382,21 @@ class ArtworkController:
                 status=data.get("status", "available"),
                 notes=data.get("notes", "")
             )
-            self.load_artworks()
+            self.apply_changes()
 
     def _persist_image(self, source_path: str):
-        if not source_path:
-            return ""
-        src = Path(source_path)
-        if not src.exists():
-            return ""
-        dest = IMG_DIR / src.name
-        try:
-            if dest.resolve() != src.resolve():
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dest)
-            return dest.name
-        except Exception:
-            return ""
+        """Import an image into the store and return the name for artwork.image."""
+        image_name = self.image_store.import_file(source_path)
+        if image_name:
+            # Orientation fix and renditions happen on the process pool
+            self.ingest.submit(image_name, IMG_DIR / image_name, self.image_store.digest_of(image_name))
+        return image_name
 
     def _is_image_file(self, path_str: str):
         return Path(path_str).suffix.lower() in {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".ppm"}
 
     def _generate_code(self) -> str:
-        """Generate a short unique code for artworks."""
-        return f"ART-{uuid.uuid4().hex[:8].upper()}"
+        return generate_code()
 
     def _clean_code(self, value):
         if value is None:
@@ -0,0 +1,193 @@
+"""
+Checkout Dialog
+Point-of-sale mode: scan codes into a cart, then sell everything at once
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QFormLayout,
+    QLineEdit,
+    QComboBox,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+    QDialogButtonBox,
+    QMessageBox,
+)
+from PyQt5.QtCore import Qt
+
+from core.services.cart import Cart
+from core.services.errors import ServiceError
+
+
+class CheckoutDialog(QDialog):
+    """
+    Dialog for fast sales at exhibitions.
+
+    The code field keeps the focus: a keyboard-wedge scanner types the code
+    and presses Enter, which adds the item to the cart.
+    """
+
+    COLUMNS = ["Codice", "Titolo", "Qtà", "Prezzo", "Subtotale"]
+
+    def __init__(self, sales_service, parent=None):
+        super().__init__(parent)
+        self.sales = sales_service
+        self.cart = Cart()
+        self.results = []
+        self.setWindowTitle("Cassa")
+        self.setMinimumSize(700, 500)
+        self._build_ui()
+
+    def _build_ui(self):
+        layout = QVBoxLayout()
+
+        # Scanner / code input
+        self.code_input = QLineEdit()
+        self.code_input.setPlaceholderText("Scansiona o digita il codice e premi Invio")
+        self.code_input.setStyleSheet("font-size: 18px; padding: 6px;")
+        self.code_input.returnPressed.connect(self._on_scan)
+
+        self.scan_status = QLabel("")
+
+        # Cart
+        self.cart_table = QTableWidget(0, len(self.COLUMNS))
+        self.cart_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.cart_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.cart_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.cart_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.cart_table.verticalHeader().setVisible(False)
+
+        cart_btns = QHBoxLayout()
+        self.minus_btn = QPushButton("−1")
+        self.remove_btn = QPushButton("Rimuovi")
+        self.clear_btn = QPushButton("Svuota")
+        self.minus_btn.clicked.connect(self._decrement_selected)
+        self.remove_btn.clicked.connect(self._remove_selected)
+        self.clear_btn.clicked.connect(self._clear_cart)
+        for btn in (self.minus_btn, self.remove_btn, self.clear_btn):
+            btn.setAutoDefault(False)
+            cart_btns.addWidget(btn)
+        cart_btns.addStretch()
+
+        self.total_label = QLabel()
+        self.total_label.setStyleSheet("font-size: 20px; font-weight: bold;")
+        cart_btns.addWidget(self.total_label)
+
+        # Sale details shared by every item
+        form = QFormLayout()
+        self.buyer_input = QLineEdit()
+        self.buyer_input.setPlaceholderText("Nome acquirente")
+        self.payment_combo = QComboBox()
+        self.payment_combo.addItems(["Contanti", "Carta", "Bonifico", "PayPal", "Altro"])
+        form.addRow("Acquirente:", self.buyer_input)
+        form.addRow("Metodo pagamento:", self.payment_combo)
+
+        # Buttons - Italian labels
+        buttons = QDialogButtonBox()
+        self.checkout_btn = buttons.addButton("Conferma vendita", QDialogButtonBox.AcceptRole)
+        buttons.addButton("Annulla", QDialogButtonBox.RejectRole)
+        # Enter belongs to the scanner, never to a dialog button
+        for btn in buttons.buttons():
+            btn.setAutoDefault(False)
+            btn.setDefault(False)
+        buttons.accepted.connect(self._checkout)
+        buttons.rejected.connect(self.reject)
+
+        layout.addWidget(self.code_input)
+        layout.addWidget(self.scan_status)
+        layout.addWidget(self.cart_table, 1)
+        layout.addLayout(cart_btns)
+        layout.addLayout(form)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        self._refresh()
+        self.code_input.setFocus()
+
+    # ---------- Scanning ----------
+    def _on_scan(self):
+        code = self.code_input.text().strip()
+        self.code_input.clear()
+        if not code:
+            return
+        artwork = self.sales.lookup(code)
+        if artwork is None:
+            self._set_status(f"Codice non trovato: {code}", error=True)
+            return
+        try:
+            line = self.cart.add(artwork)
+        except ServiceError as e:
+            self._set_status(str(e), error=True)
+            return
+        self._set_status(f"{line.title} × {line.quantity}")
+        self._refresh()
+
+    def _set_status(self, text, error=False):
+        self.scan_status.setText(text)
+        self.scan_status.setStyleSheet("color: #d9534f;" if error else "color: #4CAF50;")
+
+    # ---------- Cart editing ----------
+    def _selected_artwork_id(self):
+        row = self.cart_table.currentRow()
+        if row < 0:
+            return None
+        return self.cart_table.item(row, 0).data(Qt.UserRole)
+
+    def _decrement_selected(self):
+        artwork_id = self._selected_artwork_id()
+        if artwork_id is None:
+            return
+        line = next(l for l in self.cart.lines if l.artwork_id == artwork_id)
+        self.cart.set_quantity(artwork_id, line.quantity - 1)
+        self._refresh()
+
+    def _remove_selected(self):
+        artwork_id = self._selected_artwork_id()
+        if artwork_id is None:
+            return
+        self.cart.remove(artwork_id)
+        self._refresh()
+
+    def _clear_cart(self):
+        self.cart.clear()
+        self._refresh()
+
+    def _refresh(self):
+        lines = self.cart.lines
+        self.cart_table.setRowCount(len(lines))
+        for row, line in enumerate(lines):
+            code_item = QTableWidgetItem(line.code)
+            code_item.setData(Qt.UserRole, line.artwork_id)
+            values = [
+                code_item,
+                QTableWidgetItem(line.title),
+                QTableWidgetItem(str(line.quantity)),
+                QTableWidgetItem(f"€ {line.unit_price:.2f}"),
+                QTableWidgetItem(f"€ {line.subtotal:.2f}"),
+            ]
+            for col, item in enumerate(values):
+                if col >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.cart_table.setItem(row, col, item)
+        self.total_label.setText(f"{self.cart.item_count} pezzi — Totale € {self.cart.total:.2f}")
+        self.checkout_btn.setEnabled(bool(self.cart))
+        self.code_input.setFocus()
+
+    # ---------- Checkout ----------
+    def _checkout(self):
+        try:
+            self.results = self.sales.checkout(
+                self.cart,
+                buyer_name=self.buyer_input.text().strip(),
+                payment_method=self.payment_combo.currentText(),
+            )
+        except ServiceError as e:
+            QMessageBox.warning(self, "Cassa", str(e))
+            return
+        self.accept()
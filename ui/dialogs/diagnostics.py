@@ -0,0 +1,159 @@
+"""
+Diagnostics Dialog
+Shows the query statistics collected by core.instrumentation
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTabWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+    QPlainTextEdit,
+    QFileDialog,
+    QMessageBox,
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from core.paths import DIAGNOSTICS_DIR
+
+
+REFRESH_MS = 2000
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Live view of the query recorder: statements by total time, N+1
+    findings and the latest slow queries with their plans.
+    """
+
+    STATEMENT_COLUMNS = ["Query", "Nome", "N", "Totale ms", "p50", "p95", "p99", "Righe"]
+
+    def __init__(self, recorder, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        self.setWindowTitle("Diagnostica query")
+        self.setMinimumSize(1000, 600)
+        self._build_ui()
+        self.refresh()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(REFRESH_MS)
+
+    def _build_ui(self):
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        tabs = QTabWidget()
+        self.statements_table = self._make_table(self.STATEMENT_COLUMNS)
+        self.findings_table = self._make_table(["Tipo", "Volte", "Query", "Dettagli"])
+        self.slow_text = QPlainTextEdit()
+        self.slow_text.setReadOnly(True)
+        self.slow_text.setStyleSheet("font-family: monospace;")
+        tabs.addTab(self.statements_table, "Query")
+        tabs.addTab(self.findings_table, "N+1")
+        tabs.addTab(self.slow_text, "Query lente")
+        self.tabs = tabs
+        layout.addWidget(tabs, 1)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Aggiorna")
+        reset_btn = QPushButton("Azzera")
+        export_btn = QPushButton("Esporta JSON…")
+        close_btn = QPushButton("Chiudi")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn.clicked.connect(self._reset)
+        export_btn.clicked.connect(self._export)
+        close_btn.clicked.connect(self.accept)
+        for btn in (refresh_btn, reset_btn, export_btn):
+            buttons.addWidget(btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def _make_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().setVisible(False)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(0 if columns[0] == "Query" else 2, QHeaderView.Stretch)
+        return table
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                if isinstance(value, float):
+                    item = QTableWidgetItem(f"{value:.3f}")
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                elif isinstance(value, int):
+                    item = QTableWidgetItem(str(value))
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item = QTableWidgetItem(str(value))
+                    item.setToolTip(str(value))
+                table.setItem(r, c, item)
+        table.setUpdatesEnabled(True)
+
+    def refresh(self):
+        snap = self.recorder.snapshot()
+        totals, commits = snap["totals"], snap["commits"]
+        self.summary_label.setText(
+            f"{totals['queries']} query in {totals['time_ms']:.1f} ms, "
+            f"{totals['rows']} righe  •  {commits['count']} commit "
+            f"(p50 {commits['p50_ms']:.2f} ms, p95 {commits['p95_ms']:.2f} ms)  •  "
+            f"{len(snap['findings'])} segnalazioni N+1  •  dal {snap['started']}"
+        )
+        self._fill(self.statements_table, [
+            (s["sql"], s["name"] or "", s["count"], s["total_ms"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["rows"])
+            for s in snap["statements"]
+        ])
+        self._fill(self.findings_table, [
+            (f["kind"], f["count"], f["sql"],
+             f"dopo: {f['listed_by']}" if "listed_by" in f
+             else f"fino a {f.get('max_burst', 0)} di fila, es. {f.get('example_params', '')}")
+            for f in snap["findings"]
+        ])
+        text = []
+        for entry in reversed(snap["slow"]):
+            text.append(f"[{entry['at']}] {entry['ms']:.1f} ms, {entry['rows']} righe")
+            text.append(f"  {entry['sql']}")
+            text.append(f"  params: {entry['params']}")
+            text.extend(f"    {line}" for line in entry["plan"])
+            text.append("")
+        if self.slow_text.toPlainText() != "\n".join(text):
+            self.slow_text.setPlainText("\n".join(text))
+
+    def _reset(self):
+        self.recorder.reset()
+        self.refresh()
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Esporta diagnostica", str(DIAGNOSTICS_DIR / "query_stats.json"), "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.recorder.dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Diagnostica", f"Impossibile salvare il file:\n{e}")
+
+    def done(self, result):
+        self._timer.stop()
+        super().done(result)
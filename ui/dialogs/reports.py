@@ -0,0 +1,238 @@
+"""
+Reports Dialog
+Sales totals per month, artist, payment method and exhibition, and the
+payouts still due to artists (core.repositories.report_repo)
+"""
+
+import time
+from datetime import date
+
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QComboBox,
+    QDateEdit,
+    QTabWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+)
+from PyQt5.QtCore import Qt, QDate
+
+from core.repositories.report_repo import ReportRepository
+
+
+def _money(value):
+    return f"€ {value or 0:,.2f}"
+
+
+def _percent(value):
+    return f"{(value or 0) * 100:.1f}%"
+
+
+class _Cell(QTableWidgetItem):
+    """Table item showing text but sorting by the underlying value"""
+
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.value = value
+        if isinstance(value, (int, float)):
+            self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, _Cell):
+            mine, theirs = self.value, other.value
+            if mine is None or theirs is None:
+                return mine is None and theirs is not None
+            try:
+                return mine < theirs
+            except TypeError:
+                pass
+        return super().__lt__(other)
+
+
+class ReportsDialog(QDialog):
+    """
+    Sales reports for a period. Every tab is one aggregate query, so
+    changing the period re-runs a few small statements, not a full scan in
+    Python.
+    """
+
+    PRESETS = ["Ultimi 12 mesi", "Anno corrente", "Anno scorso", "Tutto", "Personalizzato"]
+
+    # (tab, column headers, row -> ((text, sort value), ...))
+    TABS = (
+        ("Mesi", ["Mese", "Vendite", "Pezzi", "Incasso", "Progressivo", "Variazione"],
+         lambda r: ((r.month, r.month), (str(r.sales), r.sales), (str(r.copies), r.copies),
+                    (_money(r.revenue), r.revenue), (_money(r.running_revenue), r.running_revenue),
+                    ("" if r.change is None else f"{r.change:+,.2f}", r.change))),
+        ("Artisti", ["#", "Artista", "Vendite", "Pezzi", "Incasso", "Quota", "Spettanza", "Da pagare"],
+         lambda r: ((str(r.rank), r.rank), (r.artist_name or "Nessun artista", r.artist_name or ""),
+                    (str(r.sales), r.sales), (str(r.copies), r.copies),
+                    (_money(r.revenue), r.revenue), (_percent(r.share), r.share),
+                    (_money(r.payout), r.payout), (_money(r.unpaid), r.unpaid))),
+        ("Pagamento", ["Metodo", "Vendite", "Pezzi", "Incasso", "Scontrino medio", "Quota"],
+         lambda r: ((r.payment_method or "Non indicato", r.payment_method),
+                    (str(r.sales), r.sales), (str(r.copies), r.copies),
+                    (_money(r.revenue), r.revenue), (_money(r.average), r.average),
+                    (_percent(r.share), r.share))),
+        ("Mostre", ["Mostra", "Dal", "Al", "Opere vendute", "Vendite", "Pezzi", "Incasso"],
+         lambda r: ((r.name, r.name), (r.start_date or "", r.start_date or ""),
+                    (r.end_date or "in corso", r.end_date or ""),
+                    (str(r.artworks), r.artworks), (str(r.sales), r.sales),
+                    (str(r.copies), r.copies), (_money(r.revenue), r.revenue))),
+        ("Da pagare", ["Artista", "Pagamenti", "Importo", "Quota", "Vendita più vecchia"],
+         lambda r: ((r.artist_name, r.artist_name), (str(r.payments), r.payments),
+                    (_money(r.amount), r.amount), (_percent(r.share), r.share),
+                    ((r.oldest_sale or "")[:10], r.oldest_sale or ""))),
+    )
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.reports = ReportRepository(db)
+        self.setWindowTitle("Report vendite")
+        self.setMinimumSize(900, 560)
+        self._build_ui()
+        self._apply_preset(0)
+
+    def _build_ui(self):
+        layout = QVBoxLayout()
+
+        period = QHBoxLayout()
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(self.PRESETS)
+        self.start_edit = QDateEdit()
+        self.end_edit = QDateEdit()
+        for edit in (self.start_edit, self.end_edit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("dd/MM/yyyy")
+        period.addWidget(QLabel("Periodo:"))
+        period.addWidget(self.preset_combo)
+        period.addWidget(QLabel("Dal"))
+        period.addWidget(self.start_edit)
+        period.addWidget(QLabel("Al"))
+        period.addWidget(self.end_edit)
+        period.addStretch()
+        layout.addLayout(period)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("font-weight: bold; padding: 4px 0;")
+        layout.addWidget(self.summary_label)
+
+        self.tabs = QTabWidget()
+        self.tables = []
+        for title, columns, _ in self.TABS:
+            table = self._make_table(columns)
+            self.tables.append(table)
+            self.tabs.addTab(table, title)
+        layout.addWidget(self.tabs, 1)
+
+        buttons = QHBoxLayout()
+        self.timing_label = QLabel()
+        self.timing_label.setStyleSheet("color: #888;")
+        close_btn = QPushButton("Chiudi")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(self.timing_label)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+        self.preset_combo.currentIndexChanged.connect(self._apply_preset)
+        self.start_edit.dateChanged.connect(self._on_dates_edited)
+        self.end_edit.dateChanged.connect(self._on_dates_edited)
+
+    def _make_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        # Rows keep the query order until a header is clicked
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        return table
+
+    # ---------- Period ----------
+    def _apply_preset(self, index):
+        today = date.today()
+        if self.PRESETS[index] == "Personalizzato":
+            # Keep the dates shown, but make them editable
+            self.start_edit.setEnabled(True)
+            self.end_edit.setEnabled(True)
+            self.refresh()
+            return
+        if self.PRESETS[index] == "Ultimi 12 mesi":
+            # This month and the eleven before it
+            months = today.year * 12 + today.month - 1 - 11
+            start, end = date(months // 12, months % 12 + 1, 1), today
+        elif self.PRESETS[index] == "Anno corrente":
+            start, end = date(today.year, 1, 1), date(today.year, 12, 31)
+        elif self.PRESETS[index] == "Anno scorso":
+            start, end = date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+        else:
+            start, end = None, None
+        self._set_dates(start, end)
+        self.refresh()
+
+    def _set_dates(self, start, end):
+        for edit, value in ((self.start_edit, start), (self.end_edit, end)):
+            edit.blockSignals(True)
+            edit.setEnabled(value is not None)
+            if value is not None:
+                edit.setDate(QDate(value.year, value.month, value.day))
+            edit.blockSignals(False)
+
+    def _on_dates_edited(self):
+        self.preset_combo.blockSignals(True)
+        self.preset_combo.setCurrentIndex(self.PRESETS.index("Personalizzato"))
+        self.preset_combo.blockSignals(False)
+        self.refresh()
+
+    def period(self):
+        """(start, end) ISO dates of the chosen period; None for an open end"""
+        if not self.start_edit.isEnabled():
+            return None, None
+        start = self.start_edit.date().toString("yyyy-MM-dd")
+        end = self.end_edit.date().toString("yyyy-MM-dd")
+        return start, end
+
+    # ---------- Data ----------
+    def refresh(self):
+        start, end = self.period()
+        began = time.perf_counter()
+        totals = self.reports.totals(start, end)
+        results = (
+            self.reports.revenue_by_month(start, end),
+            self.reports.revenue_by_artist(start, end),
+            self.reports.revenue_by_payment_method(start, end),
+            self.reports.revenue_by_exhibition(start, end),
+            self.reports.outstanding_payouts(),
+        )
+        elapsed_ms = (time.perf_counter() - began) * 1000
+
+        self.summary_label.setText(
+            f"{totals.sales} vendite, {totals.copies} pezzi  •  Incasso {_money(totals.revenue)}"
+            f"  •  Scontrino medio {_money(totals.average)}"
+            f"  •  Spettanze artisti {_money(totals.payout)} (da pagare {_money(totals.unpaid)})"
+        )
+        for table, (_, _, cells), rows in zip(self.tables, self.TABS, results):
+            self._fill(table, [cells(r) for r in rows])
+        self.timing_label.setText(f"Calcolato in {elapsed_ms:.0f} ms")
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for r, cells in enumerate(rows):
+            for c, (text, value) in enumerate(cells):
+                table.setItem(r, c, _Cell(text, value))
+        table.setSortingEnabled(True)
+        table.setUpdatesEnabled(True)
@@ -11,6 +11,7 @@ from PyQt5.QtWidgets import (
     QTextEdit,
     QComboBox,
     QDoubleSpinBox,
+    QSpinBox,
     QLabel,
     QDialogButtonBox,
     QDateEdit,
@@ -49,7 +50,12 @@ class SellArtworkDialog(QDialog):
         self.date_input.setDate(QDate.currentDate())
         self.date_input.setCalendarPopup(True)
 
-        # Sale price
+        # Quantity (copies sold in this sale)
+        self.quantity_input = QSpinBox()
+        self.quantity_input.setRange(1, max(1, self.artwork.get('quantity') or 1))
+        self.quantity_input.setValue(1)
+
+        # Sale price (per copy)
         self.price_input = QDoubleSpinBox()
         self.price_input.setRange(0, 1000000)
         self.price_input.setDecimals(2)
@@ -70,7 +76,8 @@ class SellArtworkDialog(QDialog):
         self.notes_input.setPlaceholderText("Note sulla vendita...")
 
         form.addRow("Data vendita:", self.date_input)
-        form.addRow("Prezzo vendita:", self.price_input)
+        form.addRow("Quantità:", self.quantity_input)
+        form.addRow("Prezzo unitario:", self.price_input)
         form.addRow("Acquirente:", self.buyer_input)
         form.addRow("Metodo pagamento:", self.payment_combo)
         form.addRow("Note:", self.notes_input)
@@ -78,10 +85,6 @@ class SellArtworkDialog(QDialog):
         layout.addLayout(form)
 
         # Artist payment preview
-        artist_cut = self.artwork.get('artist_cut_percent', 0) or 0
-        price = self.price_input.value()
-        artist_amount = price * (artist_cut / 100)
-        
         self.payment_preview = QLabel()
         self._update_payment_preview()
         self.payment_preview.setStyleSheet("padding: 10px; border-radius: 5px;")
@@ -89,6 +92,7 @@ class SellArtworkDialog(QDialog):
         
         # Update preview when price changes
         self.price_input.valueChanged.connect(self._update_payment_preview)
+        self.quantity_input.valueChanged.connect(self._update_payment_preview)
 
         # Buttons - Italian labels
         buttons = QDialogButtonBox()
@@ -102,13 +106,14 @@ class SellArtworkDialog(QDialog):
 
     def _update_payment_preview(self):
         artist_cut = self.artwork.get('artist_cut_percent', 0) or 0
-        price = self.price_input.value()
+        quantity = self.quantity_input.value()
+        price = self.price_input.value() * quantity
         artist_amount = price * (artist_cut / 100)
         company_amount = price - artist_amount
         
         self.payment_preview.setText(
             f"<b>Riepilogo:</b><br>"
-            f"Totale: € {price:.2f}<br>"
+            f"Totale ({quantity} × € {self.price_input.value():.2f}): € {price:.2f}<br>"
             f"Quota artista ({artist_cut:.1f}%): € {artist_amount:.2f}<br>"
             f"Quota azienda: € {company_amount:.2f}"
         )
@@ -117,7 +122,9 @@ class SellArtworkDialog(QDialog):
         return {
             "artwork_id": self.artwork.get('id'),
             "sale_date": self.date_input.date().toString("yyyy-MM-dd"),
-            "sale_price": self.price_input.value(),
+            "quantity": self.quantity_input.value(),
+            "unit_price": self.price_input.value(),
+            "sale_price": self.price_input.value() * self.quantity_input.value(),
             "buyer_name": self.buyer_input.text().strip(),
             "payment_method": self.payment_combo.currentText(),
             "notes": self.notes_input.toPlainText().strip(),
@@ -4,10 +4,14 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QPushButton,
     QLabel,
+    QLineEdit,
 )
 
 from ui.widgets.artist_list import ArtistListWidget
 from ui.widgets.artwork_table import ArtworkTableWidget
+from ui.widgets.artwork_detail import ArtworkDetailWidget
+from ui.widgets.dashboard import DashboardWidget
+from ui.widgets.image_carousel import ImageCarousel
 
 
 def build_main_layout():
@@ -22,15 +26,21 @@ def build_main_layout():
 
     # Middle/right: full-width artwork table + actions
     artwork_table = ArtworkTableWidget()
+    dashboard = DashboardWidget()
     artwork_count = QLabel("Artworks: 0")
+    artwork_search = QLineEdit()
+    artwork_search.setPlaceholderText("Cerca opere...")
+    artwork_search.setClearButtonEnabled(True)
 
     add_btn = QPushButton("aggiungi opera")
     edit_btn = QPushButton("Modifica")
     delete_btn = QPushButton("Elimina")
     sell_btn = QPushButton("💰 VENDI")
+    checkout_btn = QPushButton("🛒 Cassa")
+    reports_btn = QPushButton("📊 Report")
     
     # Make buttons larger
-    for btn in [add_btn, edit_btn, delete_btn]:
+    for btn in [add_btn, edit_btn, delete_btn, checkout_btn, reports_btn]:
         btn.setMinimumHeight(40)
         btn.setMinimumWidth(100)
     
@@ -62,16 +72,36 @@ def build_main_layout():
     action_btns.addWidget(add_btn)
     action_btns.addWidget(edit_btn)
     action_btns.addWidget(delete_btn)
+    action_btns.addWidget(checkout_btn)
+    action_btns.addWidget(reports_btn)
     action_btns.addWidget(sell_btn)
 
+    header = QHBoxLayout()
+    header.addWidget(artwork_count)
+    header.addWidget(artwork_search, 1)
+
     center_panel = QVBoxLayout()
-    center_panel.addWidget(artwork_count)
+    center_panel.addWidget(dashboard)
+    center_panel.addLayout(header)
     center_panel.addLayout(action_btns)
     center_panel.addWidget(artwork_table, 1)
     center_panel.addStretch()
 
+    # Right: images and details of the selected artwork
+    carousel = ImageCarousel()
+    artwork_detail = ArtworkDetailWidget()
+
+    right_panel = QWidget()
+    right_layout = QVBoxLayout()
+    right_layout.setContentsMargins(0, 0, 0, 0)
+    right_layout.addWidget(carousel)
+    right_layout.addWidget(artwork_detail, 1)
+    right_panel.setLayout(right_layout)
+    right_panel.setFixedWidth(420)
+
     main_layout.addWidget(artist_list)
     main_layout.addLayout(center_panel, 1)
+    main_layout.addWidget(right_panel)
 
     central.setLayout(main_layout)
 
@@ -79,9 +109,15 @@ def build_main_layout():
         "artist_list": artist_list,
         "artwork_table": artwork_table,
         "artwork_count_label": artwork_count,
+        "dashboard": dashboard,
+        "artwork_search": artwork_search,
+        "artwork_detail": artwork_detail,
+        "carousel": carousel,
         "add_btn": add_btn,
         "edit_btn": edit_btn,
         "delete_btn": delete_btn,
         "sell_btn": sell_btn,
+        "checkout_btn": checkout_btn,
+        "reports_btn": reports_btn,
     }
     return central, refs
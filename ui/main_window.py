@@ -1,21 +1,29 @@
 from pathlib import Path
 import shutil
 
-from PyQt5.QtWidgets import QMainWindow, QMessageBox
+from PyQt5.QtWidgets import QMainWindow, QMessageBox, QShortcut
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QKeySequence
 
 from core.database import Database
-from core.paths import IMG_DIR, DB_PATH, ensure_paths
+from core.paths import IMG_DIR, DB_PATH, DIAGNOSTICS_DIR, ensure_paths
 from core.repositories.artist_repo import ArtistRepository
 from core.repositories.artwork_repo import ArtworkRepository
 from core.repositories.sale_repo import SaleRepository
 from ui.controllers.artist_controller import ArtistController
 from ui.controllers.artwork_controller import ArtworkController
+from ui.dialogs.diagnostics import DiagnosticsDialog
+from ui.dialogs.reports import ReportsDialog
 from ui.layouts.main_layout import build_main_layout
+from ui.workers.search import DebouncedSearch
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 TEST_IMAGES_DIR = PROJECT_ROOT / "assets" / "test_images"
 
+# Keep the WAL file short while Datasette readers are connected
+CHECKPOINT_INTERVAL_MS = 5 * 60 * 1000
+
 
 class MainWindow(QMainWindow):
     """
@@ -25,7 +33,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Art Catalog Manager")
-        self.resize(1200, 700)
+        self.resize(1500, 800)
         self.setAcceptDrops(True)
         
         # Set application-wide font size
@@ -39,6 +47,10 @@ class MainWindow(QMainWindow):
         self.artwork_repo = ArtworkRepository(self.db)
         self.sale_repo = SaleRepository(self.db)
 
+        self._checkpoint_timer = QTimer(self)
+        self._checkpoint_timer.timeout.connect(self.db.checkpoint)
+        self._checkpoint_timer.start(CHECKPOINT_INTERVAL_MS)
+
         self._build_ui()
         self.artist_controller.load_artists()
         self.artwork_controller.load_artworks()
@@ -50,19 +62,27 @@ class MainWindow(QMainWindow):
         self.artist_list = refs["artist_list"]
         self.artwork_table = refs["artwork_table"]
         self.artwork_count_label = refs["artwork_count_label"]
+        self.dashboard = refs["dashboard"]
+        self.artwork_search_input = refs["artwork_search"]
+        self.artwork_detail = refs["artwork_detail"]
+        self.carousel = refs["carousel"]
         self.add_btn = refs["add_btn"]
         self.edit_btn = refs["edit_btn"]
         self.delete_btn = refs["delete_btn"]
         self.sell_btn = refs["sell_btn"]
+        self.checkout_btn = refs["checkout_btn"]
+        self.reports_btn = refs["reports_btn"]
 
         # Controllers
         self.artwork_controller = ArtworkController(
             self.artwork_repo,
             self.artist_repo,
             self.artwork_table,
-            None,
+            self.artwork_detail,
             self.artwork_count_label,
             self.sale_repo,
+            carousel=self.carousel,
+            dashboard=self.dashboard,
         )
         self.artist_controller = ArtistController(
             self.artist_repo,
@@ -70,10 +90,24 @@ class MainWindow(QMainWindow):
             self.artwork_controller.load_artworks,
         )
 
+        # Debounced background searches
+        self.artist_search = DebouncedSearch(
+            ArtistController.run_search, ArtistRepository, DB_PATH, parent=self
+        )
+        self.artwork_search = DebouncedSearch(
+            ArtworkController.run_search, ArtworkRepository, DB_PATH, parent=self
+        )
+
         # Wiring
+        self.artist_list.artist_selected.connect(self._clear_artwork_search)
         self.artist_list.artist_selected.connect(self.artist_controller.on_artist_selected)
         self.artist_list.artist_double_clicked.connect(self.artist_controller.on_artist_double_click)
         self.artist_list.add_btn.clicked.connect(self.artist_controller.add_artist)
+        self.artist_list.search_changed.connect(self.artist_search.set_text)
+        self.artist_search.results_ready.connect(self.artist_controller.on_search_results)
+
+        self.artwork_search_input.textChanged.connect(self.artwork_search.set_text)
+        self.artwork_search.results_ready.connect(self.artwork_controller.on_search_results)
 
         self.artwork_table.artwork_selected.connect(self.artwork_controller.on_artwork_selected)
         self.artwork_table.artwork_double_clicked.connect(self.artwork_controller.edit_artwork)
@@ -82,12 +116,45 @@ class MainWindow(QMainWindow):
         self.edit_btn.clicked.connect(self.artwork_controller.edit_artwork)
         self.delete_btn.clicked.connect(self.artwork_controller.delete_artwork)
         self.sell_btn.clicked.connect(self.artwork_controller.sell_artwork)
+        self.checkout_btn.clicked.connect(self.artwork_controller.open_checkout)
+        self.reports_btn.clicked.connect(self.open_reports)
+
+        self.artwork_controller.ingest.progress.connect(self._show_ingest_progress)
+
+        # Query diagnostics, only when instrumentation is enabled
+        self._diagnostics = None
+        if self.db.recorder is not None:
+            QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.open_diagnostics)
+            self.statusBar().showMessage("Diagnostica query attiva (Ctrl+Shift+D)", 5000)
+
+    def open_reports(self):
+        ReportsDialog(self.db, self).exec()
+
+    def open_diagnostics(self):
+        if self._diagnostics is None:
+            self._diagnostics = DiagnosticsDialog(self.db.recorder, self)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+        self._diagnostics.refresh()
+
+    def _show_ingest_progress(self, remaining):
+        if remaining:
+            self.statusBar().showMessage(f"Elaborazione immagini: {remaining} in coda")
+        else:
+            self.statusBar().showMessage("Immagini elaborate", 3000)
+
+    def _clear_artwork_search(self):
+        """Selecting an artist leaves search mode without triggering a reload"""
+        self.artwork_search_input.blockSignals(True)
+        self.artwork_search_input.clear()
+        self.artwork_search_input.blockSignals(False)
+        self.artwork_search.cancel()
 
     # =========================
     # DRAG & DROP (WINDOW LEVEL)
     # =========================
     def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls() and self.artwork_controller.handle_drop(event.mimeData().urls()):
+        if event.mimeData().hasUrls() and self.artwork_controller.accepts_drop(event.mimeData().urls()):
             event.acceptProposedAction()
         else:
             event.ignore()
@@ -99,5 +166,13 @@ class MainWindow(QMainWindow):
             event.ignore()
 
     def closeEvent(self, event):
+        self._checkpoint_timer.stop()
+        # Worker connections go first, so the TRUNCATE checkpoint below
+        # is not held back by their read snapshots
+        self.artist_search.close()
+        self.artwork_search.close()
+        self.artwork_controller.ingest.shutdown()
+        if self.db.recorder is not None:
+            self.db.recorder.dump(DIAGNOSTICS_DIR / "query_stats.json")
         self.db.close()
         super().closeEvent(event)
@@ -21,6 +21,7 @@ class ArtistListWidget(QWidget):
 
     artist_selected = pyqtSignal(int)  # Emits artist ID when selected
     artist_double_clicked = pyqtSignal(int)  # Emits artist ID on double click
+    search_changed = pyqtSignal(str)  # Emits search text; results come back via load_artists
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -56,10 +57,8 @@ class ArtistListWidget(QWidget):
         self.setLayout(layout)
 
     def _on_search(self, text):
-        """Filter artists based on search text"""
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            item.setHidden(text.lower() not in item.text().lower())
+        """Ask for artists matching the search text (searched in the database)"""
+        self.search_changed.emit(text)
 
     def _on_selection_changed(self):
         """Emit signal when selection changes"""
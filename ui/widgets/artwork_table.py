@@ -3,38 +3,269 @@ Artwork Table Widget
 Custom widget for displaying and managing artworks
 """
 
-from pathlib import Path
+from bisect import bisect_left
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QHBoxLayout,
-    QGridLayout,
-    QScrollArea,
+    QSplitter,
     QLabel,
-    QPushButton,
+    QListView,
+    QAbstractItemView,
+    QStyledItemDelegate,
+    QStyle,
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPen, QPixmap
 
 from core.paths import IMG_DIR
+from core.thumbnails import LRUCache, ThumbnailCache, THUMB_SIZE
+from ui.workers.image_loader import ImageLoader, decode_thumbnail
 
 
-class ArtworkCard(QPushButton):
-    """Custom button that tracks double clicks"""
-    double_clicked = pyqtSignal()
-    
-    def __init__(self):
-        super().__init__()
-    
-    def mouseDoubleClickEvent(self, event):
-        """Handle double click"""
-        self.double_clicked.emit()
-        super().mouseDoubleClickEvent(event)
+# Card geometry (the image area matches the thumbnail size)
+CARD_WIDTH = 270
+CARD_HEIGHT = 340
+CARD_SPACING = 10
+
+STATUS_LABELS = {
+    'available': 'Disponibile',
+    'sold': 'Venduto',
+    'exhibition': 'In Mostra',
+    'reserved': 'Riservato'
+}
+
+ArtworkRole = Qt.UserRole + 1     # ArtworkCard row
+ImageTextRole = Qt.UserRole + 2   # Placeholder text while no pixmap is shown
+
+
+def _sort_key(artwork):
+    """Grid order: title, then id (matches ORDER BY title, id)"""
+    return (artwork.title or '', artwork.id)
+
+
+class ArtworkListModel(QAbstractListModel):
+    """
+    List model holding the artworks of one grid section, sorted by title.
+    Thumbnails are requested lazily from the provider, so only rows the
+    view actually paints ever trigger an image decode. With a pager set,
+    further pages are fetched as the view scrolls (canFetchMore/fetchMore).
+    """
+
+    def __init__(self, thumbnail_provider, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._keys = []  # Sort key of each row, kept parallel to _rows
+        self._key_of = {}  # {artwork id: sort key}
+        self._ids_by_image = {}  # {image name: {artwork id, ...}}
+        self._provider = thumbnail_provider
+        self._fetch_page = None  # fetch(cursor) -> (artworks, next_cursor)
+        self._cursor = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        artwork = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return artwork.title
+        if role == Qt.UserRole:
+            return artwork.id
+        if role == ArtworkRole:
+            return artwork
+        if role == Qt.DecorationRole:
+            return self._provider.thumbnail(artwork.image)
+        if role == ImageTextRole:
+            return self._provider.thumbnail_text(artwork.image)
+        return None
+
+    def set_artworks(self, artworks):
+        """Show a fixed list of artworks"""
+        self._fetch_page = None
+        self._cursor = None
+        self._reset(artworks)
+
+    def set_pager(self, fetch_page):
+        """Show artworks page by page; the first page is fetched right away"""
+        self._fetch_page = fetch_page
+        artworks, self._cursor = fetch_page(None)
+        self._reset(artworks)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        artworks, self._cursor = self._fetch_page(self._cursor)
+        if not artworks:
+            return
+        # Pages arrive in (title, id) order after everything already loaded
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(artworks) - 1)
+        for artwork in artworks:
+            key = _sort_key(artwork)
+            self._rows.append(artwork)
+            self._keys.append(key)
+            self._key_of[artwork.id] = key
+            self._index_image(artwork)
+        self.endInsertRows()
+
+    def _reset(self, artworks):
+        self.beginResetModel()
+        self._rows = sorted(artworks, key=_sort_key)
+        self._keys = [_sort_key(a) for a in self._rows]
+        self._key_of = {a.id: key for a, key in zip(self._rows, self._keys)}
+        self._ids_by_image = {}
+        for artwork in self._rows:
+            self._index_image(artwork)
+        self.endResetModel()
+
+    def row_of(self, artwork_id):
+        """Row of an artwork in O(log n), or -1"""
+        key = self._key_of.get(artwork_id)
+        if key is None:
+            return -1
+        return bisect_left(self._keys, key)
+
+    def upsert(self, artwork):
+        """Insert or replace an artwork, keeping the title order"""
+        artwork_id = artwork.id
+        key = _sort_key(artwork)
+        row = self.row_of(artwork_id)
+        if row >= 0 and self._keys[row] == key:
+            self._unindex_image(self._rows[row])
+            self._rows[row] = artwork
+            self._index_image(artwork)
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return
+        if row >= 0:
+            self.remove(artwork_id)
+        if self._cursor is not None and (not self._keys or key > self._keys[-1]):
+            # Belongs to a page that has not been fetched yet
+            return
+
+        row = bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, artwork)
+        self._keys.insert(row, key)
+        self._key_of[artwork_id] = key
+        self._index_image(artwork)
+        self.endInsertRows()
+
+    def remove(self, artwork_id):
+        """Remove an artwork; returns False if it is not in this model"""
+        row = self.row_of(artwork_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._unindex_image(self._rows[row])
+        del self._rows[row]
+        del self._keys[row]
+        del self._key_of[artwork_id]
+        self.endRemoveRows()
+        return True
+
+    def image_changed(self, image_name):
+        """Repaint the rows that show the given image"""
+        for artwork_id in self._ids_by_image.get(image_name, ()):
+            index = self.index(self.row_of(artwork_id))
+            self.dataChanged.emit(index, index, [Qt.DecorationRole, ImageTextRole])
+
+    def _index_image(self, artwork):
+        if artwork.image:
+            self._ids_by_image.setdefault(artwork.image, set()).add(artwork.id)
+
+    def _unindex_image(self, artwork):
+        ids = self._ids_by_image.get(artwork.image)
+        if ids is not None:
+            ids.discard(artwork.id)
+
+
+class ArtworkCardDelegate(QStyledItemDelegate):
+    """Paints an artwork as a card: image, title, artist/status, price, quantity"""
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    def paint(self, painter, option, index):
+        artwork = index.data(ArtworkRole)
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        card = option.rect.adjusted(2, 2, -2, -2)
+
+        # Background and border
+        painter.fillRect(card, QColor("#3a3a3a") if selected or hovered else QColor("#2a2a2a"))
+        if selected:
+            painter.setPen(QPen(QColor("#FF6B6B"), 2))
+            painter.drawRect(card.adjusted(1, 1, -1, -1))
+        else:
+            painter.setPen(QPen(QColor("#555555"), 1))
+            painter.drawRect(card.adjusted(0, 0, -1, -1))
+
+        content = card.adjusted(8, 8, -8, -8)
+
+        # Image - centered in the thumbnail area
+        image_rect = QRect(content.left(), content.top(), content.width(), THUMB_SIZE[1])
+        pixmap = index.data(Qt.DecorationRole)
+        if isinstance(pixmap, QPixmap) and not pixmap.isNull():
+            x = image_rect.left() + (image_rect.width() - pixmap.width()) // 2
+            y = image_rect.top() + (image_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setPen(QColor("#dddddd"))
+            painter.setFont(option.font)
+            painter.drawText(image_rect, Qt.AlignCenter, index.data(ImageTextRole) or "")
+
+        y = image_rect.bottom() + 6
+
+        # Title
+        title_font = QFont(option.font)
+        title_font.setPointSize(11)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        painter.setPen(QColor("#dddddd"))
+        title_rect = QRect(content.left(), y, content.width(), painter.fontMetrics().height() * 2)
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, artwork.title)
+        y = title_rect.bottom() + 4
+
+        # Artist and status - translate status to Italian
+        status = artwork.status or 'available'
+        info_text = f"{artwork.artist_name or 'Unknown'} | {STATUS_LABELS.get(status, status)}"
+        y = self._draw_line(painter, option.font, content, y, info_text, "#aaaaaa", 11, True)
+
+        # Price
+        price = artwork.price
+        price_text = f"€ {price:.2f}" if price is not None else "—"
+        y = self._draw_line(painter, option.font, content, y, price_text, "#4CAF50", 12, True)
+
+        # Quantity
+        self._draw_line(painter, option.font, content, y, f"Quantità: {artwork.quantity}", "#64B5F6", 10, False)
+
+        painter.restore()
+
+    def _draw_line(self, painter, base_font, content, y, text, color, point_size, bold):
+        font = QFont(base_font)
+        font.setPointSize(point_size)
+        font.setBold(bold)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        metrics = painter.fontMetrics()
+        rect = QRect(content.left(), y, content.width(), metrics.height())
+        painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, metrics.elidedText(text, Qt.ElideRight, rect.width()))
+        return rect.bottom() + 4
 
 
 class ArtworkTableWidget(QWidget):
     """
-    Widget displaying artworks in a card/grid format
+    Widget displaying artworks in a card/grid format.
+    Each section is a virtualized QListView, so only visible cards are painted.
     """
 
     artwork_selected = pyqtSignal(int)  # Emits artwork ID when selected
@@ -42,240 +273,218 @@ class ArtworkTableWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._artwork_cards = {}  # Store {artwork_id: button_widget}
         self._selected_id = None
+        self._thumbnails = ThumbnailCache()
+        self._pixmap_cache = LRUCache(maxsize=512)  # {thumbnail key: QPixmap}
+        self._thumb_keys = {}  # {image name: (pixmap cache key, path, thumbnail cache or None)}
+        self.rendition_lookup = None  # image name -> card-sized rendition path or None
+        self._failed_images = {}  # {image name: placeholder text}
+        self._loader = ImageLoader(self)
+        self._loader.image_loaded.connect(self._on_image_loaded)
         self._build_ui()
 
     def _build_ui(self):
         layout = QVBoxLayout()
 
-        # Scroll area for cards
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; }")
-
-        # Container for all content
-        self.container = QWidget()
-        self.main_layout = QVBoxLayout()
-        self.main_layout.setSpacing(10)
-        self.main_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Available section header
+        # Available section
+        self.available_model = ArtworkListModel(self, self)
         self.available_label = QLabel("Disponibili")
         self.available_label.setStyleSheet("font-weight: bold; font-size: 14pt; color: #4CAF50; padding: 5px;")
-        self.main_layout.addWidget(self.available_label)
-        
-        # Available artworks grid
-        self.available_grid = QGridLayout()
-        self.available_grid.setSpacing(10)
-        self.main_layout.addLayout(self.available_grid)
-        
-        # Sold section header
+        self.available_view = self._create_view(self.available_model)
+
+        # Sold section
+        self.sold_model = ArtworkListModel(self, self)
         self.sold_label = QLabel("Venduti")
-        self.sold_label.setStyleSheet("font-weight: bold; font-size: 14pt; color: #FF6B6B; padding: 5px; margin-top: 20px;")
-        self.main_layout.addWidget(self.sold_label)
-        
-        # Sold artworks grid
-        self.sold_grid = QGridLayout()
-        self.sold_grid.setSpacing(10)
-        self.main_layout.addLayout(self.sold_grid)
-        
-        self.main_layout.addStretch()
-        self.container.setLayout(self.main_layout)
-
-        self.scroll.setWidget(self.container)
-        layout.addWidget(self.scroll)
+        self.sold_label.setStyleSheet("font-weight: bold; font-size: 14pt; color: #FF6B6B; padding: 5px;")
+        self.sold_view = self._create_view(self.sold_model)
+
+        self.splitter = QSplitter(Qt.Vertical)
+        self.available_section = self._create_section(self.available_label, self.available_view)
+        self.sold_section = self._create_section(self.sold_label, self.sold_view)
+        self.splitter.addWidget(self.available_section)
+        self.splitter.addWidget(self.sold_section)
+        self.splitter.setStretchFactor(0, 3)
+        self.splitter.setStretchFactor(1, 1)
+
+        layout.addWidget(self.splitter)
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
-    def _create_artwork_card(self, artwork):
-        """Create a card widget for an artwork"""
-        card = ArtworkCard()
-        card.setStyleSheet(
-            "ArtworkCard { text-align: top; padding: 0px; border: 1px solid #555; background-color: #2a2a2a; }"
-            "ArtworkCard:hover { background-color: #3a3a3a; }"
-            "ArtworkCard:pressed { background-color: #1a1a1a; }"
+    def _create_view(self, model):
+        view = QListView()
+        view.setModel(model)
+        view.setItemDelegate(ArtworkCardDelegate(view))
+        view.setViewMode(QListView.IconMode)
+        view.setResizeMode(QListView.Adjust)
+        view.setMovement(QListView.Static)
+        view.setWrapping(True)
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QListView.Batched)
+        view.setBatchSize(200)
+        view.setGridSize(QSize(CARD_WIDTH + CARD_SPACING, CARD_HEIGHT + CARD_SPACING))
+        view.setSpacing(0)
+        view.setSelectionMode(QAbstractItemView.SingleSelection)
+        view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        view.setMouseTracking(True)
+        view.setStyleSheet("QListView { border: none; }")
+        view.selectionModel().selectionChanged.connect(
+            lambda *_: self._on_selection_changed(view)
         )
-        card.setMinimumHeight(340)
-        card.setMinimumWidth(240)
-        
-        # Create card content
-        card_layout = QVBoxLayout()
-        card_layout.setSpacing(5)
-        card_layout.setContentsMargins(8, 8, 8, 8)
-
-        # Image - bigger size
-        image_label = QLabel()
-        image_label.setAlignment(Qt.AlignCenter)
-        image_label.setMinimumHeight(200)
-        image_name = artwork.get('image', '')
-        if image_name:
-            image_path = IMG_DIR / image_name
-            if image_path.exists():
-                pixmap = QPixmap(str(image_path))
-                if not pixmap.isNull():
-                    scaled = pixmap.scaled(260, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    image_label.setPixmap(scaled)
-                else:
-                    image_label.setText("Invalid")
-            else:
-                image_label.setText("Not found")
-        else:
-            image_label.setText("No image")
-        card_layout.addWidget(image_label)
+        view.doubleClicked.connect(self._on_double_clicked)
+        return view
 
-        # Title
-        title_label = QLabel(artwork.get('title', ''))
-        title_label.setStyleSheet("font-weight: bold; color: #ddd; font-size: 11pt;")
-        title_label.setWordWrap(True)
-        card_layout.addWidget(title_label)
+    def _create_section(self, label, view):
+        section = QWidget()
+        section_layout = QVBoxLayout()
+        section_layout.setContentsMargins(5, 5, 5, 5)
+        section_layout.addWidget(label)
+        section_layout.addWidget(view, 1)
+        section.setLayout(section_layout)
+        return section
 
-        # Artist and status - translate status to Italian
-        status_map = {
-            'available': 'Disponibile',
-            'sold': 'Venduto',
-            'exhibition': 'In Mostra',
-            'reserved': 'Riservato'
-        }
-        status = artwork.get('status', 'available')
-        status_it = status_map.get(status, status)
-        info_text = f"{artwork.get('artist_name', 'Unknown')} | {status_it}"
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet("color: #aaa; font-size: 11pt; font-weight: bold;")
-        card_layout.addWidget(info_label)
+    # ---------- Thumbnail provider (used by the models) ----------
+    def thumbnail(self, image_name):
+        """Return the cached thumbnail pixmap, queueing a decode on a miss"""
+        if not image_name or image_name in self._failed_images:
+            return None
+        entry = self._thumb_entry(image_name)
+        if entry is None:
+            self._failed_images[image_name] = "Not found"
+            return None
+        key, path, thumbnails = entry
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is None:
+            self._loader.request(image_name, decode_thumbnail, path, thumbnails)
+        return pixmap
 
-        # Price
-        price = artwork.get('price')
-        price_text = f"€ {price:.2f}" if price is not None else "—"
-        price_label = QLabel(price_text)
-        price_label.setStyleSheet("color: #4CAF50; font-weight: bold; font-size: 12pt;")
-        card_layout.addWidget(price_label)
+    def thumbnail_text(self, image_name):
+        if not image_name:
+            return "No image"
+        return self._failed_images.get(image_name, "Caricamento...")
 
-        # Quantity
-        quantity = artwork.get('quantity', 1)
-        qty_text = f"Quantità: {quantity}"
-        qty_label = QLabel(qty_text)
-        qty_label.setStyleSheet("color: #64B5F6; font-size: 10pt;")
-        card_layout.addWidget(qty_label)
-
-        card_layout.addStretch()
-        card.setLayout(card_layout)
-        return card
-
-    def _on_card_clicked(self, artwork_id):
-        """Handle card click"""
-        self._selected_id = artwork_id
-        self.artwork_selected.emit(artwork_id)
-        # Visual feedback
-        for aid, card in self._artwork_cards.items():
-            if aid == artwork_id:
-                card.setStyleSheet(
-                    "ArtworkCard { text-align: top; padding: 0px; border: 2px solid #FF6B6B; background-color: #3a3a3a; }"
-                )
+    def _thumb_entry(self, image_name):
+        """What to decode for an image: its ingest thumbnail, else the original"""
+        if image_name not in self._thumb_keys:
+            rendition = self.rendition_lookup(image_name) if self.rendition_lookup else None
+            if rendition is not None:
+                # Already card-sized: no thumbnail cache needed
+                entry = (str(rendition), rendition, None)
             else:
-                card.setStyleSheet(
-                    "ArtworkCard { text-align: top; padding: 0px; border: 1px solid #555; background-color: #2a2a2a; }"
-                )
+                source = IMG_DIR / image_name
+                key = self._thumbnails.key(source)
+                entry = (key, source, self._thumbnails) if key is not None else None
+            self._thumb_keys[image_name] = entry
+        return self._thumb_keys[image_name]
+
+    def _on_image_loaded(self, image_name, image):
+        """Cache the decoded thumbnail and repaint the cards showing it"""
+        entry = self._thumb_entry(image_name)
+        if image.isNull():
+            self._failed_images[image_name] = "Invalid"
+        elif entry is not None:
+            self._pixmap_cache.put(entry[0], QPixmap.fromImage(image))
+        self._repaint_image(image_name)
+
+    def image_rendered(self, image_name):
+        """The ingest thumbnail of an image is ready: show it instead of the original"""
+        self._thumb_keys.pop(image_name, None)
+        self._failed_images.pop(image_name, None)
+        self._repaint_image(image_name)
 
-    def _on_card_double_clicked(self, artwork_id):
+    def _repaint_image(self, image_name):
+        self.available_model.image_changed(image_name)
+        self.sold_model.image_changed(image_name)
+
+    # ---------- Selection ----------
+    def _on_selection_changed(self, view):
+        indexes = view.selectionModel().selectedIndexes()
+        if not indexes:
+            return
+        # Only one card can be selected across both sections
+        other = self.sold_view if view is self.available_view else self.available_view
+        other.clearSelection()
+        self._selected_id = indexes[0].data(Qt.UserRole)
+        self.artwork_selected.emit(self._selected_id)
+
+    def _on_double_clicked(self, index):
         """Handle card double click"""
-        self.artwork_double_clicked.emit(artwork_id)
-
-    def _clear_layout(self):
-        """Safely clear all items from the grid layouts"""
-        # Clear available grid
-        while self.available_grid.count():
-            item = self.available_grid.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        # Clear sold grid
-        while self.sold_grid.count():
-            item = self.sold_grid.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
+        artwork_id = index.data(Qt.UserRole)
+        if artwork_id:
+            self.artwork_double_clicked.emit(artwork_id)
 
     def load_artworks(self, artworks):
         """Load artworks into the card view"""
-        # Clear existing cards safely
-        self._clear_layout()
-        self._artwork_cards.clear()
+        self._loader.cancel_pending()
+        self._thumb_keys.clear()
+        self._failed_images.clear()
         self._selected_id = None
 
         # Separate artworks by status
-        available_artworks = [a for a in artworks if a.get('status') != 'sold']
-        sold_artworks = [a for a in artworks if a.get('status') == 'sold']
-
-        columns = 2  # 2 cards per row
-
-        # Load available artworks
-        row = 0
-        col = 0
-        for artwork in available_artworks:
-            artwork_id = artwork.get('id')
-            card = self._create_artwork_card(artwork)
-            
-            # Create handlers
-            def make_click_handler(aid):
-                def handler():
-                    self._on_card_clicked(aid)
-                return handler
-            
-            def make_double_click_handler(aid):
-                def handler():
-                    self._on_card_double_clicked(aid)
-                return handler
-            
-            card.clicked.connect(make_click_handler(artwork_id))
-            card.double_clicked.connect(make_double_click_handler(artwork_id))
-            
-            self._artwork_cards[artwork_id] = card
-            self.available_grid.addWidget(card, row, col)
-            
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-        # Load sold artworks
-        row = 0
-        col = 0
-        for artwork in sold_artworks:
-            artwork_id = artwork.get('id')
-            card = self._create_artwork_card(artwork)
-            
-            # Create handlers
-            def make_click_handler(aid):
-                def handler():
-                    self._on_card_clicked(aid)
-                return handler
-            
-            def make_double_click_handler(aid):
-                def handler():
-                    self._on_card_double_clicked(aid)
-                return handler
-            
-            card.clicked.connect(make_click_handler(artwork_id))
-            card.double_clicked.connect(make_double_click_handler(artwork_id))
-            
-            self._artwork_cards[artwork_id] = card
-            self.sold_grid.addWidget(card, row, col)
-            
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-        # Update section visibility
-        self.available_label.setVisible(len(available_artworks) > 0)
-        self.sold_label.setVisible(len(sold_artworks) > 0)
+        available_artworks = [a for a in artworks if a.status != 'sold']
+        sold_artworks = [a for a in artworks if a.status == 'sold']
+        self.available_model.set_artworks(available_artworks)
+        self.sold_model.set_artworks(sold_artworks)
+
+        self._update_sections()
+
+    def load_pages(self, fetch_available, fetch_sold):
+        """
+        Load both sections lazily. Each fetch(cursor) returns
+        (artworks, next_cursor) and is called again as the view scrolls.
+        """
+        self._loader.cancel_pending()
+        self._thumb_keys.clear()
+        self._failed_images.clear()
+        self._selected_id = None
+
+        self.available_model.set_pager(fetch_available)
+        self.sold_model.set_pager(fetch_sold)
+        self._update_sections()
+
+    def apply_changes(self, artworks, deleted_ids=()):
+        """
+        Patch the grid in place: upsert the given artworks and drop deleted IDs.
+        A card whose status changed moves between the available and sold sections.
+        """
+        for artwork_id in deleted_ids:
+            self.available_model.remove(artwork_id)
+            self.sold_model.remove(artwork_id)
+            if artwork_id == self._selected_id:
+                self._selected_id = None
+
+        for artwork in artworks:
+            artwork_id = artwork.id
+            # The image file may have been replaced: look it up again
+            self._thumb_keys.pop(artwork.image, None)
+            self._failed_images.pop(artwork.image, None)
+            if artwork.status == 'sold':
+                target, other = self.sold_model, self.available_model
+            else:
+                target, other = self.available_model, self.sold_model
+            if other.remove(artwork_id) and artwork_id == self._selected_id:
+                # The selected card changed section, so it is no longer selected
+                self._selected_id = None
+            target.upsert(artwork)
+
+        self._update_sections()
+
+    def count(self):
+        """Number of artworks loaded in both sections"""
+        return self.available_model.rowCount() + self.sold_model.rowCount()
+
+    def _update_sections(self):
+        """Only show sections that have cards"""
+        self.available_section.setVisible(self.available_model.rowCount() > 0)
+        self.sold_section.setVisible(self.sold_model.rowCount() > 0)
 
     def clear(self):
         """Clear the cards"""
-        self._clear_layout()
-        self._artwork_cards.clear()
+        self._loader.cancel_pending()
+        self.available_model.set_artworks([])
+        self.sold_model.set_artworks([])
         self._selected_id = None
+        self._update_sections()
 
     def get_selected_artwork_id(self):
         """Get currently selected artwork ID"""
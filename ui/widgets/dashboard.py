@@ -0,0 +1,88 @@
+"""
+Dashboard Widget
+A strip of catalog counters read from the trigger-maintained summary
+tables: cheap enough to refresh after every change.
+"""
+from datetime import date
+
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QFrame
+from PyQt5.QtCore import Qt
+
+
+def _money(value):
+    return f"€ {value or 0:,.0f}"
+
+
+class _Tile(QFrame):
+    """One counter: a big value over a small caption"""
+
+    def __init__(self, caption, parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.StyledPanel)
+        self.value_label = QLabel("—")
+        self.value_label.setAlignment(Qt.AlignCenter)
+        self.value_label.setStyleSheet("font-size: 15px; font-weight: bold;")
+        self.caption_label = QLabel(caption)
+        self.caption_label.setAlignment(Qt.AlignCenter)
+        self.caption_label.setStyleSheet("color: #888888; font-size: 10px;")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(6, 3, 6, 3)
+        layout.setSpacing(0)
+        layout.addWidget(self.value_label)
+        layout.addWidget(self.caption_label)
+        self.setLayout(layout)
+
+    def set(self, value, caption=None, tooltip=""):
+        self.value_label.setText(value)
+        if caption is not None:
+            self.caption_label.setText(caption)
+        self.setToolTip(tooltip)
+
+
+class DashboardWidget(QWidget):
+    """
+    Available / reserved / sold counts, stock value, this month's sales and
+    the amount still due to artists. With an artist selected, stock and
+    unpaid amount are that artist's.
+    """
+
+    def __init__(self, summary_repo=None, parent=None):
+        super().__init__(parent)
+        self.summary_repo = summary_repo
+        self._build_ui()
+
+    def _build_ui(self):
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.available_tile = _Tile("Disponibili")
+        self.reserved_tile = _Tile("Riservate / in mostra")
+        self.sold_tile = _Tile("Vendute")
+        self.stock_tile = _Tile("Valore magazzino")
+        self.month_tile = _Tile("Incasso del mese")
+        self.unpaid_tile = _Tile("Da pagare agli artisti")
+        for tile in (self.available_tile, self.reserved_tile, self.sold_tile,
+                     self.stock_tile, self.month_tile, self.unpaid_tile):
+            layout.addWidget(tile)
+        self.setLayout(layout)
+
+    def refresh(self, artist_id=None):
+        if self.summary_repo is None:
+            return
+        summary = self.summary_repo.dashboard(date.today().strftime("%Y-%m"))
+        self.available_tile.set(
+            str(summary.available), tooltip=f"{summary.available_copies} copie disponibili"
+        )
+        self.reserved_tile.set(f"{summary.reserved} / {summary.exhibition}")
+        self.sold_tile.set(str(summary.sold), tooltip=f"{summary.artworks} opere in catalogo")
+        self.month_tile.set(_money(summary.month_revenue), tooltip=f"{summary.month_sales} vendite")
+        if artist_id:
+            artworks, copies, value = self.summary_repo.artist_stock(artist_id)
+            payments, amount = self.summary_repo.artist_unpaid(artist_id)
+            self.stock_tile.set(_money(value), "Magazzino artista",
+                                f"{artworks} opere, {copies} copie non vendute")
+            self.unpaid_tile.set(_money(amount), "Da pagare all'artista", f"{payments} pagamenti")
+        else:
+            self.stock_tile.set(_money(summary.stock_value), "Valore magazzino",
+                                "Prezzo di listino × copie delle opere non vendute")
+            self.unpaid_tile.set(_money(summary.unpaid_amount), "Da pagare agli artisti",
+                                 f"{summary.unpaid_payments} pagamenti")
@@ -1,23 +1,30 @@
 """
 Simple image carousel widget that wraps ImagePreviewWidget with previous/next controls.
+
+Only the current image and its two neighbours are kept in memory, as preview
+pyramids capped at display size; everything else is decoded on demand when
+the user flips to it.
 """
 from pathlib import Path
-import shutil
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton
-from PyQt5.QtCore import Qt
-
-from core.paths import IMG_DIR
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
+from PyQt5.QtCore import Qt, pyqtSignal
 
 from ui.widgets.image_preview import ImagePreviewWidget
+from ui.workers.image_loader import ImageLoader
 
 
 class ImageCarousel(QWidget):
     """Carousel to flip through a list of image paths."""
 
+    images_dropped = pyqtSignal(list)  # Emits paths of the image files dropped
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._images = []
         self._index = 0
+        self._decoded = {}  # key -> pyramid levels, current image and neighbours only
+        self._loader = ImageLoader(self, max_threads=1)
+        self._loader.image_loaded.connect(self._on_image_loaded)
         self._build_ui()
         self.setAcceptDrops(True)
 
@@ -29,9 +36,12 @@ class ImageCarousel(QWidget):
         controls = QHBoxLayout()
         self.prev_btn = QPushButton("<")
         self.next_btn = QPushButton(">")
+        self.position_label = QLabel("")
+        self.position_label.setAlignment(Qt.AlignCenter)
         self.prev_btn.clicked.connect(self.prev)
         self.next_btn.clicked.connect(self.next)
         controls.addWidget(self.prev_btn)
+        controls.addWidget(self.position_label, 1)
         controls.addWidget(self.next_btn)
 
         layout.addWidget(self.preview)
@@ -41,15 +51,21 @@ class ImageCarousel(QWidget):
         self.setLayout(layout)
         self._update_controls()
 
-    def set_images(self, paths):
+    def set_images(self, paths, keep_position=False):
+        """Show paths from the first one (or stay on the current index, e.g. for new renditions)"""
+        index = self._index if keep_position else 0
         self._images = [Path(p) for p in paths if p]
-        self._index = 0
+        self._index = min(index, len(self._images) - 1) if self._images else 0
+        self._loader.cancel_pending()
+        self._decoded.clear()
         self._show_current()
         self._update_controls()
 
     def clear(self):
         self._images = []
         self._index = 0
+        self._loader.cancel_pending()
+        self._decoded.clear()
         self.preview.clear()
         self._update_controls()
 
@@ -58,23 +74,71 @@ class ImageCarousel(QWidget):
             return
         self._index = (self._index + 1) % len(self._images)
         self._show_current()
+        self._update_controls()
 
     def prev(self):
         if not self._images:
             return
         self._index = (self._index - 1) % len(self._images)
         self._show_current()
+        self._update_controls()
 
     def _show_current(self):
         if not self._images:
             self.preview.clear()
             return
-        self.preview.load_image(self._images[self._index])
+        key = self._key(self._index)
+        levels = self._decoded.get(key)
+        if levels is not None:
+            self.preview.show_pyramid(levels)
+        elif not self._images[self._index].exists():
+            self.preview.load_image(self._images[self._index])
+        else:
+            self.preview.show_loading()
+        self._prefetch()
+
+    def _window(self):
+        """Keys to keep decoded: current first, then next and previous"""
+        count = len(self._images)
+        indexes = [self._index, (self._index + 1) % count, (self._index - 1) % count]
+        return list(dict.fromkeys(self._key(i) for i in indexes))
+
+    def _prefetch(self):
+        window = self._window()
+        for key in list(self._decoded):
+            if key not in window:
+                del self._decoded[key]
+        if self._loader.pending_keys() - set(window):
+            # Flipped past images still queued: drop them, the window is re-requested
+            self._loader.cancel_pending()
+        for key in window:
+            if key not in self._decoded and Path(key).exists():
+                self._loader.request_image(key, self.preview.decode_size())
+
+    def _on_image_loaded(self, key, image):
+        if key not in self._window():
+            return
+        if image.isNull():
+            if key == self._key(self._index):
+                self.preview.show_image(image)
+            return
+        # Keep the pyramid only: the decoded QImage is dropped right here
+        levels = self.preview.build_pyramid(image)
+        self._decoded[key] = levels
+        if key == self._key(self._index):
+            self.preview.show_pyramid(levels)
+
+    def _key(self, index):
+        return str(self._images[index])
 
     def _update_controls(self):
         enabled = len(self._images) > 1
         self.prev_btn.setEnabled(enabled)
         self.next_btn.setEnabled(enabled)
+        if enabled:
+            self.position_label.setText(f"{self._index + 1} / {len(self._images)}")
+        else:
+            self.position_label.setText("")
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls() and self._has_image_urls(event.mimeData().urls()):
@@ -88,25 +152,9 @@ class ImageCarousel(QWidget):
         if not image_paths:
             event.ignore()
             return
-
-        persisted = []
-        for src_str in image_paths:
-            src = Path(src_str)
-            dest = IMG_DIR / src.name
-            try:
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                if dest.resolve() != src.resolve():
-                    shutil.copy2(src, dest)
-                persisted.append(dest)
-            except Exception:
-                # Skip files that cannot be copied
-                continue
-
-        if persisted:
-            self.set_images(persisted)
-            event.acceptProposedAction()
-        else:
-            event.ignore()
+        # Importing is up to the receiver, like drops on the main window
+        event.acceptProposedAction()
+        self.images_dropped.emit(image_paths)
 
     def _has_image_urls(self, urls):
         return any(u.isLocalFile() and self._is_image_file(u.toLocalFile()) for u in urls)
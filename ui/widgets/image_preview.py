@@ -5,14 +5,46 @@ Custom widget for displaying artwork images
 
 from pathlib import Path
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap
 
-try:
-    from PIL import Image, ImageOps
-except ImportError:
-    Image = None
-    ImageOps = None
+from ui.workers.image_loader import ImageLoader
+
+
+# Smallest pyramid level kept, in pixels on the longer side
+MIN_LEVEL_SIZE = 64
+
+# Quiet time after the last resize before the smooth pass runs
+SMOOTH_DELAY_MS = 120
+
+
+def build_pyramid(image, max_size=None):
+    """
+    Return pre-scaled pixmaps of a QImage, largest first, each half the
+    size of the previous one (a mipmap chain). With max_size (w, h) the
+    first level is shrunk to fit it, so no level is larger than can be shown
+    and the caller can drop the source image.
+    """
+    if max_size and (image.width() > max_size[0] or image.height() > max_size[1]):
+        image = image.scaled(max_size[0], max_size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    levels = [QPixmap.fromImage(image)]
+    while max(levels[-1].width(), levels[-1].height()) >= MIN_LEVEL_SIZE * 2:
+        prev = levels[-1]
+        levels.append(prev.scaled(
+            max(1, prev.width() // 2),
+            max(1, prev.height() // 2),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation,
+        ))
+    return levels
+
+
+def nearest_level(levels, size: int):
+    """Smallest level that still covers size on its longer side"""
+    for level in reversed(levels):
+        if max(level.width(), level.height()) >= size:
+            return level
+    return levels[0]
 
 
 class ImagePreviewWidget(QWidget):
@@ -22,7 +54,15 @@ class ImagePreviewWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._pixmap = None
+        self._levels = []          # Mipmap pyramid of the current image
+        self._scaled_size = None   # Size of the smooth pixmap on screen
+        self._current_key = None
+        self._loader = ImageLoader(self, max_threads=1)
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(SMOOTH_DELAY_MS)
+        self._smooth_timer.timeout.connect(lambda: self._update_pixmap(smooth=True))
+        self._loader.image_loaded.connect(self._on_image_loaded)
         self._build_ui()
 
     def _build_ui(self):
@@ -54,73 +94,102 @@ class ImagePreviewWidget(QWidget):
             self.clear()
             return
 
+        self._loader.cancel_pending()
+        self._release()
         path = Path(image_path)
         if not path.exists():
+            self._current_key = None
             self.image_label.setText("Image not found")
             return
 
-        # Load and fix EXIF orientation using PIL
-        pixmap = self._load_pixmap_with_exif_fix(str(path))
-        if pixmap is None or pixmap.isNull():
-            self.image_label.setText("Invalid image")
+        # Decode (with EXIF orientation fix) off the GUI thread
+        self._current_key = str(path)
+        self.image_label.setText("Caricamento...")
+        self._loader.request_image(path, self.decode_size())
+
+    def decode_size(self):
+        """Largest size worth decoding for this widget, in device pixels"""
+        ratio = self.devicePixelRatioF()
+        side = max(self.image_label.maximumWidth(), self.image_label.maximumHeight())
+        return (int(side * ratio), int(side * ratio))
+
+    def _on_image_loaded(self, key, image):
+        """Show the decoded image if it is still the one requested"""
+        if key != self._current_key:
             return
+        self.show_image(image)
 
-        self._pixmap = pixmap
-        self._update_pixmap()
-
-    def _load_pixmap_with_exif_fix(self, image_path):
-        """Load image and apply EXIF orientation using PIL"""
-        if Image is None:
-            # Fallback if PIL is not available
-            return QPixmap(image_path)
-
-        try:
-            with Image.open(image_path) as img:
-                # Apply EXIF orientation automatically
-                if ImageOps is not None:
-                    img = ImageOps.exif_transpose(img)
-                
-                # Convert PIL image to QPixmap
-                import io
-                buffer = io.BytesIO()
-                img.save(buffer, format='PNG')
-                buffer.seek(0)
-                
-                pixmap = QPixmap()
-                pixmap.loadFromData(buffer.getvalue())
-                return pixmap
-        except Exception as e:
-            print(f"Error loading image with EXIF fix: {e}")
-            # Fallback to loading without EXIF fix
-            return QPixmap(image_path)
+    def show_image(self, image):
+        """Display an image that was already decoded (QImage)"""
+        if image.isNull():
+            self._release()
+            self.image_label.setText("Invalid image")
+            return
+        self.show_pyramid(self.build_pyramid(image))
+
+    def build_pyramid(self, image):
+        """Pyramid of a QImage capped at what this widget can display"""
+        return build_pyramid(image, self.decode_size())
+
+    def show_pyramid(self, levels):
+        """Display an image from the levels of build_pyramid()"""
+        # The pyramid replaces the source: nothing here keeps the QImage alive
+        self._levels = levels
+        self._scaled_size = None
+        self._update_pixmap(smooth=True)
+
+    def show_loading(self):
+        """Show the placeholder used while an image is being decoded"""
+        self._loader.cancel_pending()
+        self._current_key = None
+        self._release()
+        self.image_label.clear()
+        self.image_label.setText("Caricamento...")
 
     def clear(self):
         """Clear the image"""
+        self._loader.cancel_pending()
+        self._current_key = None
         self.image_label.clear()
         self.image_label.setText("No image")
-        self._pixmap = None
+        self._release()
+
+    def _release(self):
+        self._smooth_timer.stop()
+        self._levels = []
+        self._scaled_size = None
 
     def resizeEvent(self, event):
-        """Handle resize events to rescale the image"""
+        """Rescale quickly while resizing, smoothly once it settles"""
         super().resizeEvent(event)
-        self._update_pixmap()
-
-    def _update_pixmap(self):
-        if not self._pixmap:
+        if not self._levels:
             return
-        
+        self._update_pixmap(smooth=False)
+        self._smooth_timer.start()
+
+    def _target_size(self) -> int:
         # Use the label's actual size (which should be square now)
         label_size = self.image_label.size()
         size = min(label_size.width(), label_size.height())
-        
         if size <= 0:
             size = 300
-        
-        # Scale the pixmap to fit in a square while maintaining aspect ratio
-        scaled_pixmap = self._pixmap.scaled(
+        return size
+
+    def _update_pixmap(self, smooth: bool = True):
+        if not self._levels:
+            return
+
+        size = self._target_size()
+        if smooth and self._scaled_size == size:
+            return
+
+        # Scale from the nearest pyramid level instead of the full image
+        level = nearest_level(self._levels, int(size * self.devicePixelRatioF()))
+        scaled_pixmap = level.scaled(
             size,
             size,
             Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
+            Qt.SmoothTransformation if smooth else Qt.FastTransformation
         )
+        self._scaled_size = size if smooth else None
         self.image_label.setPixmap(scaled_pixmap)
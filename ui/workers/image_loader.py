@@ -0,0 +1,167 @@
+"""
+Image Loader
+Decodes images on a thread pool and delivers them to the GUI thread as QImage
+"""
+
+from pathlib import Path
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from core.thumbnails import THUMB_SIZE
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+
+# =========================================================
+# DECODERS (run on worker threads, must not touch QPixmap)
+# =========================================================
+def decode_thumbnail(image_path, thumbnails) -> QImage:
+    """
+    Decode a card-sized image, going through the thumbnail cache when possible.
+    With thumbnails None, image_path is already card-sized (an ingest rendition).
+    """
+    if thumbnails is None:
+        return QImage(str(image_path))
+    thumb_path = thumbnails.get_path(image_path)
+    if thumb_path is not None:
+        return QImage(str(thumb_path))
+    image = QImage(str(image_path))
+    if image.isNull():
+        return image
+    return image.scaled(*THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+# PIL modes Qt can read directly: (format, bytes per pixel)
+_QT_FORMATS = {
+    "RGB": (QImage.Format_RGB888, 3),
+    "RGBA": (QImage.Format_RGBA8888, 4),
+    "L": (QImage.Format_Grayscale8, 1),
+}
+
+
+def pil_to_qimage(img) -> QImage:
+    """
+    Wrap the raw pixel buffer of a PIL image in a QImage without re-encoding.
+    The result is detached from the Python buffer so it can cross threads.
+    """
+    if img.mode not in _QT_FORMATS:
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    qt_format, bytes_per_pixel = _QT_FORMATS[img.mode]
+    width, height = img.size
+    data = img.tobytes("raw", img.mode)
+    # Rows are tightly packed, so the stride must be given explicitly
+    image = QImage(data, width, height, width * bytes_per_pixel, qt_format)
+    return image.copy()
+
+
+def decode_image(image_path, max_size=None) -> QImage:
+    """
+    Decode an image applying EXIF orientation using PIL.
+    With max_size (w, h) the image is decoded at reduced scale where the
+    format allows it (JPEG draft mode) and shrunk to fit.
+    """
+    if Image is None:
+        # Fallback if PIL is not available
+        return QImage(str(image_path))
+
+    try:
+        with Image.open(image_path) as img:
+            if max_size:
+                # EXIF rotation may swap the axes, so ask for the longer side on both
+                side = max(max_size)
+                img.draft("RGB", (side, side))
+            # Apply EXIF orientation automatically
+            if ImageOps is not None:
+                img = ImageOps.exif_transpose(img)
+            if max_size:
+                img.thumbnail(max_size, Image.LANCZOS, reducing_gap=2.0)
+            return pil_to_qimage(img)
+    except Exception as e:
+        print(f"Error loading image with EXIF fix: {e}")
+        # Fallback to loading without EXIF fix
+        return QImage(str(image_path))
+
+
+# =========================================================
+# LOADER
+# =========================================================
+class _DecodeJob(QRunnable):
+    """Runnable that decodes one image unless its generation went stale"""
+
+    def __init__(self, loader, generation, key, decode, args):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.key = key
+        self.decode = decode
+        self.args = args
+
+    def run(self):
+        if self.generation != self.loader.generation:
+            return
+        try:
+            image = self.decode(*self.args)
+        except Exception as e:
+            print(f"Error decoding {self.key}: {e}")
+            image = QImage()
+        try:
+            self.loader._finished.emit(self.key, self.generation, image)
+        except RuntimeError:
+            # Loader was destroyed while we were decoding
+            pass
+
+
+class ImageLoader(QObject):
+    """
+    Asynchronous image decoder backed by a private QThreadPool.
+
+    Every call to cancel_pending() starts a new generation: queued jobs of the
+    previous generation are dropped and results that still arrive are ignored.
+    """
+
+    image_loaded = pyqtSignal(str, QImage)  # Emits request key and decoded image
+
+    _finished = pyqtSignal(str, int, QImage)
+
+    def __init__(self, parent=None, max_threads: int = None):
+        super().__init__(parent)
+        self.generation = 0
+        self._pending = set()
+        self.pool = QThreadPool(self)
+        if max_threads is None:
+            max_threads = max(2, QThreadPool.globalInstance().maxThreadCount() - 1)
+        self.pool.setMaxThreadCount(max_threads)
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    def request(self, key: str, decode, *args):
+        """Queue decode(*args) and emit image_loaded(key, image) when done"""
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self.pool.start(_DecodeJob(self, self.generation, key, decode, args))
+
+    def request_image(self, image_path, max_size=None):
+        self.request(str(image_path), decode_image, Path(image_path), max_size)
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._pending
+
+    def pending_keys(self):
+        return set(self._pending)
+
+    def cancel_pending(self):
+        """Drop queued jobs and ignore results of jobs already running"""
+        self.generation += 1
+        self._pending.clear()
+        self.pool.clear()
+
+    def _on_finished(self, key, generation, image):
+        if generation != self.generation:
+            return
+        self._pending.discard(key)
+        self.image_loaded.emit(key, image)
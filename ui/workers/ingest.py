@@ -0,0 +1,70 @@
+"""
+Ingest Queue
+Feeds imported images to the rendition process pool and reports back on the GUI thread
+"""
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from core.ingest import IngestPipeline
+
+
+class IngestQueue(QObject):
+    """
+    Qt front end of core.ingest.IngestPipeline.
+
+    Futures complete on the executor's thread; results are forwarded through a
+    queued signal so slots always run on the GUI thread.
+    """
+
+    rendered = pyqtSignal(str, object)  # Emits image name and {kind: path} ({} on failure)
+    progress = pyqtSignal(int)          # Emits the number of images still being rendered
+
+    _done = pyqtSignal(str, object)
+
+    def __init__(self, pipeline: IngestPipeline = None, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline or IngestPipeline()
+        self._pending = 0
+        self._submitted = set()
+        self._done.connect(self._on_done, Qt.QueuedConnection)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, name: str, source, sha256: str):
+        if (name, sha256) in self._submitted:
+            return
+        self._submitted.add((name, sha256))
+        future = self.pipeline.submit(source, sha256)
+        if future is None:
+            return
+        self._pending += 1
+        self.progress.emit(self._pending)
+        future.add_done_callback(lambda f, name=name: self._forward(name, f))
+
+    def preview_path(self, source, sha256: str):
+        return self.pipeline.preview_path(source, sha256)
+
+    def thumbnail_path(self, sha256: str):
+        return self.pipeline.thumbnail_path(sha256)
+
+    def shutdown(self):
+        self.pipeline.shutdown(wait=False)
+
+    def _forward(self, name, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Error rendering {name}: {error}")
+        try:
+            self._done.emit(name, {} if error is not None else future.result())
+        except RuntimeError:
+            # Queue was destroyed while the image was rendering
+            pass
+
+    def _on_done(self, name, renditions):
+        self._pending = max(0, self._pending - 1)
+        self.progress.emit(self._pending)
+        self.rendered.emit(name, renditions)
@@ -0,0 +1,124 @@
+"""
+Debounced Search
+Coalesces keystrokes and runs database searches on a background thread
+"""
+
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
+
+from core.database import Database, READ_ONLY_PROFILE
+from core.paths import DB_PATH
+
+
+class _SearchJob(QRunnable):
+    """Runnable that runs one search unless a newer one was requested"""
+
+    def __init__(self, search, generation, text):
+        super().__init__()
+        self.search = search
+        self.generation = generation
+        self.text = text
+
+    def run(self):
+        if self.generation != self.search.generation:
+            return
+        try:
+            results = self.search.search_fn(self.search._thread_repo(), self.text)
+        except Exception as e:
+            print(f"Search failed for {self.text!r}: {e}")
+            results = []
+        try:
+            self.search._finished.emit(self.generation, self.text, results)
+        except RuntimeError:
+            # Search object was destroyed while the query was running
+            pass
+
+
+class _CloseJob(QRunnable):
+    """Closes the worker thread's connection, on that thread"""
+
+    def __init__(self, search):
+        super().__init__()
+        self.search = search
+
+    def run(self):
+        self.search._close_thread_repo()
+
+
+class DebouncedSearch(QObject):
+    """
+    Search pipeline shared by the artist and artwork search boxes.
+
+    set_text() restarts a short timer; when typing pauses, search_fn(repo, text)
+    runs on a single worker thread with its own read-only connection (WAL lets
+    it read while the GUI writes). Only the newest result is delivered, in one
+    results_ready(text, results) signal.
+    """
+
+    results_ready = pyqtSignal(str, object)
+
+    _finished = pyqtSignal(int, str, object)
+
+    def __init__(self, search_fn, repo_factory, db_path=DB_PATH, delay_ms: int = 200, parent=None):
+        super().__init__(parent)
+        self.search_fn = search_fn
+        self.repo_factory = repo_factory
+        self.db_path = db_path
+        self.generation = 0
+        self._text = ""
+        self._local = threading.local()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+        # One long-lived thread: searches run in order and keep their connection
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.pool.setExpiryTimeout(-1)
+
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    def set_text(self, text: str):
+        """Schedule a search for text, superseding any pending one"""
+        self._text = text
+        self.generation += 1
+        self._timer.start()
+
+    def cancel(self):
+        self._timer.stop()
+        self.generation += 1
+        self.pool.clear()
+
+    def close(self):
+        """
+        Cancel pending searches and close the worker's connection.
+        Blocks until the running search (if any) has finished.
+        """
+        self.cancel()
+        self.pool.start(_CloseJob(self))
+        self.pool.waitForDone()
+
+    def _start(self):
+        self.pool.clear()
+        self.pool.start(_SearchJob(self, self.generation, self._text))
+
+    def _thread_repo(self):
+        # Runs on the worker thread: sqlite connections cannot cross threads
+        repo = getattr(self._local, "repo", None)
+        if repo is None:
+            repo = self.repo_factory(Database(self.db_path, READ_ONLY_PROFILE))
+            self._local.repo = repo
+        return repo
+
+    def _close_thread_repo(self):
+        repo = getattr(self._local, "repo", None)
+        if repo is not None:
+            self._local.repo = None
+            repo.db.close()
+
+    def _on_finished(self, generation, text, results):
+        if generation != self.generation:
+            return
+        self.results_ready.emit(text, results)